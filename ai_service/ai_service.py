@@ -1,38 +1,515 @@
 # ai_service.py
-from flask import Flask, request, jsonify
+import os
+import time
+
+# Titik nol time-to-first-response worker ini (lihat StartupReport)
+STARTUP_STARTED = time.perf_counter()
+
+# Mode serving: 'threading' (dev server, default) atau 'gevent' (gunicorn -k gevent, lihat gunicorn.conf.py).
+# Monkey patch harus terjadi sebelum modul lain meng-import socket/threading.
+ASYNC_MODE = os.environ.get('ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 import numpy as np
 import logging
+import math
 import re
-import os
+import signal
+import sys
+import hashlib
+import json
+import threading
+import queue
+import multiprocessing
+import zlib
+import urllib.parse
+import urllib.request
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
 
-# Setup untuk TensorFlow Lite
-try:
-    import tflite_runtime.interpreter as tflite
-except ImportError:
-    import tensorflow.lite as tflite
+# metrics.py dipakai bersama backend dan AI service (direktori common/ di root repo)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, sample_stacks
+from serving import BlockingRunner, admin_required
+from model_registry import ModelRegistry, file_checksum
+from interpreter_runtime import InterpreterSlot, init_process_worker, process_worker_invoke
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Metrik Prometheus, dibaca lewat GET /metrics
+metrics = MetricsRegistry()
+request_latency = metrics.histogram('http_request_duration_seconds', 'HTTP request latency by route',
+                                    ['method', 'route', 'status'])
+stage_latency = metrics.histogram('predict_stage_duration_seconds',
+                                  'Latency of prediction stages (keywords, preprocess, invoke, fallback, calibrate)',
+                                  ['stage'])
+predictions_total = metrics.counter('predictions_total',
+                                    'Predictions by source (model, fallback, cache, degraded, error)', ['source'])
+# Seri yang dipakai di hot path, diikat sekali
+keywords_latency = stage_latency.labels(stage='keywords')
+preprocess_latency = stage_latency.labels(stage='preprocess')
+invoke_latency = stage_latency.labels(stage='invoke')
+fallback_latency = stage_latency.labels(stage='fallback')
+calibrate_latency = stage_latency.labels(stage='calibrate')
+model_predictions = predictions_total.labels(source='model')
+fallback_predictions = predictions_total.labels(source='fallback')
+cached_predictions = predictions_total.labels(source='cache')
+degraded_predictions = predictions_total.labels(source='degraded')
+failed_predictions = predictions_total.labels(source='error')
+
+# Profiler sampling opsional: GET /debug/profile?seconds=N (collapsed stacks, butuh admin token)
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED') == '1'
+PROFILER_MAX_SECONDS = 60
+
+# Konfigurasi batching
+MAX_BATCH_SIZE = int(os.environ.get('PREDICT_MAX_BATCH_SIZE', 256))  # batas /predict/batch
+MICROBATCH_ENABLED = os.environ.get('PREDICT_MICROBATCH', '1') == '1'
+MICROBATCH_WINDOW_MS = float(os.environ.get('PREDICT_MICROBATCH_WINDOW_MS', 2.0))
+MICROBATCH_MAX_SIZE = int(os.environ.get('PREDICT_MICROBATCH_MAX_SIZE', 32))
+
+# Konfigurasi interpreter pool
+INTERPRETER_POOL_MODE = os.environ.get('INTERPRETER_POOL_MODE', 'thread')  # 'thread' atau 'process'
+INTERPRETER_POOL_SIZE = int(os.environ.get('INTERPRETER_POOL_SIZE', os.cpu_count() or 1))
+INTERPRETER_NUM_THREADS = int(os.environ.get('INTERPRETER_NUM_THREADS', 1))
+
+# Admission control jalur model (lihat AdmissionController)
+# Item yang boleh berada di jalur model sekaligus (menunggu microbatch/interpreter atau invoke)
+PREDICT_MAX_INFLIGHT = int(os.environ.get('PREDICT_MAX_INFLIGHT',
+                                          INTERPRETER_POOL_SIZE * (MICROBATCH_MAX_SIZE if MICROBATCH_ENABLED else 1)))
+PREDICT_MAX_QUEUE = int(os.environ.get('PREDICT_MAX_QUEUE', 128))  # request yang menunggu giliran; lebih = 503
+PREDICT_DEFAULT_DEADLINE_MS = float(os.environ.get('PREDICT_DEFAULT_DEADLINE_MS', 0))  # tanpa header/field; 0 = tanpa
+DEGRADED_CONFIDENCE_FACTOR = 0.8  # confidence fallback dikali ini jika dipakai karena overload
+
+# Konfigurasi cache prediksi (0 = nonaktif)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 3600))  # detik
+
+# Schema fitur input model: 'dense-v1' (4 fitur + padding nol, kontrak model lama)
+# atau 'hashed-ngram-v2' (untuk model yang dilatih dengan fitur n-gram ter-hash)
+FEATURE_SCHEMA = os.environ.get('FEATURE_SCHEMA', 'dense-v1')
+
+# Konfigurasi online learning dari actual_time task yang selesai
+ONLINE_LEARNING_ENABLED = os.environ.get('ONLINE_LEARNING', '1') == '1'
+BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:5000')
+ONLINE_POLL_INTERVAL = float(os.environ.get('ONLINE_POLL_INTERVAL', 300))  # detik antar penarikan data
+ONLINE_MIN_SAMPLES = int(os.environ.get('ONLINE_MIN_SAMPLES', 50))  # sampel minimum sebelum model dipakai
+ONLINE_DECAY = float(os.environ.get('ONLINE_DECAY', 0.9995))  # faktor lupa per sampel (1.0 = tidak lupa)
+ONLINE_RIDGE = float(os.environ.get('ONLINE_RIDGE', 1.0))
+ONLINE_CPU_BUDGET = float(os.environ.get('ONLINE_CPU_BUDGET', 0.1))  # fraksi satu core untuk training
+ONLINE_STATE_PATH = os.environ.get('ONLINE_STATE_PATH', 'online_state.npz')
+ONLINE_MAX_BACKOFF = 8  # setelah putaran gagal berturut-turut, jeda maksimal = interval x ini
+
+# Konfigurasi model registry dan hot reload
+MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR', 'models')
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 0))  # detik; 0 = file watch nonaktif
+# Invoke sintetis per interpreter sebelum model dipasang; minimal 1, /ready menunggu warm-up ini
+MODEL_WARMUP_RUNS = max(int(os.environ.get('MODEL_WARMUP_RUNS', 3)), 1)
+# '1': model dimuat di background, /predict memakai fallback_prediction sampai /ready; '0': muat saat import
+MODEL_BACKGROUND_LOAD = os.environ.get('MODEL_BACKGROUND_LOAD', '1') == '1'
+
+# Konfigurasi serving
+PORT = int(os.environ.get('PORT', 5001))
+# Hanya untuk python ai_service.py; reloader Werkzeug menjalankan ulang efek samping modul
+# (load model, thread background) di proses kedua, jadi harus diaktifkan eksplisit
+SERVER_DEBUG = os.environ.get('SERVER_DEBUG', '0') == '1'
+# Thread OS untuk invoke() interpreter di mode gevent; minimal sebesar pool interpreter
+BLOCKING_POOL_SIZE = max(int(os.environ.get('BLOCKING_POOL_SIZE', INTERPRETER_POOL_SIZE)), INTERPRETER_POOL_SIZE)
+
+# File JSON opsional {keyword: menit} untuk memperluas kosakata time_keywords
+KEYWORDS_PATH = os.environ.get('KEYWORDS_PATH')
+
 app = Flask(__name__)
 # In ai_service.py
 CORS(app, resources={
-    r"/predict": {"origins": "*"},
+    r"/predict*": {"origins": "*"},
     r"/model*": {"origins": "*"}
 })
 
-# ai_service.py (updated version)
-# ... (keep previous imports and setup)
+run_blocking = BlockingRunner(ASYNC_MODE, BLOCKING_POOL_SIZE)
+
+def memory_usage():
+    """RSS proses ini dalam MB. rss_file_mb termasuk halaman file model yang di-mmap TFLite,
+    yang dibagi dengan worker lain; rss_anon_mb adalah memori privat worker ini."""
+    fields = {'VmRSS': 'rss_mb', 'RssAnon': 'rss_anon_mb', 'RssFile': 'rss_file_mb'}
+    usage = {}
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in fields:
+                    usage[fields[key]] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        # Bukan Linux: hanya puncak RSS yang tersedia
+        import resource
+        usage['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return usage
+
+class StartupReport:
+    """Waktu startup worker ini (ms sejak ai_service.py mulai di-import) beserta RSS-nya.
+
+    Fase: 'imported' (modul selesai di-import), 'first_response' (respons HTTP
+    pertama selesai dibuat) dan 'model_ready' (model termuat dan sudah warm-up).
+    """
+    
+    def __init__(self, started=STARTUP_STARTED):
+        self.started = started
+        self.lock = threading.Lock()
+        self.phases = {}
+    
+    def mark(self, phase):
+        """Catat fase sekali saja dan log bersama RSS saat itu"""
+        with self.lock:
+            if phase in self.phases:
+                return
+            self.phases[phase] = {'ms': round((time.perf_counter() - self.started) * 1000, 1), **memory_usage()}
+        details = ', '.join(f'{key} {value}' for key, value in self.phases[phase].items())
+        logger.info(f"Startup {phase} (pid {os.getpid()}): {details}")
+    
+    def get_stats(self):
+        return {'pid': os.getpid(), 'phases': dict(self.phases), 'memory': memory_usage()}
+
+startup_report = StartupReport()
+
+class ThreadInterpreterPool:
+    """Pool interpreter berukuran tetap; setiap thread meminjam satu interpreter per invoke"""
+    
+    mode = 'thread'
+    
+    def __init__(self, model_path, size=INTERPRETER_POOL_SIZE, num_threads=INTERPRETER_NUM_THREADS):
+        self.size = size
+        self.num_threads = num_threads
+        self.slots = queue.Queue()
+        for _ in range(size):
+            # Di mode gevent import runtime dan parsing model tidak memblok hub
+            self.slots.put(run_blocking(InterpreterSlot, model_path, num_threads))
+        
+        probe = self.slots.queue[0]
+        self.input_details = probe.input_details
+        self.output_details = probe.output_details
+    
+    def run(self, features):
+        slot = self.slots.get()
+        try:
+            return run_blocking(slot.invoke, features)
+        finally:
+            self.slots.put(slot)
+    
+    def run_with(self, fill, batch_size):
+        """fill(view) menulis langsung ke tensor input interpreter yang dipinjam"""
+        slot = self.slots.get()
+        try:
+            return run_blocking(slot.invoke_with, fill, batch_size)
+        finally:
+            self.slots.put(slot)
+    
+    def close(self, graceful=False):
+        pass
+
+def process_pool_context():
+    """Context multiprocessing untuk worker interpreter: forkserver, atau spawn jika tidak tersedia"""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # Default preload forkserver adalah '__main__', yang akan membangun service di proses server
+    context.set_forkserver_preload(['interpreter_runtime'])
+    return context
+
+class ProcessInterpreterPool:
+    """Pool worker process, masing-masing memuat model satu kali saat start.
+
+    Worker dibuat lewat forkserver (spawn jika tidak tersedia), bukan fork: saat
+    pool dibuat proses ini sudah menjalankan thread (loader model, microbatcher,
+    trainer), dan fork hanya menyalin thread pemanggil beserta lock yang mungkin
+    sedang dipegang thread lain. Worker hanya membutuhkan interpreter_runtime,
+    modul tanpa efek samping; script utama yang ikut di-import ulang sebagai
+    __mp_main__ tidak membangun service (lihat bagian inisialisasi di bawah).
+    """
+    
+    mode = 'process'
+    
+    def __init__(self, model_path, size=INTERPRETER_POOL_SIZE, num_threads=INTERPRETER_NUM_THREADS):
+        self.size = size
+        self.num_threads = num_threads
+        
+        # Interpreter sementara di parent hanya untuk membaca detail tensor
+        probe = InterpreterSlot(model_path, num_threads)
+        self.input_details = probe.input_details
+        self.output_details = probe.output_details
+        self.input_size = probe.input_size
+        del probe
+        # Buffer input per thread pemanggil, dipakai ulang antar request
+        self._buffers = threading.local()
+        
+        self.executor = ProcessPoolExecutor(
+            max_workers=size,
+            mp_context=process_pool_context(),
+            initializer=init_process_worker,
+            initargs=(model_path, num_threads)
+        )
+    
+    def run(self, features):
+        return self.executor.submit(process_worker_invoke, features).result()
+    
+    def run_with(self, fill, batch_size):
+        """fill(view) menulis ke buffer milik thread ini; features tetap di-pickle ke worker"""
+        buffer = getattr(self._buffers, 'features', None)
+        if buffer is None or buffer.shape[0] < batch_size:
+            buffer = np.zeros((batch_size, self.input_size), dtype=np.float32)
+            self._buffers.features = buffer
+        features = buffer[:batch_size]
+        fill(features)
+        return self.run(features)
+    
+    def close(self, graceful=False):
+        """graceful=True: tunggu invoke yang masih berjalan (dipakai saat model diganti)"""
+        if graceful:
+            self.executor.shutdown(wait=True)
+        else:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+def create_interpreter_pool(model_path, mode=INTERPRETER_POOL_MODE, size=INTERPRETER_POOL_SIZE,
+                            num_threads=INTERPRETER_NUM_THREADS):
+    """Buat pool interpreter sesuai mode ('thread' atau 'process')"""
+    if mode == 'process' and ASYNC_MODE == 'gevent':
+        # Thread dan pipe multiprocessing tidak cocok dengan monkey patch; threadpool gevent dipakai sebagai gantinya
+        logger.warning("Process interpreter pool is not supported with ASYNC_MODE=gevent, using 'thread'")
+        mode = 'thread'
+    if mode == 'process':
+        return ProcessInterpreterPool(model_path, size, num_threads)
+    if mode != 'thread':
+        logger.warning(f"Unknown interpreter pool mode '{mode}', using 'thread'")
+    return ThreadInterpreterPool(model_path, size, num_threads)
+
+def normalize_text(text):
+    """Lowercase dan rapikan spasi, agar variasi kecil memakai entry cache yang sama"""
+    return ' '.join((text or '').lower().split())
+
+class PredictionCache:
+    """Cache LRU + TTL untuk hasil prediksi, aman dipakai banyak thread"""
+    
+    def __init__(self, max_size=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+    
+    @staticmethod
+    def make_key(model_version, title, description, complexity):
+        """Hash dari input yang sudah dinormalisasi plus versi model"""
+        raw = '\0'.join([
+            model_version, normalize_text(title), normalize_text(description), normalize_text(complexity)
+        ])
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest()
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return dict(value)
+    
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (dict(value), time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, size=len(self.entries), max_size=self.max_size, ttl=self.ttl)
+
+class KeywordMatcher:
+    """Pencocok kata kunci sekali jalan untuk kosakata besar.
+
+    Semua keyword dikompilasi menjadi satu regex berbentuk trie di dalam
+    lookahead, sehingga di setiap posisi teks hanya keyword terpanjang yang
+    dimulai di posisi itu yang dicari, dan biayanya tidak bertambah dengan
+    jumlah keyword. Keyword lain yang merupakan prefix dari keyword terpanjang
+    itu dihitung dari tabel prefix yang dibuat saat kompilasi. Hasilnya sama
+    dengan ``keyword in text`` untuk setiap keyword.
+    """
+    
+    def __init__(self, weights):
+        self.weights = {keyword.lower(): weight for keyword, weight in weights.items() if keyword}
+        
+        trie = {}
+        for keyword in self.weights:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self.pattern = re.compile(f'(?=({self._trie_pattern(trie)}))') if trie else None
+        
+        # Keyword yang juga merupakan prefix dari keyword lain
+        self.prefixes = {
+            keyword: tuple(keyword[:i] for i in range(1, len(keyword) + 1) if keyword[:i] in self.weights)
+            for keyword in self.weights
+        }
+    
+    @classmethod
+    def _trie_pattern(cls, node):
+        branches = [re.escape(char) + cls._trie_pattern(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Cabang lebih panjang dicoba dulu (greedy), jadi selalu dapat keyword terpanjang
+        return f'(?:{body})?' if '' in node else body
+    
+    def match(self, text):
+        """Return {keyword: bobot} untuk semua keyword yang muncul di text"""
+        if self.pattern is None:
+            return {}
+        
+        found = {}
+        for longest in set(self.pattern.findall(text.lower())):
+            for keyword in self.prefixes[longest]:
+                found[keyword] = self.weights[keyword]
+        return found
+
+def load_keyword_vocabulary(path):
+    """Baca kosakata tambahan {keyword: menit} dari file JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        vocabulary = json.load(f)
+    return {str(keyword).lower(): int(minutes) for keyword, minutes in vocabulary.items()}
+
+class FeatureExtractor:
+    """Tulis fitur task langsung ke buffer input [B, N] tanpa alokasi array per request.
+
+    Schema (versi disimpan di ``schema`` dan dilaporkan di /model/info):
+
+    - ``dense-v1``: panjang judul, panjang deskripsi, complexity dan jumlah
+      keyword di 4 kolom pertama, sisanya nol. Ini kontrak model yang ada.
+    - ``hashed-ngram-v2``: 4 kolom dense-v1, lalu unigram dan bigram kata dari
+      judul + deskripsi di-hash (crc32, stabil antar process) ke kolom sisanya
+      dengan signed hashing trick, dinormalisasi 1/sqrt(jumlah n-gram).
+    """
+    
+    SCHEMAS = ('dense-v1', 'hashed-ngram-v2')
+    DENSE_FEATURES = 4
+    TOKEN_PATTERN = re.compile(r'\w+')
+    
+    def __init__(self, input_size, complexity_map, schema=FEATURE_SCHEMA):
+        if schema not in self.SCHEMAS:
+            raise ValueError(f"Unknown feature schema '{schema}'")
+        if schema == 'hashed-ngram-v2' and input_size <= self.DENSE_FEATURES:
+            raise ValueError(f"Feature schema '{schema}' needs more than {self.DENSE_FEATURES} inputs")
+        self.schema = schema
+        self.input_size = input_size
+        self.complexity_map = complexity_map
+        self.hash_buckets = input_size - self.DENSE_FEATURES
+    
+    def fill(self, out, items, keywords):
+        """Isi out [len(items), N] di tempat; keywords[i] hasil match_keywords untuk items[i]"""
+        out.fill(0)
+        for row, item, matched in zip(out, items, keywords):
+            self.write_row(
+                row, item.get('title') or '', item.get('description') or '',
+                item.get('complexity') or 'medium', matched
+            )
+    
+    def write_row(self, row, title, description, complexity, keywords):
+        """Tulis fitur satu task ke row [N] yang sudah nol"""
+        dense = (
+            len(title) / 100.0,  # Normalized title length
+            len(description) / 500.0,  # Normalized description length
+            self.complexity_map.get(complexity.lower(), 1) / 2.0,  # Normalized complexity
+            len(keywords) / 10.0  # Normalized keyword score
+        )
+        for i in range(min(self.DENSE_FEATURES, self.input_size)):
+            row[i] = dense[i]
+        
+        if self.schema == 'hashed-ngram-v2':
+            self._write_ngrams(row, f"{title} {description}".lower())
+    
+    def _write_ngrams(self, row, text):
+        tokens = self.TOKEN_PATTERN.findall(text)
+        grams = 0
+        previous = None
+        for token in tokens:
+            for gram in (token,) if previous is None else (token, f"{previous} {token}"):
+                digest = zlib.crc32(gram.encode('utf-8'))
+                index = self.DENSE_FEATURES + digest % self.hash_buckets
+                row[index] += 1.0 if digest & 0x80000000 else -1.0
+                grams += 1
+            previous = token
+        if grams:
+            row[self.DENSE_FEATURES:] *= 1.0 / np.sqrt(grams)
+
+class ModelHandle:
+    """Model yang siap dipakai: pool interpreter, feature extractor dan metadatanya.
+
+    Predictor menyimpan satu handle aktif dan menggantinya utuh saat reload,
+    sehingga request yang sedang berjalan tetap memakai pasangan pool dan
+    feature extractor yang konsisten.
+    """
+    
+    def __init__(self, version, path, source, pool, feature_extractor):
+        self.version = version
+        self.path = path
+        self.source = source  # 'registry', 'file' atau 'fallback'
+        self.pool = pool
+        self.feature_extractor = feature_extractor
+        self.input_details = pool.input_details if pool is not None else None
+        self.output_details = pool.output_details if pool is not None else None
+        self.input_size = feature_extractor.input_size
+        self.loaded_at = time.time()
+        self.warmup = None
+    
+    def get_info(self):
+        return {
+            'version': self.version,
+            'path': self.path,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'warmup': self.warmup
+        }
 
 class TaskPredictor:
-    def __init__(self, model_path='task_predictor.tflite'):
+    def __init__(self, model_path='task_predictor.tflite', pool_mode=INTERPRETER_POOL_MODE,
+                 pool_size=INTERPRETER_POOL_SIZE, num_threads=INTERPRETER_NUM_THREADS, background=False):
         self.model_path = model_path
-        self.interpreter = None
-        self.input_details = None
-        self.output_details = None
-        self.load_model()
+        self.feature_schema = FEATURE_SCHEMA
+        self.pool_mode = pool_mode
+        self.pool_size = pool_size
+        self.num_threads = num_threads
+        self.registry = ModelRegistry(MODEL_REGISTRY_DIR)
+        # Model aktif (ModelHandle); interpreter tidak aman dipakai beberapa thread sekaligus,
+        # jadi selalu lewat pool di dalam handle
+        self.active = None
+        self.model_lock = threading.Lock()
+        self.reload_lock = threading.Lock()
+        self.reload_status = {'state': 'idle', 'version': None, 'error': None, 'finished_at': None}
+        self.cache = PredictionCache() if PREDICTION_CACHE_SIZE > 0 else None
+        
+        # Kalibrasi hasil online learning; diganti utuh (satu assignment) saat model baru siap
+        self.learned_model = None
+        self.previous_learned_model = None
+        self.learned_model_lock = threading.Lock()
         
         # Mapping complexity ke angka
         self.complexity_map = {'low': 0, 'medium': 1, 'high': 2}
@@ -43,100 +520,362 @@ class TaskPredictor:
             'document': 90, 'meeting': 60, 'research': 120,
             'implement': 180, 'design': 150, 'deploy': 90
         }
+        if KEYWORDS_PATH:
+            try:
+                self.time_keywords.update(load_keyword_vocabulary(KEYWORDS_PATH))
+            except Exception as e:
+                logger.error(f"Error loading keyword vocabulary: {str(e)}")
+        self.keyword_matcher = KeywordMatcher(self.time_keywords)
+        
+        # Status muat model pertama: loading, ready, fallback (tidak ada file model) atau failed
+        self.startup = {'state': 'loading', 'load_ms': None, 'error': None}
+        # Reload (admin atau file watch) ditolak selama muat pertama
+        self.reload_lock.acquire()
+        if background:
+            # Sampai model siap, prediksi memakai fallback_prediction
+            self.install_model(self.fallback_handle())
+            threading.Thread(target=self.load_initial_model, name='model-loader', daemon=True).start()
+        else:
+            self.load_initial_model()
+    
+    # Atribut model aktif; dibaca dari handle agar selalu dari model yang sama
+    @property
+    def interpreter_pool(self):
+        return self.active.pool
+    
+    @property
+    def input_details(self):
+        return self.active.input_details
+    
+    @property
+    def output_details(self):
+        return self.active.output_details
+    
+    @property
+    def expected_input_size(self):
+        return self.active.input_size
+    
+    @property
+    def feature_extractor(self):
+        return self.active.feature_extractor
+    
+    @property
+    def model_version(self):
+        return self.active.version
+    
+    @property
+    def ready(self):
+        """True setelah model termuat dan warm-up (atau memang tidak ada file model: mode fallback)"""
+        return self.active.pool is not None or self.startup['state'] == 'fallback'
+    
+    def make_feature_extractor(self, input_size):
+        try:
+            return FeatureExtractor(input_size, self.complexity_map, self.feature_schema)
+        except ValueError as e:
+            logger.error(f"{str(e)}; using feature schema 'dense-v1'")
+            return FeatureExtractor(input_size, self.complexity_map, 'dense-v1')
+    
+    def resolve_model(self, version=None):
+        """(versi, path, source) model yang harus dimuat: versi registry yang diminta,
+        versi ACTIVE di registry, atau file model_path lama; None jika tidak ada model"""
+        version = version or self.registry.active_version()
+        if version:
+            return version, self.registry.model_path(version), 'registry'
+        if os.path.exists(self.model_path):
+            return file_checksum(self.model_path)[:12], self.model_path, 'file'
+        return None
+    
+    def build_model(self, version=None):
+        """Muat model (belum dipasang): buat pool interpreter lalu warm-up"""
+        resolved = self.resolve_model(version)
+        if resolved is None:
+            logger.warning(f"Model file {self.model_path} not found. Using fallback prediction.")
+            return self.fallback_handle()
+        
+        version, path, source = resolved
+        pool = create_interpreter_pool(path, self.pool_mode, self.pool_size, self.num_threads)
+        try:
+            # Get actual expected input size from model ([batch, N])
+            input_size = int(pool.input_details[0]['shape'][1])
+            handle = ModelHandle(version, path, source, pool, self.make_feature_extractor(input_size))
+            handle.warmup = self.warm_up(handle)
+        except Exception:
+            pool.close()
+            raise
+        
+        logger.info(f"TensorFlow Lite model {version} loaded successfully. Expected input size: {input_size}, "
+                    f"pool: {pool.mode} x {pool.size}, warm-up: {handle.warmup}")
+        return handle
+    
+    def fallback_handle(self):
+        return ModelHandle('fallback', None, 'fallback', None, self.make_feature_extractor(256))
+    
+    def warm_up(self, handle, runs=MODEL_WARMUP_RUNS):
+        """Invoke sintetis di setiap interpreter sebelum model menerima trafik
+        (alokasi tensor dan inisialisasi delegate terjadi di invoke pertama)"""
+        item = {'title': 'warm up', 'description': 'synthetic warm-up request', 'complexity': 'medium'}
+        timings = []
+        # Slot thread pool dipinjam bergiliran (FIFO), jadi setiap interpreter kebagian
+        for _ in range(runs * handle.pool.size):
+            start = time.perf_counter()
+            handle.pool.run_with(lambda view: handle.feature_extractor.fill(view, [item], [{}]), 1)
+            timings.append((time.perf_counter() - start) * 1000)
+        return {
+            'runs': len(timings),
+            'first_ms': round(timings[0], 3),
+            'mean_ms': round(sum(timings[1:]) / max(len(timings) - 1, 1), 3),
+            'total_ms': round(sum(timings), 3)
+        }
+    
+    def install_model(self, handle):
+        """Pasang handle baru secara atomik; pool lama ditutup setelah request yang berjalan selesai"""
+        with self.model_lock:
+            previous, self.active = self.active, handle
         
-        # Model expected input size
-        self.expected_input_size = 256  # Update this based on your model's requirements
+        # Model berbeda: hasil prediksi lama tidak berlaku lagi
+        if self.cache is not None and (previous is None or previous.version != handle.version):
+            self.cache.clear()
+        if previous is not None and previous.pool is not None:
+            threading.Thread(target=previous.pool.close, kwargs={'graceful': True},
+                             name='retire-interpreter-pool', daemon=True).start()
     
-    def load_model(self):
-        """Load TensorFlow Lite model"""
+    def load_model(self, version=None):
+        """Load TensorFlow Lite model (blocking); jika gagal, model aktif tetap dipakai"""
         try:
-            if os.path.exists(self.model_path):
-                self.interpreter = tflite.Interpreter(model_path=self.model_path)
-                self.interpreter.allocate_tensors()
-                
-                self.input_details = self.interpreter.get_input_details()
-                self.output_details = self.interpreter.get_output_details()
-                
-                # Get actual expected input size from model
-                input_shape = self.input_details[0]['shape']
-                self.expected_input_size = input_shape[1]  # Assuming shape is [1, 256, ...]
-                
-                logger.info(f"TensorFlow Lite model loaded successfully. Expected input size: {self.expected_input_size}")
-            else:
-                logger.warning(f"Model file {self.model_path} not found. Using fallback prediction.")
+            self.install_model(self.build_model(version))
+            return True
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
+            if self.active is None:
+                self.install_model(self.fallback_handle())
+            return False
     
-    def preprocess_input(self, title, description, complexity):
-        """Preprocessing input untuk model"""
+    def load_initial_model(self):
+        """Muat model pertama (reload_lock sudah dipegang pemanggil) dan catat hasilnya di startup"""
+        started = time.perf_counter()
         try:
-            # Feature engineering sederhana
-            title_length = len(title) if title else 0
-            desc_length = len(description) if description else 0
-            complexity_value = self.complexity_map.get(complexity.lower(), 1)
-            
-            # Hitung kata kunci dalam title dan description
-            text = f"{title} {description}".lower()
-            keyword_score = sum(1 for keyword in self.time_keywords if keyword in text)
-            
-            # Gabungkan features utama
-            main_features = np.array([
-                title_length / 100.0,  # Normalized title length
-                desc_length / 500.0,   # Normalized description length
-                complexity_value / 2.0, # Normalized complexity
-                keyword_score / 10.0   # Normalized keyword score
-            ], dtype=np.float32)
-            
-            # Pad features to match model's expected input size
-            if len(main_features) < self.expected_input_size:
-                # Create padded array with zeros
-                padded_features = np.zeros(self.expected_input_size, dtype=np.float32)
-                # Fill the beginning with our actual features
-                padded_features[:len(main_features)] = main_features
-                return padded_features.reshape(1, -1)
-            else:
-                return main_features.reshape(1, -1)
+            loaded = self.load_model()
+            state = 'ready' if self.active.pool is not None else 'fallback' if loaded else 'failed'
+            self.startup = {'state': state, 'load_ms': round((time.perf_counter() - started) * 1000, 1),
+                            'error': None if loaded else 'Model could not be loaded, see logs'}
+        finally:
+            self.reload_lock.release()
+        if self.ready:
+            startup_report.mark('model_ready')
+    
+    def reload_model(self, version=None, wait=False, force=False):
+        """Muat + warm-up model di background lalu pasang; return False jika reload lain masih jalan.
+        version=None memuat ulang versi ACTIVE registry (atau file model_path)"""
+        if not self.reload_lock.acquire(blocking=False):
+            return False
+        self.reload_status = {'state': 'loading', 'version': version, 'error': None, 'finished_at': None}
         
-        except Exception as e:
-            logger.error(f"Error in preprocessing: {str(e)}")
-            return np.zeros((1, self.expected_input_size), dtype=np.float32)
+        def run():
+            try:
+                resolved = self.resolve_model(version)
+                target = resolved[0] if resolved else None
+                if resolved is None:
+                    state, error = 'failed', 'No model available'
+                elif not force and target == self.model_version:
+                    state, error = 'unchanged', None
+                else:
+                    self.install_model(self.build_model(version))
+                    state, error = 'loaded', None
+                # Versi yang diminta dijadikan ACTIVE, agar tetap dipakai setelah restart
+                if version is not None and state != 'failed':
+                    self.registry.set_active(version)
+            except Exception as e:
+                logger.error(f"Error reloading model: {str(e)}")
+                target, state, error = version, 'failed', str(e)
+            try:
+                self.reload_status = {'state': state, 'version': target, 'error': error,
+                                      'finished_at': time.time()}
+            finally:
+                self.reload_lock.release()
+        
+        if wait:
+            run()
+        else:
+            threading.Thread(target=run, name='model-reload', daemon=True).start()
+        return True
+    
+    @property
+    def prediction_version(self):
+        """Versi untuk key cache: model TFLite plus model kalibrasi yang aktif"""
+        learned = self.learned_model
+        return self.model_version if learned is None else f"{self.model_version}+{learned.version}"
     
-    def predict_with_model(self, features):
-        """Prediksi menggunakan TensorFlow Lite model"""
+    def swap_learned_model(self, model):
+        """Pasang model kalibrasi baru; versi sebelumnya disimpan untuk rollback"""
+        with self.learned_model_lock:
+            self.previous_learned_model = self.learned_model
+            self.learned_model = model
+        logger.info(f"Learned model {model.version if model else None} activated")
+    
+    def rollback_learned_model(self):
+        """Kembali ke model kalibrasi sebelumnya; return False jika tidak ada"""
+        with self.learned_model_lock:
+            if self.previous_learned_model is None and self.learned_model is None:
+                return False
+            self.learned_model, self.previous_learned_model = self.previous_learned_model, self.learned_model
+        logger.info(f"Rolled back learned model to {self.learned_model.version if self.learned_model else None}")
+        return True
+    
+    def calibrate(self, items, keywords, estimates):
+        """Koreksi [(menit, confidence)] dengan model kalibrasi aktif (jika ada)"""
+        learned = self.learned_model
+        if learned is None:
+            return estimates
         try:
-            if self.interpreter is None:
-                return None
-            
-            # Ensure features match model's expected shape
-            if features.shape[1] != self.expected_input_size:
-                features = np.pad(
-                    features, 
-                    ((0, 0), (0, self.expected_input_size - features.shape[1])),
-                    mode='constant'
+            with calibrate_latency.time():
+                features = self.preprocess_batch(items, keywords)
+                if features.shape[1] != learned.input_size:
+                    return estimates
+                base = np.fromiter((max(15, min(480, e)) for e, _ in estimates),
+                                   dtype=np.float32, count=len(estimates))
+                return [(int(t), learned.confidence) for t in learned.predict(features, base)]
+        except Exception as e:
+            logger.error(f"Error in learned model prediction: {str(e)}")
+            return estimates
+    
+    def match_keywords(self, title, description):
+        """Cari keyword di title + description satu kali; dipakai preprocessing dan fallback"""
+        return self.keyword_matcher.match(f"{title} {description}")
+    
+    def preprocess_input(self, title, description, complexity, keywords=None):
+        """Preprocessing input untuk model, sebagai array [1, N] tersendiri"""
+        return self.preprocess_batch(
+            [{'title': title, 'description': description, 'complexity': complexity}],
+            None if keywords is None else [keywords]
+        )
+    
+    def preprocess_batch(self, items, keywords=None):
+        """Fitur untuk banyak task sebagai matriks [B, N] baru (jalur prediksi menulis langsung
+        ke tensor input; ini untuk pemanggil yang butuh array-nya sendiri)"""
+        if keywords is None:
+            keywords = [self.match_keywords(item.get('title') or '', item.get('description') or '')
+                        for item in items]
+        extractor = self.feature_extractor
+        features = np.zeros((len(items), extractor.input_size), dtype=np.float32)
+        extractor.fill(features, items, keywords)
+        return features
+    
+    def predict_with_model(self, items, keywords):
+        """Prediksi menggunakan TensorFlow Lite model; return [(menit, confidence)] per item.
+        Fitur ditulis langsung ke tensor input interpreter, tanpa array perantara."""
+        model = self.active
+        preprocess_seconds = 0.0
+        
+        def fill(view):
+            nonlocal preprocess_seconds
+            fill_started = time.perf_counter()
+            model.feature_extractor.fill(view, items, keywords)
+            preprocess_seconds = time.perf_counter() - fill_started
+        
+        started = time.perf_counter()
+        output_data = model.pool.run_with(fill, len(items))
+        # invoke termasuk menunggu interpreter bebas di pool
+        preprocess_latency.observe(preprocess_seconds)
+        invoke_latency.observe(time.perf_counter() - started - preprocess_seconds)
+        # Convert to minutes (0-240) and add placeholder confidence
+        return [(int(row[0] * 240), 0.85) for row in output_data]
+    
+    def run_interpreter(self, features):
+        """Jalankan features [B, N] pada interpreter yang sedang bebas di pool"""
+        return self.interpreter_pool.run(features)
+    
+    def predict_many(self, items):
+        """Prediksi banyak task dengan satu invoke(); items berisi dict title/description/complexity.
+
+        Return (predictions, path): path 'fallback' jika ada item yang dihitung fallback_prediction
+        karena model belum dimuat atau gagal, 'model' jika tidak.
+        """
+        if not items:
+            return [], self.cached_path()
+        
+        predictions = [None] * len(items)
+        keys = [None] * len(items)
+        misses = []
+        for i, item in enumerate(items):
+            if self.cache is not None:
+                keys[i] = self.cache.make_key(
+                    self.prediction_version, item.get('title'), item.get('description'),
+                    item.get('complexity') or 'medium'
                 )
-            
-            # Set input tensor
-            self.interpreter.set_tensor(self.input_details[0]['index'], features)
-            
-            # Run inference
-            self.interpreter.invoke()
-            
-            # Get output
-            output_data = self.interpreter.get_tensor(self.output_details[0]['index'])
-            
-            # Convert to minutes and add confidence
-            estimated_time = int(output_data[0][0] * 240)  # Scale to 0-240 minutes
-            confidence = 0.85  # Placeholder confidence
-            
-            return estimated_time, confidence
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    predictions[i] = cached
+                    continue
+            misses.append(i)
         
-        except Exception as e:
-            logger.error(f"Error in model prediction: {str(e)}")
-            return None
+        if len(misses) < len(items):
+            cached_predictions.inc(len(items) - len(misses))
+        
+        path = self.cached_path()
+        if misses:
+            computed, model_ok = self.predict_batch_uncached([items[i] for i in misses])
+            # Hasil fallback karena model gagal jangan di-cache
+            cacheable = model_ok or self.interpreter_pool is None
+            for i, prediction in zip(misses, computed):
+                predictions[i] = prediction
+                if cacheable and keys[i] is not None:
+                    self.cache.put(keys[i], prediction)
+            if not model_ok:
+                path = 'fallback'
+        
+        return predictions, path
     
-    # ... (keep the rest of the methods the same)
+    def cached_path(self):
+        """Jalur hasil yang ada di cache: cache hanya menyimpan hasil model, atau hasil
+        fallback_prediction selama model belum dimuat"""
+        return 'model' if self.interpreter_pool is not None else 'fallback'
     
-    def fallback_prediction(self, title, description, complexity):
+    def uncalibrated_estimates(self, items, keywords):
+        """Estimasi model (atau fallback jika model tidak ada/gagal) sebelum kalibrasi;
+        return ([(menit, confidence)], model_ok)"""
+        estimates = None
+        if self.interpreter_pool is not None:
+            try:
+                estimates = self.predict_with_model(items, keywords)
+            except Exception as e:
+                logger.error(f"Error in batch model prediction: {str(e)}")
+        
+        model_ok = estimates is not None
+        if estimates is None:
+            fallback_started = time.perf_counter()
+            estimates = []
+            for item, matched in zip(items, keywords):
+                try:
+                    estimates.append(self.fallback_prediction(
+                        item.get('title') or '',
+                        item.get('description') or '',
+                        item.get('complexity') or 'medium',
+                        matched
+                    ))
+                except Exception as e:
+                    logger.error(f"Error in prediction: {str(e)}")
+                    estimates.append((60, 0.5))
+            fallback_latency.observe(time.perf_counter() - fallback_started)
+        return estimates, model_ok
+    
+    def predict_batch_uncached(self, items):
+        """Jalankan model (atau fallback) untuk items; return (predictions, model_ok)"""
+        with keywords_latency.time():
+            keywords = [self.match_keywords(item.get('title') or '', item.get('description') or '')
+                        for item in items]
+        
+        estimates, model_ok = self.uncalibrated_estimates(items, keywords)
+        (model_predictions if model_ok else fallback_predictions).inc(len(items))
+        
+        estimates = self.calibrate(items, keywords, estimates)
+        predictions = [{
+            'estimated_time': max(15, min(480, estimated_time)),
+            'confidence': round(confidence, 2)
+        } for estimated_time, confidence in estimates]
+        return predictions, model_ok
+    
+    
+    def fallback_prediction(self, title, description, complexity, keywords=None):
         """Prediksi fallback jika model tidak tersedia"""
         base_time = 60  # 60 minutes base time
         
@@ -145,11 +884,9 @@ class TaskPredictor:
         multiplier = complexity_multiplier.get(complexity.lower(), 1.0)
         
         # Check for keywords
-        text = f"{title} {description}".lower()
-        keyword_time = 0
-        for keyword, time in self.time_keywords.items():
-            if keyword in text:
-                keyword_time = max(keyword_time, time)
+        if keywords is None:
+            keywords = self.match_keywords(title, description)
+        keyword_time = max(keywords.values(), default=0)
         
         # Calculate final time
         if keyword_time > 0:
@@ -166,38 +903,684 @@ class TaskPredictor:
         
         return estimated_time, 0.75  # Lower confidence for fallback
     
+    def predict_degraded(self, items):
+        """Jalur overload: hasil cache jika ada, selain itu fallback_prediction dengan confidence
+        diturunkan. Tanpa model dan kalibrasi, dan hasilnya tidak di-cache."""
+        predictions = []
+        version = self.prediction_version
+        for item in items:
+            title = item.get('title') or ''
+            description = item.get('description') or ''
+            complexity = item.get('complexity') or 'medium'
+            if self.cache is not None:
+                cached = self.cache.get(self.cache.make_key(version, title, description, complexity))
+                if cached is not None:
+                    cached_predictions.inc()
+                    predictions.append(cached)
+                    continue
+            try:
+                estimated_time, confidence = self.fallback_prediction(title, description, complexity)
+            except Exception as e:
+                logger.error(f"Error in prediction: {str(e)}")
+                estimated_time, confidence = 60, 0.5
+            degraded_predictions.inc()
+            predictions.append({
+                'estimated_time': max(15, min(480, estimated_time)),
+                'confidence': round(confidence * DEGRADED_CONFIDENCE_FACTOR, 2)
+            })
+        return predictions
+    
     def predict(self, title, description, complexity):
-        """Main prediction method"""
+        """Main prediction method; return (prediction, path), path 'model' atau 'fallback'
+        (model belum dimuat atau gagal untuk task ini)"""
         try:
-            # Preprocess input
-            features = self.preprocess_input(title, description, complexity)
+            # Cek cache dulu
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(self.prediction_version, title, description, complexity)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    cached_predictions.inc()
+                    return cached, self.cached_path()
             
-            # Try model prediction first
-            model_result = self.predict_with_model(features)
+            # Keyword dicari sekali, dipakai preprocessing dan fallback
+            with keywords_latency.time():
+                keywords = self.match_keywords(title, description)
+            
+            # Try model prediction first (fitur ditulis langsung ke tensor input)
+            item = {'title': title, 'description': description, 'complexity': complexity}
+            model_result = None
+            if self.interpreter_pool is not None:
+                try:
+                    model_result = self.predict_with_model([item], [keywords])[0]
+                except Exception as e:
+                    logger.error(f"Error in model prediction: {str(e)}")
             
             if model_result:
                 estimated_time, confidence = model_result
+                model_predictions.inc()
             else:
                 # Fallback to rule-based prediction
-                estimated_time, confidence = self.fallback_prediction(title, description, complexity)
+                with fallback_latency.time():
+                    estimated_time, confidence = self.fallback_prediction(title, description, complexity, keywords)
+                fallback_predictions.inc()
+            
+            # Koreksi dari online learning (actual_time task yang sudah selesai)
+            estimated_time, confidence = self.calibrate([item], [keywords], [(estimated_time, confidence)])[0]
             
             # Ensure reasonable bounds
             estimated_time = max(15, min(480, estimated_time))  # Between 15 minutes and 8 hours
             
-            return {
+            prediction = {
                 'estimated_time': estimated_time,
                 'confidence': round(confidence, 2)
             }
+            
+            # Hasil fallback karena model gagal jangan di-cache
+            if cache_key is not None and (model_result or self.interpreter_pool is None):
+                self.cache.put(cache_key, prediction)
+            
+            return prediction, 'model' if model_result else 'fallback'
         
         except Exception as e:
             logger.error(f"Error in prediction: {str(e)}")
+            failed_predictions.inc()
             return {
                 'estimated_time': 60,  # Default 1 hour
                 'confidence': 0.5
+            }, 'fallback'
+
+class LinearCalibrator:
+    """Model ridge hasil online learning: menit = f(fitur task, estimasi dasar).
+
+    Input-nya fitur FeatureExtractor ditambah estimasi model/fallback (dibagi
+    240) dan bias; target-nya actual_time / 240. Objek tidak pernah diubah
+    setelah dibuat, jadi bisa dipakai banyak thread tanpa lock.
+    """
+    
+    def __init__(self, weights, samples, mae, baseline_mae):
+        self.weights = weights
+        self.input_size = len(weights) - 2
+        self.samples = samples
+        self.mae = mae
+        self.baseline_mae = baseline_mae
+        self.version = hashlib.sha256(weights.tobytes()).hexdigest()[:12]
+        self.created_at = time.time()
+        # Semakin jauh di bawah error estimasi lama, semakin yakin
+        self.confidence = round(max(0.5, min(0.95, 0.85 * baseline_mae / max(mae, 1e-6))), 2)
+    
+    def predict(self, features, base_estimates):
+        """features [B, N], base_estimates [B] menit; return menit [B]"""
+        scores = features @ self.weights[:self.input_size]
+        scores += base_estimates / 240.0 * self.weights[-2] + self.weights[-1]
+        return scores * 240.0
+    
+    def get_info(self):
+        return {
+            'version': self.version,
+            'samples': self.samples,
+            'mae_minutes': round(self.mae, 2),
+            'baseline_mae_minutes': round(self.baseline_mae, 2),
+            'confidence': self.confidence,
+            'created_at': self.created_at
+        }
+
+class OnlineTrainer:
+    """Latih LinearCalibrator di background dari task yang selesai (estimasi dasar vs actual).
+
+    Perubahan task ditarik per chunk lewat /tasks/changes backend (delta sync),
+    jadi setiap putaran hanya membaca task yang berubah sejak putaran
+    sebelumnya. Yang disimpan hanya statistik cukup ridge regression
+    (X^T X dan X^T y, dengan faktor lupa), sehingga update per chunk murah
+    dan fit ulang cukup satu solve kecil. Chunk terakhir ditahan di luar
+    statistik (holdout): model baru hanya dipasang jika error-nya pada chunk
+    itu lebih kecil dari estimasi dasar.
+
+    Estimasi dasar adalah estimasi model/fallback sebelum kalibrasi, dihitung
+    ulang dari task-nya; estimated_time yang tersimpan di backend sudah
+    dikalibrasi, jadi melatih dari situ membuat model mengejar outputnya sendiri.
+    """
+    
+    def __init__(self, predictor, backend_url=BACKEND_URL, interval=ONLINE_POLL_INTERVAL,
+                 state_path=ONLINE_STATE_PATH, cpu_budget=ONLINE_CPU_BUDGET):
+        self.predictor = predictor
+        self.backend_url = backend_url.rstrip('/')
+        self.interval = interval
+        self.state_path = state_path
+        self.cpu_budget = max(0.01, min(1.0, cpu_budget))
+        self.lock = threading.Lock()
+        self.gram = None
+        self.moment = None
+        self.since = 0
+        self.samples = 0
+        self.holdout = None  # (design, features, base, actual) chunk terakhir, belum masuk statistik
+        self.failures = 0  # putaran gagal berturut-turut, untuk backoff
+        # Error absolut (menit) estimasi lama vs model aktif, diukur sebelum sampel dipakai training
+        self.errors = {'count': 0, 'baseline_sum': 0.0, 'model_sum': 0.0}
+        self.stats = {'chunks': 0, 'samples_seen': 0, 'refits': 0, 'swaps': 0, 'rejected': 0,
+                      'resets': 0, 'errors': 0, 'busy_seconds': 0.0, 'throttled_seconds': 0.0,
+                      'last_run': None}
+        self.load_state()
+        self.worker = threading.Thread(target=self._run, name='online-trainer', daemon=True)
+        self.worker.start()
+    
+    def _reset(self, size):
+        self.gram = np.zeros((size, size), dtype=np.float64)
+        self.moment = np.zeros(size, dtype=np.float64)
+        self.samples = 0
+        self.holdout = None
+        self.errors = {'count': 0, 'baseline_sum': 0.0, 'model_sum': 0.0}
+    
+    def _fold(self, design, actual):
+        """Masukkan satu chunk ke statistik ridge (dipanggil dengan lock)"""
+        decay = ONLINE_DECAY ** len(actual)
+        self.gram *= decay
+        self.moment *= decay
+        self.gram += design.T @ design
+        self.moment += design.T @ (actual / 240.0)
+        self.samples += len(actual)
+    
+    def _fold_holdout(self):
+        if self.holdout is not None:
+            design, _, _, actual = self.holdout
+            self._fold(design, actual)
+            self.holdout = None
+    
+    def _solve(self):
+        """Bobot ridge dari statistik saat ini, atau None jika sampelnya belum cukup"""
+        if self.gram is None or self.samples < ONLINE_MIN_SAMPLES:
+            return None
+        regularizer = ONLINE_RIDGE * np.eye(self.gram.shape[0])
+        regularizer[-1, -1] = 0.0  # bias tidak di-regularisasi
+        return np.linalg.solve(self.gram + regularizer, self.moment).astype(np.float32)
+    
+    def load_state(self):
+        """Lanjutkan dari state tersimpan dan pasang lagi modelnya (tanpa menunggu backend)"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with np.load(self.state_path) as state:
+                self.gram = state['gram']
+                self.moment = state['moment']
+                self.since = int(state['since'])
+                self.samples = int(state['samples'])
+                accepted = state['accepted'].tolist()  # [mae, baseline_mae] model aktif, kosong jika tidak ada
+            logger.info(f"Online learning state loaded: {self.samples} samples, version {self.since}")
+            if accepted:
+                self.refit(accepted=accepted)
+        except Exception as e:
+            logger.error(f"Error loading online learning state: {str(e)}")
+            self.gram = self.moment = None
+            self.since = 0
+    
+    def save_state(self):
+        if not self.state_path or self.gram is None:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        # Lock: bisa juga dipanggil shutdown() saat training sedang berjalan
+        with self.lock, open(tmp_path, 'wb') as f:
+            # since sudah melewati chunk holdout, jadi chunk itu harus ikut tersimpan
+            self._fold_holdout()
+            learned = self.predictor.learned_model
+            accepted = [learned.mae, learned.baseline_mae] if learned is not None else []
+            np.savez(f, gram=self.gram, moment=self.moment, since=self.since, samples=self.samples,
+                     accepted=np.array(accepted, dtype=np.float64))
+        os.replace(tmp_path, self.state_path)
+    
+    def fetch_changes(self, since):
+        query = urllib.parse.urlencode({'since': since})
+        with urllib.request.urlopen(f"{self.backend_url}/tasks/changes?{query}", timeout=30) as response:
+            return json.loads(response.read())
+    
+    @staticmethod
+    def training_samples(tasks):
+        """Task selesai yang punya waktu aktual"""
+        return [task for task in tasks
+                if task.get('status') == 'completed'
+                and isinstance(task.get('actual_time'), (int, float)) and task['actual_time'] > 0]
+    
+    def base_estimates(self, tasks, keywords):
+        """Estimasi dasar (menit, sebelum kalibrasi) seperti yang dipakai calibrate() saat serving"""
+        estimates, _ = self.predictor.uncalibrated_estimates(tasks, keywords)
+        return np.array([max(15, min(480, minutes)) for minutes, _ in estimates], dtype=np.float64)
+    
+    def train_chunk(self, tasks):
+        """Tahan satu chunk sampel sebagai holdout; holdout sebelumnya masuk statistik ridge"""
+        if not tasks:
+            return
+        keywords = [self.predictor.match_keywords(task.get('title') or '', task.get('description') or '')
+                    for task in tasks]
+        features = self.predictor.preprocess_batch(tasks, keywords)
+        base = self.base_estimates(tasks, keywords)
+        actual = np.array([task['actual_time'] for task in tasks], dtype=np.float64)
+        design = np.empty((len(tasks), features.shape[1] + 2), dtype=np.float64)
+        design[:, :-2] = features
+        design[:, -2] = base / 240.0
+        design[:, -1] = 1.0
+        
+        with self.lock:
+            if self.gram is None or self.gram.shape[0] != design.shape[1]:
+                self._reset(design.shape[1])
+            
+            # Evaluasi prequential: model aktif diuji pada sampel yang belum pernah dilihatnya
+            learned = self.predictor.learned_model
+            self.errors['count'] += len(tasks)
+            self.errors['baseline_sum'] += float(np.abs(base - actual).sum())
+            if learned is not None and learned.input_size == features.shape[1]:
+                predicted = np.clip(learned.predict(features, base.astype(np.float32)), 15, 480)
+                self.errors['model_sum'] += float(np.abs(predicted - actual).sum())
+            else:
+                self.errors['model_sum'] += float(np.abs(base - actual).sum())
+            
+            self._fold_holdout()
+            self.holdout = (design, features, base, actual)
+    
+    def refit(self, accepted=None):
+        """Solve ridge dan pasang modelnya jika lebih baik dari estimasi dasar pada chunk holdout
+        (accepted=[mae, baseline_mae] untuk model yang sudah lolos sebelumnya, lihat load_state).
+
+        Kandidat di-solve tanpa holdout; holdout baru masuk statistik setelah
+        perbandingan, lalu model yang dipasang di-solve ulang dengan semua sampel.
+        """
+        with self.lock:
+            holdout = self.holdout
+            candidate = self._solve() if holdout is not None and accepted is None else None
+            self._fold_holdout()
+            weights = self._solve()
+            samples = self.samples
+        if weights is None:
+            return None
+        
+        self.stats['refits'] += 1
+        if accepted is not None:
+            mae, baseline_mae = accepted
+        elif candidate is None:
+            return None
+        else:
+            _, features, base, actual = holdout
+            model = LinearCalibrator(candidate, samples, 0.0, 0.0)
+            predicted = np.clip(model.predict(features, base.astype(np.float32)), 15, 480)
+            mae = float(np.abs(predicted - actual).mean())
+            baseline_mae = float(np.abs(base - actual).mean())
+            if mae >= baseline_mae:
+                self.stats['rejected'] += 1
+                logger.info(f"Learned model rejected: MAE {mae:.1f} >= baseline {baseline_mae:.1f} minutes")
+                return None
+        
+        model = LinearCalibrator(weights, samples, mae, baseline_mae)
+        self.predictor.swap_learned_model(model)
+        self.stats['swaps'] += 1
+        return model
+    
+    def _throttle(self, busy):
+        """Tidur sebanding waktu CPU yang dipakai agar training <= cpu_budget dari satu core"""
+        self.stats['busy_seconds'] += busy
+        pause = busy * (1.0 - self.cpu_budget) / self.cpu_budget
+        if pause > 0:
+            self.stats['throttled_seconds'] += pause
+            time.sleep(pause)
+    
+    def run_once(self):
+        """Tarik semua perubahan sejak putaran sebelumnya, latih per chunk, lalu fit ulang"""
+        trained = 0
+        while True:
+            changes = self.fetch_changes(self.since)
+            started = time.thread_time()
+            if changes.get('reset'):
+                if self.since == 0:
+                    # since=0 selalu dijawab dengan snapshot; reset di sini berarti backend tidak
+                    # mendukungnya, dan mengulang hanya memutar loop ini tanpa henti
+                    raise RuntimeError('Backend answered since=0 with a reset')
+                # Versi kita sudah dikompaksi di backend: latih ulang dari snapshot since=0
+                with self.lock:
+                    self.gram = self.moment = None
+                    self.holdout = None
+                    self.samples = 0
+                self.since = 0
+                self.stats['resets'] += 1
+                continue
+            
+            samples = self.training_samples(changes.get('upserted', []))
+            self.train_chunk(samples)
+            trained += len(samples)
+            self.since = changes['version']
+            self.stats['chunks'] += 1
+            self.stats['samples_seen'] += len(samples)
+            self._throttle(time.thread_time() - started)
+            if not changes.get('has_more'):
+                break
+        
+        if trained:
+            started = time.thread_time()
+            self.refit()
+            self.save_state()
+            self._throttle(time.thread_time() - started)
+        self.stats['last_run'] = time.time()
+        return trained
+    
+    def next_delay(self):
+        """Jeda sebelum putaran berikutnya: interval, dikali 2 per putaran gagal berturut-turut"""
+        return self.interval * min(2 ** self.failures, ONLINE_MAX_BACKOFF)
+    
+    def _run(self):
+        while True:
+            time.sleep(self.next_delay())
+            try:
+                self.run_once()
+                self.failures = 0
+            except Exception as e:
+                self.failures += 1
+                self.stats['errors'] += 1
+                logger.warning(f"Online learning round failed ({self.failures} in a row): {str(e)}")
+    
+    def get_stats(self):
+        with self.lock:
+            count = self.errors['count']
+            prequential = {
+                'samples': count,
+                'baseline_mae_minutes': round(self.errors['baseline_sum'] / count, 2) if count else None,
+                'model_mae_minutes': round(self.errors['model_sum'] / count, 2) if count else None
             }
+            return dict(self.stats, samples=self.samples, since_version=self.since,
+                        holdout_samples=len(self.holdout[3]) if self.holdout is not None else 0,
+                        consecutive_failures=self.failures, cpu_budget=self.cpu_budget,
+                        prequential=prequential)
+
+class ModelWatcher:
+    """Pantau file ACTIVE registry dan file model_path (polling stat); reload di background
+    saat berubah. Perubahan baru diproses setelah stabil selama satu interval, supaya file
+    yang masih ditulis tidak ikut dimuat."""
+    
+    def __init__(self, predictor, interval=MODEL_WATCH_INTERVAL):
+        self.predictor = predictor
+        self.interval = interval
+        self.loaded_signature = self._signature()
+        self.worker = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+        self.worker.start()
+    
+    def _signature(self):
+        signature = []
+        for path in (self.predictor.registry.active_path, self.predictor.model_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def _run(self):
+        pending = None
+        while True:
+            time.sleep(self.interval)
+            signature = self._signature()
+            if signature == self.loaded_signature:
+                pending = None
+            elif signature != pending:
+                pending = signature
+            elif self.predictor.reload_model():
+                logger.info("Model file changed, reloading in background")
+                self.loaded_signature = signature
+                pending = None
+
+class MicroBatcher:
+    """Kumpulkan panggilan /predict yang bersamaan lalu jalankan sebagai satu batch.
+
+    Satu batch dikirim begitu ``max_batch_size`` request terkumpul atau
+    ``window_ms`` berlalu sejak request pertama, mana yang lebih dulu.
+    """
+    
+    EWMA_WEIGHT = 0.2
+    
+    def __init__(self, predictor, window_ms=MICROBATCH_WINDOW_MS, max_batch_size=MICROBATCH_MAX_SIZE):
+        self.predictor = predictor
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        # Untuk expected_seconds(): EWMA durasi satu batch dan awal batch yang sedang berjalan
+        self.batch_seconds = 0.0
+        self.batch_started = None
+        self.pending = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name='predict-microbatcher', daemon=True)
+        self.worker.start()
+    
+    def submit(self, title, description, complexity):
+        """Masukkan satu request; blok sampai batch-nya selesai diprediksi, return (prediction, path)"""
+        return self.enqueue(title, description, complexity).result()
+    
+    def enqueue(self, title, description, complexity):
+        """Seperti submit(), tetapi langsung mengembalikan Future hasilnya"""
+        future = Future()
+        self.pending.put(({'title': title, 'description': description, 'complexity': complexity}, future))
+        return future
+    
+    def expected_seconds(self):
+        """Perkiraan waktu sampai request yang masuk sekarang selesai: sisa batch yang sedang
+        berjalan, lalu jendela dan batch berikutnya"""
+        started = self.batch_started
+        remaining = 0.0 if started is None else max(self.batch_seconds - (time.perf_counter() - started), 0.0)
+        return remaining + self.window + self.batch_seconds
+    
+    def _collect(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            self.batch_started = started = time.perf_counter()
+            try:
+                predictions, path = self.predictor.predict_many(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                self.batch_started = None
+            seconds = time.perf_counter() - started
+            self.batch_seconds += self.EWMA_WEIGHT * (seconds - self.batch_seconds) if self.batch_seconds else seconds
+            for (_, future), prediction in zip(batch, predictions):
+                future.set_result((prediction, path))
+
+class AdmissionController:
+    """Admission control jalur model untuk /predict dan /predict/batch.
+
+    Paling banyak ``max_inflight`` item berada di jalur model sekaligus; request
+    lain antre FIFO, paling banyak ``max_queue``, dan sisanya di-shed (503).
+    Request dengan deadline hanya masuk jalur model jika masih sempat: perkiraan
+    waktu layanannya harus muat di sisa deadline, termasuk selama menunggu
+    giliran. Jika tidak, atau deadline sudah lewat saat request tiba, ia dilayani
+    fallback_prediction saat itu juga (degraded).
+    """
+    
+    EWMA_WEIGHT = 0.2
+    
+    def __init__(self, max_inflight=PREDICT_MAX_INFLIGHT, max_queue=PREDICT_MAX_QUEUE):
+        self.max_inflight = max(max_inflight, 1)
+        self.max_queue = max_queue
+        self.cond = threading.Condition()
+        self.inflight = 0  # item
+        self.waiting = deque()
+        # EWMA waktu layanan (detik, tanpa antre admission) per jenis request, lihat latency_key
+        self.latency = {}
+        # (keputusan, alasan) -> jumlah request
+        self.decisions = {('model', 'admitted'): 0, ('degraded', 'deadline'): 0, ('degraded', 'expired'): 0,
+                          ('degraded', 'late'): 0, ('shed', 'queue_full'): 0}
+    
+    @staticmethod
+    def latency_key(items):
+        """Kelas ukuran /predict/batch: batch<2, batch<4, ..., batch<512"""
+        return f'batch<{1 << items.bit_length()}'
+    
+    def _decide(self, decision, reason='admitted'):
+        self.decisions[(decision, reason)] += 1
+        return decision, reason
+    
+    def expected_seconds(self, key):
+        """Perkiraan waktu layanan request jenis key (0 jika belum terukur)"""
+        return self.latency.get(key, 0.0)
+    
+    def observe(self, key, seconds):
+        """Catat waktu layanan satu request jenis key"""
+        with self.cond:
+            previous = self.latency.get(key)
+            self.latency[key] = seconds if previous is None else previous + self.EWMA_WEIGHT * (seconds - previous)
+    
+    def acquire(self, items, deadline=None, expected=0.0):
+        """Putuskan jalur satu request berisi items task (deadline dalam time.monotonic(),
+        None = tanpa batas; expected = perkiraan waktu layanan dalam detik).
+
+        Return (keputusan, alasan): ('model', 'admitted') berarti slot dipegang dan
+        release() wajib dipanggil; ('degraded', 'deadline' | 'expired') atau ('shed', 'queue_full').
+        """
+        weight = min(items, self.max_inflight)
+        with self.cond:
+            if deadline is not None:
+                now = time.monotonic()
+                # Deadline habis (atau deadline_ms 0): fallback masih bisa menjawab seketika
+                if now >= deadline:
+                    return self._decide('degraded', 'expired')
+                # Saat jalur model kosong request tetap dicoba, agar perkiraan yang basi
+                # (misalnya dari lonjakan sesaat) terukur ulang dan tidak men-degrade selamanya
+                if now + expected > deadline and self.inflight:
+                    return self._decide('degraded', 'deadline')
+            if not self.waiting and self.inflight + weight <= self.max_inflight:
+                self.inflight += weight
+                return self._decide('model')
+            if len(self.waiting) >= self.max_queue:
+                return self._decide('shed', 'queue_full')
+            
+            ticket = object()
+            self.waiting.append(ticket)
+            try:
+                while self.waiting[0] is not ticket or self.inflight + weight > self.max_inflight:
+                    timeout = None if deadline is None else deadline - expected - time.monotonic()
+                    if timeout is not None and timeout <= 0:
+                        return self._decide('degraded', 'deadline')
+                    self.cond.wait(timeout)
+                self.inflight += weight
+                return self._decide('model')
+            finally:
+                self.waiting.remove(ticket)
+                # Request berikutnya di antrean sekarang bisa jadi yang terdepan
+                self.cond.notify_all()
+    
+    def release(self, items):
+        with self.cond:
+            self.inflight -= min(items, self.max_inflight)
+            self.cond.notify_all()
+    
+    def record_late(self):
+        """Request yang sudah masuk jalur model tetapi hasilnya terlambat, dilayani fallback"""
+        with self.cond:
+            self._decide('degraded', 'late')
+    
+    def get_stats(self):
+        with self.cond:
+            counts = {'model': 0, 'degraded': 0, 'shed': 0}
+            for (decision, _), count in self.decisions.items():
+                counts[decision] += count
+            return dict(counts, inflight=self.inflight, waiting=len(self.waiting),
+                        max_inflight=self.max_inflight, max_queue=self.max_queue,
+                        reasons={reason: count for (decision, reason), count in self.decisions.items()
+                                 if decision != 'model'},
+                        expected_ms={key: round(seconds * 1000, 3) for key, seconds in sorted(self.latency.items())})
 
 # Initialize predictor
-predictor = TaskPredictor()
+# Worker ProcessInterpreterPool meng-import ulang script utama (python ai_service.py) sebagai
+# __mp_main__; di sana predictor, pool dan thread background tidak boleh dibuat lagi
+SERVICE_PROCESS = __name__ != '__mp_main__'
+if SERVICE_PROCESS:
+    predictor = TaskPredictor(background=MODEL_BACKGROUND_LOAD)
+    batcher = MicroBatcher(predictor) if MICROBATCH_ENABLED else None
+    admission = AdmissionController()
+    trainer = OnlineTrainer(predictor) if ONLINE_LEARNING_ENABLED else None
+    watcher = ModelWatcher(predictor) if MODEL_WATCH_INTERVAL > 0 else None
+else:
+    predictor = batcher = admission = trainer = watcher = None
+
+def cache_stats(keys):
+    if predictor.cache is None:
+        return {}
+    stats = predictor.cache.get_stats()
+    return {key: stats[key] for key in keys}
+
+def active_model_info():
+    model = predictor.active
+    learned = predictor.learned_model
+    return {(model.version, model.source, model.feature_extractor.schema,
+             learned.version if learned is not None else ''): 1}
+
+# Statistik yang sudah dihitung komponen di atas, dibaca saat /metrics di-scrape
+metrics.callback('prediction_cache_events_total', 'Prediction cache lookups and removals by event', 'counter',
+                 lambda: cache_stats(('hits', 'misses', 'evictions', 'expirations')), ['event'])
+metrics.callback('prediction_cache_entries', 'Entries in the prediction cache', 'gauge',
+                 lambda: {(): predictor.cache.get_stats()['size']} if predictor.cache is not None else {})
+metrics.callback('model_info', 'Active model version (value is always 1)', 'gauge', active_model_info,
+                 ['version', 'source', 'feature_schema', 'learned_model'])
+metrics.callback('model_ready', 'Whether the model is loaded and warmed up (0 while /predict uses the fallback)',
+                 'gauge', lambda: {(): int(predictor.ready)})
+metrics.callback('startup_duration_seconds', 'Time from import to each startup phase of this worker', 'gauge',
+                 lambda: {(phase,): values['ms'] / 1000 for phase, values in startup_report.phases.items()},
+                 ['phase'])
+metrics.callback('predict_admission_total', 'Prediction requests by admission decision (model, degraded, shed)',
+                 'counter', lambda: dict(admission.decisions), ['decision', 'reason'])
+metrics.callback('predict_admission_inflight', 'Task items on the model path right now', 'gauge',
+                 lambda: {(): admission.inflight})
+metrics.callback('predict_admission_waiting', 'Prediction requests waiting for the model path', 'gauge',
+                 lambda: {(): len(admission.waiting)})
+metrics.callback('online_learning_samples', 'Samples in the online learning statistics', 'gauge',
+                 lambda: {(): trainer.samples} if trainer is not None else {})
+
+def parse_deadline(data):
+    """Deadline request sebagai time.monotonic(), dari header X-Deadline-Ms atau field deadline_ms:
+    sisa waktu (ms) yang masih mau ditunggu pemanggil, dihitung dari request diterima.
+    None = tanpa batas. ValueError jika bukan angka."""
+    value = request.headers.get('X-Deadline-Ms', data.get('deadline_ms'))
+    if value is None:
+        value = PREDICT_DEFAULT_DEADLINE_MS or None
+        if value is None:
+            return None
+    budget = float(value)
+    if not math.isfinite(budget):
+        raise ValueError(f'Invalid deadline {value}')
+    return time.monotonic() + budget / 1000 - (time.perf_counter() - g.request_started)
+
+def overloaded_response(reason):
+    """503 untuk request yang di-shed admission control"""
+    response = jsonify({'error': 'Prediction service overloaded', 'reason': reason})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+def predict_admitted(title, description, complexity, deadline):
+    """Prediksi satu task di jalur model (slot admission sudah dipegang dan dilepas di sini);
+    return (prediction, path) seperti TaskPredictor.predict, atau None jika hasil microbatch
+    belum siap saat deadline"""
+    if batcher is None:
+        started = time.perf_counter()
+        try:
+            return predictor.predict(title, description, complexity)
+        finally:
+            admission.release(1)
+            admission.observe('single', time.perf_counter() - started)
+    
+    future = batcher.enqueue(title, description, complexity)
+    # Slot dilepas saat batch benar-benar selesai, juga jika pemanggil sudah menyerah
+    future.add_done_callback(lambda _: admission.release(1))
+    try:
+        return future.result(None if deadline is None else max(deadline - time.monotonic(), 0))
+    except FutureTimeout:
+        admission.record_late()
+        return None
 
 # Routes
 @app.route('/predict', methods=['POST'])
@@ -217,8 +1600,25 @@ def predict_task_time():
         if not title:
             return jsonify({'error': 'Title is required'}), 400
         
-        # Make prediction
-        prediction = predictor.predict(title, description, complexity)
+        try:
+            deadline = parse_deadline(data)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'deadline_ms must be a number'}), 400
+        
+        # Admission control: model (lewat micro-batcher jika aktif), fallback degraded, atau shed
+        expected = batcher.expected_seconds() if batcher is not None else admission.expected_seconds('single')
+        decision, reason = admission.acquire(1, deadline, expected)
+        if decision == 'shed':
+            return overloaded_response(reason)
+        result = None
+        if decision == 'model':
+            result = predict_admitted(title, description, complexity, deadline)
+        if result is not None:
+            prediction, path = result
+        else:
+            path = 'degraded'
+            prediction = predictor.predict_degraded(
+                [{'title': title, 'description': description, 'complexity': complexity}])[0]
         
         response = {
             'input': {
@@ -226,10 +1626,11 @@ def predict_task_time():
                 'description': description,
                 'complexity': complexity
             },
-            'prediction': prediction
+            'prediction': prediction,
+            'path': path
         }
         
-        logger.info(f"Prediction made: {prediction['estimated_time']} minutes with {prediction['confidence']} confidence")
+        logger.debug(f"Prediction made: {prediction['estimated_time']} minutes with {prediction['confidence']} confidence")
         
         return jsonify(response), 200
     
@@ -237,27 +1638,185 @@ def predict_task_time():
         logger.error(f"Error in prediction endpoint: {str(e)}")
         return jsonify({'error': 'Prediction failed'}), 500
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Prediksi banyak tugas sekaligus dengan satu invoke()"""
+    try:
+        data = request.get_json()
+        
+        # Validasi input
+        if not data or not isinstance(data.get('tasks'), list):
+            return jsonify({'error': 'A list of tasks is required'}), 400
+        
+        tasks = data['tasks']
+        if len(tasks) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch size must not exceed {MAX_BATCH_SIZE}'}), 400
+        
+        if any(not isinstance(task, dict) or not task.get('title') for task in tasks):
+            return jsonify({'error': 'Title is required for every task'}), 400
+        
+        try:
+            deadline = parse_deadline(data)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'deadline_ms must be a number'}), 400
+        
+        key = admission.latency_key(len(tasks))
+        decision, reason = admission.acquire(len(tasks), deadline, admission.expected_seconds(key))
+        if decision == 'shed':
+            return overloaded_response(reason)
+        if decision == 'model':
+            started = time.perf_counter()
+            try:
+                predictions, path = predictor.predict_many(tasks)
+            finally:
+                admission.release(len(tasks))
+                admission.observe(key, time.perf_counter() - started)
+        else:
+            path = 'degraded'
+            predictions = predictor.predict_degraded(tasks)
+        
+        logger.debug(f"Batch prediction made for {len(predictions)} tasks ({path})")
+        
+        return jsonify({'predictions': predictions, 'path': path}), 200
+    
+    except Exception as e:
+        logger.error(f"Error in batch prediction endpoint: {str(e)}")
+        return jsonify({'error': 'Prediction failed'}), 500
+
 @app.route('/model/info', methods=['GET'])
 def model_info():
     """Informasi tentang model"""
+    model = predictor.active
     info = {
-        'model_loaded': predictor.interpreter is not None,
-        'model_path': predictor.model_path,
+        'model_loaded': model.pool is not None,
+        'model_path': model.path,
         'input_shape': None,
-        'output_shape': None
+        'output_shape': None,
+        'interpreter_pool': None,
+        'model_version': model.version,
+        'model': model.get_info(),
+        'reload': predictor.reload_status,
+        'feature_schema': model.feature_extractor.schema,
+        'learned_model': predictor.learned_model.get_info() if predictor.learned_model else None,
+        'previous_learned_model': (predictor.previous_learned_model.get_info()
+                                   if predictor.previous_learned_model else None),
+        'online_learning': trainer.get_stats() if trainer is not None else None,
+        'cache': predictor.cache.get_stats() if predictor.cache is not None else None,
+        'admission': admission.get_stats()
     }
     
-    if predictor.interpreter:
-        info['input_shape'] = predictor.input_details[0]['shape'].tolist()
-        info['output_shape'] = predictor.output_details[0]['shape'].tolist()
+    if model.pool:
+        info['interpreter_pool'] = {
+            'mode': model.pool.mode,
+            'size': model.pool.size,
+            'num_threads': model.pool.num_threads
+        }
+        info['input_shape'] = model.input_details[0]['shape'].tolist()
+        info['output_shape'] = model.output_details[0]['shape'].tolist()
     
     return jsonify(info), 200
 
+@app.route('/models', methods=['GET'])
+def list_models():
+    """Versi model di registry lokal"""
+    try:
+        return jsonify({
+            'active': predictor.model_version,
+            'registry_active': predictor.registry.active_version(),
+            'versions': predictor.registry.versions()
+        }), 200
+    except Exception as e:
+        logger.error(f"Error listing models: {str(e)}")
+        return jsonify({'error': 'Failed to list models'}), 500
+
+@app.route('/model/reload', methods=['POST'])
+@admin_required
+def reload_model():
+    """Muat model (versi registry tertentu atau yang aktif), warm-up, lalu pasang tanpa restart"""
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    
+    if version is not None:
+        try:
+            predictor.registry.manifest(version)
+        except (OSError, ValueError):
+            return jsonify({'error': f"Unknown model version '{version}'"}), 404
+    
+    wait = bool(data.get('wait'))
+    if not predictor.reload_model(version, wait=wait, force=bool(data.get('force'))):
+        return jsonify({'error': 'A model reload is already in progress'}), 409
+    
+    if not wait:
+        return jsonify({'reload': predictor.reload_status}), 202
+    
+    status = predictor.reload_status
+    if status['state'] == 'failed':
+        return jsonify({'reload': status}), 500
+    return jsonify({'reload': status, 'model': predictor.active.get_info()}), 200
+
+@app.route('/model/rollback', methods=['POST'])
+@admin_required
+def rollback_model():
+    """Kembalikan model kalibrasi online learning ke versi sebelumnya"""
+    if not predictor.rollback_learned_model():
+        return jsonify({'error': 'No learned model to roll back'}), 409
+    
+    learned = predictor.learned_model
+    return jsonify({'learned_model': learned.get_info() if learned else None}), 200
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'service': 'ai-prediction-service'}), 200
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 selama model dimuat (/predict memakai fallback), 200 setelah warm-up"""
+    ready = predictor.ready
+    return jsonify({
+        'ready': ready,
+        'state': predictor.startup['state'],
+        'model_version': predictor.model_version,
+        'model_load_ms': predictor.startup['load_ms'],
+        'error': predictor.startup['error'],
+        'startup': startup_report.get_stats()
+    }), 200 if ready else 503
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    if 'first_response' not in startup_report.phases:
+        startup_report.mark('first_response')
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(time.perf_counter() - started, method=request.method,
+                                route=route, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Metrik dalam format teks Prometheus"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+if PROFILER_ENABLED:
+    @app.route('/debug/profile', methods=['GET'])
+    @admin_required
+    def profile():
+        """Sampling profiler: stack semua thread selama ?seconds= (default 5), format collapsed"""
+        try:
+            seconds = float(request.args.get('seconds', 5))
+            interval = float(request.args.get('interval', 0.005))
+            if not 0 < seconds <= PROFILER_MAX_SECONDS or not 0.001 <= interval <= 1:
+                raise ValueError
+        except ValueError:
+            return jsonify({'error': f'seconds must be in (0, {PROFILER_MAX_SECONDS}] '
+                                     'and interval in [0.001, 1]'}), 400
+        return Response(sample_stacks(seconds, interval), mimetype='text/plain')
+
 # Error handlers
 @app.errorhandler(400)
 def bad_request(error):
@@ -267,5 +1826,34 @@ def bad_request(error):
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
+def shutdown():
+    """Graceful shutdown: simpan state online learning, tutup pool setelah invoke yang berjalan selesai.
+
+    Dipanggil hook worker_exit di gunicorn.conf.py, atau saat python ai_service.py
+    menerima SIGTERM/Ctrl+C.
+    """
+    if trainer is not None:
+        try:
+            trainer.save_state()
+        except Exception as e:
+            logger.error(f"Error saving online learning state on shutdown: {str(e)}")
+    handle = predictor.active
+    if handle is not None and handle.pool is not None:
+        handle.pool.close(graceful=True)
+    logger.info("AI service shut down")
+
+def interrupt_on_sigterm(signum, frame):
+    # SIGTERM (docker stop, systemd) diperlakukan seperti Ctrl+C agar shutdown() tetap jalan
+    raise KeyboardInterrupt
+
+if SERVICE_PROCESS:
+    startup_report.mark('imported')
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    signal.signal(signal.SIGTERM, interrupt_on_sigterm)
+    try:
+        app.run(debug=SERVER_DEBUG, host='0.0.0.0', port=PORT)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown()
@@ -0,0 +1,33 @@
+# gunicorn.conf.py
+"""Konfigurasi produksi AI service: gunicorn dengan worker gevent.
+
+    cd ai_service && gunicorn -c gunicorn.conf.py ai_service:app
+
+invoke() interpreter berjalan di threadpool hub (lihat BlockingRunner di
+common/serving.py), jadi satu worker tetap menerima request selama inferensi.
+Setiap worker memuat model dan pool interpreter sendiri; untuk memakai
+lebih banyak core, naikkan WEB_WORKERS atau INTERPRETER_POOL_SIZE.
+Model dimuat di background: arahkan readiness probe ke /ready, bukan /health.
+"""
+import os
+import sys
+
+# Harus diset sebelum ai_service.py di-import worker
+os.environ.setdefault('ASYNC_MODE', 'gevent')
+
+bind = os.environ.get('BIND', '0.0.0.0:5001')
+workers = int(os.environ.get('WEB_WORKERS', 1))
+worker_class = 'gevent'
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
+# Detik menunggu request yang masih berjalan setelah SIGTERM, sebelum worker dimatikan paksa
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 60))
+keepalive = int(os.environ.get('KEEPALIVE', 5))
+accesslog = os.environ.get('ACCESS_LOG')  # '-' untuk stdout
+
+
+def worker_exit(server, worker):
+    # Dipanggil setelah worker berhenti menerima request dan request berjalan selesai
+    service_module = sys.modules.get('ai_service')
+    if service_module is not None:
+        service_module.shutdown()
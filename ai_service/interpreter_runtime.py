@@ -0,0 +1,97 @@
+# interpreter_runtime.py
+"""Runtime TFLite: loader, InterpreterSlot dan fungsi worker process.
+
+Modul ini sengaja tanpa efek samping saat di-import (tanpa Flask, predictor
+atau thread), karena worker ProcessInterpreterPool dibuat dengan forkserver/
+spawn dan meng-import modul ini dari nol untuk menjalankan interpreter-nya.
+"""
+import importlib
+import logging
+import os
+import time
+
+# Runtime TensorFlow Lite di-import saat interpreter pertama dibuat (lihat load_tflite), bukan di sini:
+# import tensorflow.lite makan beberapa detik dan ratusan MB sebelum /health bisa menjawab
+TFLITE_MODULES = ('tflite_runtime.interpreter', 'ai_edge_litert.interpreter', 'tensorflow.lite')
+tflite = None
+
+INTERPRETER_NUM_THREADS = int(os.environ.get('INTERPRETER_NUM_THREADS', 1))
+
+logger = logging.getLogger(__name__)
+
+def load_tflite():
+    """Import runtime TFLite pertama yang terpasang (TFLITE_MODULES) dan simpan di global tflite.
+
+    Import paralel dari dua thread aman: import lock Python memastikan modulnya
+    hanya dieksekusi sekali.
+    """
+    global tflite
+    if tflite is None:
+        started = time.perf_counter()
+        for name in TFLITE_MODULES:
+            try:
+                module = importlib.import_module(name)
+            except ImportError:
+                continue
+            logger.info(f"Imported {name} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            tflite = module
+            break
+        else:
+            raise ImportError(f"No TensorFlow Lite runtime installed (tried {', '.join(TFLITE_MODULES)})")
+    return tflite
+
+class InterpreterSlot:
+    """Satu tflite.Interpreter beserta ukuran batch yang sedang dialokasikan"""
+
+    def __init__(self, model_path, num_threads=INTERPRETER_NUM_THREADS):
+        # model_path (bukan model_content) agar TFLite me-mmap file model:
+        # semua interpreter dan worker process berbagi halaman read-only yang sama
+        # (model_content butuh bytes, yaitu salinan privat per interpreter)
+        self.interpreter = load_tflite().Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()
+        self.output_details = self.interpreter.get_output_details()
+        input_shape = self.input_details[0]['shape']
+        self.batch_size = int(input_shape[0])
+        self.input_size = int(input_shape[1])
+        # Fungsi (bukan array) agar tidak ada referensi ke buffer yang tertahan antar invoke()
+        self.input_tensor = self.interpreter.tensor(self.input_details[0]['index'])
+
+    def _resize(self, batch_size):
+        """Resize input tensor ke [batch_size, N] jika ukuran batch berubah"""
+        if batch_size != self.batch_size:
+            self.interpreter.resize_tensor_input(
+                self.input_details[0]['index'], [batch_size, self.input_size]
+            )
+            self.interpreter.allocate_tensors()
+            self.batch_size = batch_size
+
+    def invoke(self, features):
+        """Jalankan satu invoke() untuk features [B, N]; input tensor di-resize jika B berubah"""
+        self._resize(features.shape[0])
+        self.interpreter.set_tensor(self.input_details[0]['index'], features)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_details[0]['index'])
+
+    def invoke_with(self, fill, batch_size):
+        """Seperti invoke(), tetapi fill(view) menulis fitur [B, N] langsung ke tensor input
+        interpreter lewat tensor() (zero-copy, tanpa array perantara)"""
+        self._resize(batch_size)
+        view = self.input_tensor()
+        try:
+            fill(view)
+        finally:
+            # invoke() menolak jalan selama masih ada referensi ke buffer internal
+            del view
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_details[0]['index'])
+
+# Interpreter milik worker process (diisi oleh init_process_worker)
+_worker_slot = None
+
+def init_process_worker(model_path, num_threads):
+    global _worker_slot
+    _worker_slot = InterpreterSlot(model_path, num_threads)
+
+def process_worker_invoke(features):
+    return _worker_slot.invoke(features)
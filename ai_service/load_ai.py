@@ -1,13 +1,78 @@
 # Di load_ai.py
-import urllib.request
+"""Download model, atau kelola registry model lokal.
+
+    python load_ai.py                                   # download ke task_predictor.tflite (jika belum ada)
+    python load_ai.py --register model.tflite --version v2 --activate
+    python load_ai.py --download --version v3           # download model_url ke registry
+    python load_ai.py --activate v2                     # ganti versi aktif
+    python load_ai.py --list
+
+Service yang berjalan memakai versi baru lewat POST /model/reload, atau
+otomatis jika MODEL_WATCH_INTERVAL diisi.
+"""
+import argparse
 import os
+import tempfile
+import urllib.request
+
+from model_registry import ModelRegistry
 
 model_url = "https://storage.googleapis.com/download.tensorflow.org/models/tflite/text_classification/text_classification.tflite"
 model_path = "task_predictor.tflite"
 
-if not os.path.exists(model_path):
-    print("Downloading model...")
-    urllib.request.urlretrieve(model_url, model_path)
-    print("Model downloaded successfully")
-else:
-    print("Model already exists")
+
+def download_legacy():
+    if not os.path.exists(model_path):
+        print("Downloading model...")
+        urllib.request.urlretrieve(model_url, model_path)
+        print("Model downloaded successfully")
+    else:
+        print("Model already exists")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download or register task predictor models')
+    parser.add_argument('--registry', default=os.environ.get('MODEL_REGISTRY_DIR', 'models'))
+    parser.add_argument('--register', metavar='PATH', help='add a local .tflite file to the registry')
+    parser.add_argument('--download', action='store_true', help='download --url into the registry')
+    parser.add_argument('--url', default=model_url)
+    parser.add_argument('--version', help='version name (default: first 12 chars of sha256)')
+    parser.add_argument('--activate', nargs='?', const=True, metavar='VERSION',
+                        help='make VERSION (or the one just registered) the active model')
+    parser.add_argument('--list', action='store_true', help='list registered versions')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    manifest = None
+
+    if args.register:
+        manifest = registry.register(args.register, args.version)
+    elif args.download:
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, 'model.tflite')
+            print(f"Downloading {args.url}...")
+            urllib.request.urlretrieve(args.url, target)
+            manifest = registry.register(target, args.version, source=args.url)
+    elif args.activate is None and not args.list:
+        download_legacy()
+        return
+
+    if manifest:
+        print(f"Registered {manifest['version']} (sha256 {manifest['sha256']}, {manifest['size']} bytes)")
+
+    if args.activate:
+        version = manifest['version'] if args.activate is True and manifest else args.activate
+        if version is True:
+            parser.error('--activate needs a VERSION when nothing was registered')
+        registry.set_active(version)
+        print(f"Active model: {version}")
+
+    if args.list:
+        active = registry.active_version()
+        for entry in registry.versions():
+            marker = '*' if entry['version'] == active else ' '
+            print(f"{marker} {entry['version']:<24} {entry['sha256'][:12]}  {entry['size']:>10d} bytes  {entry['source']}")
+
+
+if __name__ == '__main__':
+    main()
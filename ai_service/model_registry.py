@@ -0,0 +1,130 @@
+# model_registry.py
+"""Registry model lokal di disk, dipakai ai_service.py dan load_ai.py.
+
+Layout::
+
+    models/
+    ├── ACTIVE                  # nama versi yang sedang aktif
+    ├── v1/
+    │   ├── model.tflite
+    │   └── manifest.json       # version, sha256, size, registered_at, source
+    └── 3f2a9c1e0b7d/
+        └── ...
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """SHA-256 dari isi file, dibaca per chunk"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path, data):
+    """Tulis file lewat file sementara + rename, agar pembaca tidak melihat isi setengah jadi"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ModelRegistry:
+    """Versi model .tflite beserta checksum, dan penunjuk versi aktif"""
+
+    MODEL_FILE = 'model.tflite'
+    MANIFEST_FILE = 'manifest.json'
+    ACTIVE_FILE = 'ACTIVE'
+    VERSION_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$')
+
+    def __init__(self, root):
+        self.root = root
+
+    @property
+    def active_path(self):
+        return os.path.join(self.root, self.ACTIVE_FILE)
+
+    def _version_dir(self, version):
+        if not self.VERSION_PATTERN.match(version or ''):
+            raise ValueError(f"Invalid model version '{version}'")
+        return os.path.join(self.root, version)
+
+    def register(self, source_path, version=None, source=None):
+        """Salin file model ke registry; versi default = 12 karakter pertama sha256"""
+        checksum = file_checksum(source_path)
+        version = version or checksum[:12]
+        target_dir = self._version_dir(version)
+
+        if os.path.exists(target_dir):
+            manifest = self.manifest(version)
+            if manifest['sha256'] != checksum:
+                raise ValueError(f"Model version '{version}' already exists with a different checksum")
+            return manifest
+
+        os.makedirs(self.root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=self.root, prefix='.staging-')
+        try:
+            shutil.copyfile(source_path, os.path.join(staging_dir, self.MODEL_FILE))
+            manifest = {
+                'version': version,
+                'sha256': checksum,
+                'size': os.path.getsize(source_path),
+                'registered_at': time.time(),
+                'source': source or os.path.abspath(source_path)
+            }
+            with open(os.path.join(staging_dir, self.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            # Direktori versi muncul utuh atau tidak sama sekali
+            os.rename(staging_dir, target_dir)
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        return manifest
+
+    def manifest(self, version):
+        with open(os.path.join(self._version_dir(version), self.MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def versions(self):
+        """Manifest semua versi, urut waktu registrasi"""
+        if not os.path.isdir(self.root):
+            return []
+        manifests = []
+        for name in os.listdir(self.root):
+            if self.VERSION_PATTERN.match(name) and os.path.isfile(
+                    os.path.join(self.root, name, self.MANIFEST_FILE)):
+                manifests.append(self.manifest(name))
+        return sorted(manifests, key=lambda manifest: manifest['registered_at'])
+
+    def model_path(self, version, verify=True):
+        """Path file model; dengan verify=True checksum dicocokkan dengan manifest"""
+        manifest = self.manifest(version)
+        path = os.path.join(self._version_dir(version), self.MODEL_FILE)
+        if verify and file_checksum(path) != manifest['sha256']:
+            raise ValueError(f"Checksum mismatch for model version '{version}'")
+        return path
+
+    def active_version(self):
+        """Versi aktif menurut file ACTIVE, atau None jika registry belum dipakai"""
+        try:
+            with open(self.active_path, encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_active(self, version):
+        self.manifest(version)  # pastikan versinya ada
+        write_atomic(self.active_path, f"{version}\n")
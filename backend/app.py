@@ -1,53 +1,529 @@
 # app.py
-from flask import Flask, request, jsonify
+import os
+
+# Mode serving: 'threading' (dev server, default) atau 'gevent' (gunicorn -k gevent, lihat gunicorn.conf.py).
+# Monkey patch harus terjadi sebelum modul lain meng-import socket/threading.
+ASYNC_MODE = os.environ.get('ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, request, jsonify, Response, g
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
+from socketio import PubSubManager
 import apsw
+import click
 import json
+import csv
+import gzip
+import io
+import itertools
+import base64
+import binascii
 import datetime
-import os
+import fcntl
 import logging
+import queue
+import re
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from werkzeug.exceptions import BadRequest
 import requests
+from requests.adapters import HTTPAdapter
+
+# Kompresi brotli opsional; tanpa paket brotli hanya gzip yang ditawarkan
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# metrics.py dipakai bersama backend dan AI service (direktori common/ di root repo)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, sample_stacks
+from serving import BlockingRunner, admin_required
+from serialization import (FastJSONProvider, RawJSON, SocketIOJSON, compose, json_array, json_object_sql,
+                           json_pairs_sql, loads as json_loads)
 
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Metrik Prometheus, dibaca lewat GET /metrics
+metrics = MetricsRegistry()
+request_latency = metrics.histogram('http_request_duration_seconds', 'HTTP request latency by route',
+                                    ['method', 'route', 'status'])
+stage_latency = metrics.histogram('backend_stage_duration_seconds',
+                                  'Latency of internal stages (db_acquire, db_query, ai_call, emit)', ['stage'])
+socketio_emits = metrics.counter('socketio_emits_total', 'Socket.IO events emitted', ['event'])
+db_busy_errors = metrics.counter('db_busy_errors_total', 'Queries that failed with SQLITE_BUSY after the busy timeout')
+broadcast_flush_latency = metrics.histogram('broadcast_flush_latency_seconds',
+                                            'Time from the first pending change to its tasks_batch frame being emitted')
+# Seri yang dipakai di hot path, diikat sekali
+db_acquire_latency = stage_latency.labels(stage='db_acquire')
+db_query_latency = stage_latency.labels(stage='db_query')
+ai_call_latency = stage_latency.labels(stage='ai_call')
+emit_latency = stage_latency.labels(stage='emit')
+
+# Profiler sampling opsional: GET /debug/profile?seconds=N (collapsed stacks, butuh admin token)
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED') == '1'
+PROFILER_MAX_SECONDS = 60
+
+# Konfigurasi message queue Socket.IO (multi-node)
+# Contoh: redis://localhost:6379/0, amqp://guest@localhost//, unix:///tmp/tms-socketio.sock
+SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+SOCKETIO_CHANNEL = os.environ.get('SOCKETIO_CHANNEL', 'tms-socketio')
+# Nama cookie Engine.IO untuk sticky session di load balancer (kosong = tanpa cookie)
+SOCKETIO_COOKIE = os.environ.get('SOCKETIO_COOKIE')
+
+FRAME_HEADER = struct.Struct('!I')
+
+def send_frame(sock, payload):
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+def recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('Socket closed')
+        data += chunk
+    return data
+
+def recv_frame(sock):
+    size, = FRAME_HEADER.unpack(recv_exactly(sock, FRAME_HEADER.size))
+    return recv_exactly(sock, size)
+
+class LocalMessageBroker:
+    """Broker pub/sub kecil di atas Unix domain socket.
+
+    Pengganti Redis untuk development dan test: setiap frame dari koneksi
+    publisher ('P') diteruskan ke semua koneksi subscriber ('S').
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(64)
+        threading.Thread(target=self._accept, name='mq-broker', daemon=True).start()
+    
+    def _accept(self):
+        while True:
+            conn, _ = self.server.accept()
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+    
+    def _serve(self, conn):
+        try:
+            role = recv_exactly(conn, 1)
+            if role == b'S':
+                with self.lock:
+                    self.subscribers.append(conn)
+                return
+            while True:
+                self._fan_out(recv_frame(conn))
+        except (ConnectionError, OSError):
+            conn.close()
+    
+    def _fan_out(self, payload):
+        with self.lock:
+            for subscriber in list(self.subscribers):
+                try:
+                    send_frame(subscriber, payload)
+                except OSError:
+                    self.subscribers.remove(subscriber)
+                    subscriber.close()
+
+class UnixSocketManager(PubSubManager):
+    """Client manager Socket.IO yang memakai LocalMessageBroker sebagai message queue.
+
+    Proses pertama yang tidak menemukan broker di ``path`` menjalankan broker
+    itu sendiri, jadi beberapa proses di satu host cukup diberi URL yang sama.
+    """
+    
+    name = 'unix'
+    
+    def __init__(self, url, channel='socketio', write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.path = url[len('unix://'):]
+        self.publisher = None
+        self.publish_lock = threading.Lock()
+        self.broker = None
+    
+    def _connect(self, role):
+        for _ in range(2):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+                sock.sendall(role)
+                return sock
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                self._start_broker()
+        raise ConnectionError(f'Message broker at {self.path} is not reachable')
+    
+    def _broker_alive(self):
+        """True jika socket di path menerima koneksi (ada broker yang hidup)"""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+    
+    def _start_broker(self):
+        # flock menyerialkan cek-unlink-bind antar proses: tanpa itu proses kedua bisa
+        # meng-unlink socket broker yang baru saja di-bind proses pertama
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self._broker_alive():
+                    return  # proses lain baru saja menjalankan broker
+                if os.path.exists(self.path):
+                    os.unlink(self.path)  # socket basi dari proses yang sudah mati
+                self.broker = LocalMessageBroker(self.path)
+                logger.info(f"Started local Socket.IO message broker at {self.path}")
+            except OSError as e:
+                logger.error(f"Could not start local message broker at {self.path}: {str(e)}")
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _publish(self, data):
+        payload = self.json.dumps(data).encode('utf-8')
+        with self.publish_lock:
+            for retries_left in (1, 0):
+                try:
+                    if self.publisher is None:
+                        self.publisher = self._connect(b'P')
+                    send_frame(self.publisher, payload)
+                    return
+                except (ConnectionError, OSError):
+                    self.publisher = None
+                    if not retries_left:
+                        raise
+    
+    def _listen(self):
+        while True:
+            try:
+                subscriber = self._connect(b'S')
+                while True:
+                    yield recv_frame(subscriber).decode('utf-8')
+            except (ConnectionError, OSError) as e:
+                logger.error(f"Message broker connection lost: {str(e)}")
+                time.sleep(1)
+
+def socketio_queue_options():
+    """Argumen SocketIO untuk message queue dan sticky session sesuai konfigurasi"""
+    options = {}
+    if SOCKETIO_MESSAGE_QUEUE and SOCKETIO_MESSAGE_QUEUE.startswith('unix://'):
+        options['client_manager'] = UnixSocketManager(SOCKETIO_MESSAGE_QUEUE, channel=SOCKETIO_CHANNEL,
+                                                       json=SocketIOJSON)
+    elif SOCKETIO_MESSAGE_QUEUE:
+        options['message_queue'] = SOCKETIO_MESSAGE_QUEUE
+        options['channel'] = SOCKETIO_CHANNEL
+    if SOCKETIO_COOKIE:
+        options['cookie'] = {'name': SOCKETIO_COOKIE, 'path': '/', 'samesite': 'Lax'}
+    return options
+
 # Inisialisasi Flask
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
+# jsonify() di semua route memakai encoder dari serialization.py (orjson jika ada)
+app.json = FastJSONProvider(app)
 # In app.py
 CORS(app, resources={
     r"/tasks*": {"origins": "*"},
     r"/socket.io*": {"origins": "*"}
 })
-socketio = SocketIO(app, cors_allowed_origins="*", logger=True, engineio_logger=True)
+socketio = SocketIO(app, cors_allowed_origins="*", logger=True, engineio_logger=True,
+                    async_mode=ASYNC_MODE, json=SocketIOJSON, **socketio_queue_options())
 
 # Konfigurasi database
-DATABASE_PATH = 'tasks.db'
-AI_SERVICE_URL = 'http://localhost:5001'
+DATABASE_PATH = os.environ.get('DATABASE_PATH', 'tasks.db')
+AI_SERVICE_URL = os.environ.get('AI_SERVICE_URL', 'http://localhost:5001')
+
+# Konfigurasi serving
+PORT = int(os.environ.get('PORT', 5000))
+# Hanya untuk python app.py; reloader Werkzeug menjalankan ulang efek samping modul
+# (thread background, socket broker) di proses kedua, jadi harus diaktifkan eksplisit
+SERVER_DEBUG = os.environ.get('SERVER_DEBUG', '0') == '1'
+SHUTDOWN_DRAIN_TIMEOUT = float(os.environ.get('SHUTDOWN_DRAIN_TIMEOUT', 10.0))  # detik menunggu antrean estimasi
+
+# Konfigurasi estimasi AI di background
+ESTIMATION_WORKERS = int(os.environ.get('ESTIMATION_WORKERS', 2))
+ESTIMATION_QUEUE_SIZE = int(os.environ.get('ESTIMATION_QUEUE_SIZE', 1000))
+ESTIMATION_BATCH_SIZE = int(os.environ.get('ESTIMATION_BATCH_SIZE', 32))
+ESTIMATION_BATCH_WINDOW = float(os.environ.get('ESTIMATION_BATCH_WINDOW', 0.05))  # detik
+AI_REQUEST_TIMEOUT = 5  # detik
+# Budget yang dikirim ke AI service sebagai X-Deadline-Ms: lewat dari ini AI service menjawab dengan
+# prediksi fallback (path 'degraded') alih-alih membuat panggilan ini menunggu sampai AI_REQUEST_TIMEOUT
+AI_REQUEST_DEADLINE_MS = float(os.environ.get('AI_REQUEST_DEADLINE_MS', 2000))  # 0 = tanpa deadline
+AI_BATCH_LIMIT = 256  # sama dengan MAX_BATCH_SIZE di ai_service
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get('CIRCUIT_RESET_TIMEOUT', 30.0))  # detik
+
+# Konfigurasi broadcast Socket.IO
+BROADCAST_WINDOW = float(os.environ.get('BROADCAST_WINDOW', 0.05))  # detik
+BROADCAST_MAX_PENDING = int(os.environ.get('BROADCAST_MAX_PENDING', 5000))  # flush lebih awal jika tercapai
+
+# Konfigurasi change log untuk delta sync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 7))
+SYNC_COMPACT_INTERVAL = float(os.environ.get('SYNC_COMPACT_INTERVAL', 3600))  # detik
+SYNC_MAX_CHANGES = 1000  # perubahan per response /tasks/changes
+
+# Konfigurasi arsip (hot/cold) dan pemeliharaan file database
+ARCHIVE_AFTER_DAYS = float(os.environ.get('ARCHIVE_AFTER_DAYS', 30))  # 0 = tidak mengarsipkan
+ARCHIVE_STATUSES = ('completed', 'cancelled')
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))  # task per transaksi
+ARCHIVE_BATCH_PAUSE = 0.05  # detik antar batch/langkah agar writer lain dapat giliran
+DB_MAINTENANCE_INTERVAL = float(os.environ.get('DB_MAINTENANCE_INTERVAL', 3600))  # detik
+VACUUM_PAGES_PER_STEP = int(os.environ.get('VACUUM_PAGES_PER_STEP', 1000))  # halaman per transaksi
+
+# Konfigurasi full-text search (FTS5)
+SEARCH_TITLE_WEIGHT = float(os.environ.get('SEARCH_TITLE_WEIGHT', 10.0))  # bobot bm25 judul vs deskripsi
+SEARCH_SNIPPET_TOKENS = 16
+SEARCH_MAX_TERMS = 16
+# Index FTS5 -> tabel sumbernya (external content)
+SEARCH_INDEXES = {'tasks_fts': 'tasks', 'tasks_archive_fts': 'tasks_archive'}
+
+# Konfigurasi bulk import/export
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 1000))
+BULK_MAX_ERRORS = 100  # jumlah error per baris yang dikembalikan di response
+EXPORT_ROWS_PER_CHUNK = 500
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'json': 'application/json', 'csv': 'text/csv'}
+
+# Konfigurasi cache response GET /tasks (ETag + kompresi)
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 256))  # jumlah bentuk query yang disimpan
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # byte; body lebih kecil tidak dikompres
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+# Konfigurasi connection pool
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5.0))  # detik menunggu koneksi bebas
+DB_BUSY_TIMEOUT = 3000  # ms
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 256 * 1024 * 1024))
+DB_CACHE_SIZE = int(os.environ.get('DB_CACHE_SIZE', -16000))  # negatif = KiB, jadi ~16 MB
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 256))  # prepared statement per koneksi
+# Thread OS untuk kerja blocking (SQLite) di mode gevent; minimal sebesar pool koneksi
+BLOCKING_POOL_SIZE = max(int(os.environ.get('BLOCKING_POOL_SIZE', DB_POOL_SIZE)), DB_POOL_SIZE)
+
+run_blocking = BlockingRunner(ASYNC_MODE, BLOCKING_POOL_SIZE)
+
+class ConnectionPool:
+    """Pool koneksi apsw berumur panjang yang aman dipakai banyak thread.
+
+    Koneksi baru dibuka saat dibutuhkan hingga ``size``; setelah pool penuh,
+    pemanggil menunggu (paling lama ``timeout`` detik) sampai thread lain
+    mengembalikan koneksinya.
+    """
+
+    def __init__(self, db_path, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        self.stats = {'hits': 0, 'misses': 0, 'waits': 0, 'timeouts': 0, 'discarded': 0}
+
+    def _open(self):
+        # apsw menyimpan prepared statement per teks SQL; SQL tulis dibuat konstan agar selalu cache hit
+        conn = apsw.Connection(self.db_path, statementcachesize=DB_STATEMENT_CACHE_SIZE)
+        conn.setbusytimeout(DB_BUSY_TIMEOUT)
+        # Hanya berlaku untuk file baru (atau setelah VACUUM): halaman kosong bisa dilepas
+        # bertahap dengan PRAGMA incremental_vacuum, lihat StorageLifecycle
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        # Pragma per-koneksi, cukup sekali saat dibuka
+        conn.execute('PRAGMA journal_mode=WAL').fetchall()
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA mmap_size={DB_MMAP_SIZE}').fetchall()
+        conn.execute(f'PRAGMA cache_size={DB_CACHE_SIZE}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            if conn.in_transaction:
+                return False
+            conn.execute('SELECT 1').fetchall()
+            return True
+        except apsw.Error:
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self._opened -= 1
+            self.stats['discarded'] += 1
+        try:
+            conn.close()
+        except apsw.Error:
+            pass
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return True
+            return False
+
+    def acquire(self):
+        if self._closed:
+            raise apsw.ConnectionClosedError('Connection pool is closed')
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+                hit = True
+            except queue.Empty:
+                conn = None
+                hit = False
+
+            if conn is None and self._reserve_slot():
+                try:
+                    conn = self._open()
+                except apsw.Error:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+                with self._lock:
+                    self.stats['misses'] += 1
+                return conn
+
+            if conn is None:
+                with self._lock:
+                    self.stats['waits'] += 1
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.stats['timeouts'] += 1
+                    raise apsw.BusyError(
+                        f'No database connection available after {self.timeout}s'
+                    )
+
+            # Health check saat checkout
+            if self._is_healthy(conn):
+                if hit:
+                    with self._lock:
+                        self.stats['hits'] += 1
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        if self._closed or not self._is_healthy(conn):
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, size=self.size, opened=self._opened,
+                        idle=self._idle.qsize())
 
 # Update the DatabaseManager class in app.py
 class DatabaseManager:
-    def __init__(self, db_path):
+    def __init__(self, db_path, pool_size=DB_POOL_SIZE):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, size=pool_size)
         self.init_database()
+        self.database_id = self.run(lambda conn: conn.cursor().execute(
+            "SELECT value FROM sync_meta WHERE key = 'database_id'").fetchone()[0])
     
-    def get_connection(self):
+    def _acquire(self):
         try:
-            conn = apsw.Connection(self.db_path)
-            conn.setbusytimeout(3000)  # 3 second timeout
-            return conn
+            with db_acquire_latency.time():
+                return self.pool.acquire()
         except apsw.Error as e:
             logger.error(f"Database connection failed: {str(e)}")
             raise
     
+    @contextmanager
+    def get_connection(self, write=False):
+        """Pinjam koneksi dari pool; block berjalan di dalam satu transaksi"""
+        conn = self._acquire()
+        try:
+            with self._transaction(conn, write):
+                yield conn
+        finally:
+            self.pool.release(conn)
+    
+    def run(self, func, *args, write=False):
+        """Jalankan func(conn, *args) dalam satu transaksi lewat run_blocking.
+
+        Koneksi dipinjam di thread/greenlet pemanggil; hanya kerja SQLite-nya
+        yang dipindah ke threadpool di mode gevent. write=True untuk transaksi
+        yang menulis (lihat _transaction).
+        """
+        conn = self._acquire()
+        try:
+            with db_query_latency.time():
+                return run_blocking(self._in_transaction, conn, func, args, write)
+        except apsw.BusyError:
+            db_busy_errors.inc()
+            raise
+        finally:
+            self.pool.release(conn)
+    
+    @classmethod
+    def _in_transaction(cls, conn, func, args, write):
+        with cls._transaction(conn, write):
+            return func(conn, *args)
+    
+    @staticmethod
+    @contextmanager
+    def _transaction(conn, write):
+        """Transaksi tulis dibuka dengan BEGIN IMMEDIATE.
+
+        Trigger FTS5 membaca tabel shadow sebelum INSERT/UPDATE/DELETE meminta
+        write lock; di transaksi deferred upgrade read -> write itu gagal
+        langsung dengan SQLITE_BUSY tanpa menunggu busy timeout. IMMEDIATE
+        mengambil write lock di awal sehingga antre lewat busy handler.
+        """
+        if not write:
+            with conn:
+                yield
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            with conn:
+                yield
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    
     def init_database(self):
-        """Initialize database tables with better error handling"""
+        """Initialize database tables with better error handling.
+
+        Seluruh init menulis (sync_meta, konfigurasi rank FTS, backfill change log),
+        jadi berjalan dalam satu transaksi BEGIN IMMEDIATE: worker gunicorn yang
+        start bersamaan antre lewat busy handler, bukan gagal dengan SQLITE_BUSY.
+        """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(write=True) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS tasks (
@@ -62,27 +538,1148 @@ class DatabaseManager:
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
+                # Data dingin: task completed/cancelled lama dipindah ke sini oleh StorageLifecycle,
+                # sehingga tabel tasks dan index-nya tetap kecil. id tetap sama (AUTOINCREMENT tidak
+                # pernah memakai ulang id), jadi kedua tabel bisa digabung tanpa bentrok.
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tasks_archive (
+                        id INTEGER PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        description TEXT,
+                        status TEXT,
+                        estimated_time INTEGER,
+                        actual_time INTEGER,
+                        complexity TEXT,
+                        created_at TIMESTAMP,
+                        updated_at TIMESTAMP,
+                        archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_tasks_archive_created
+                    ON tasks_archive (created_at DESC, id DESC)
+                ''')
+                cursor.execute('''
+                    CREATE VIEW IF NOT EXISTS tasks_all AS
+                    SELECT id, title, description, status, estimated_time, actual_time,
+                           complexity, created_at, updated_at
+                    FROM tasks
+                    UNION ALL
+                    SELECT id, title, description, status, estimated_time, actual_time,
+                           complexity, created_at, updated_at
+                    FROM tasks_archive
+                ''')
+                # updated_at diisi langsung oleh setiap UPDATE; trigger lama menulis baris dua kali
+                cursor.execute('DROP TRIGGER IF EXISTS update_timestamp')
+                # Index komposit untuk keyset pagination + filter di GET /tasks
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_tasks_created
+                    ON tasks (created_at DESC, id DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_tasks_status_created
+                    ON tasks (status, created_at DESC, id DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_tasks_complexity_created
+                    ON tasks (complexity, created_at DESC, id DESC)
+                ''')
+                # Tabel ringkasan statistik, dijaga incremental oleh trigger
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS task_stats (
+                        key TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS task_stats_insert
+                    AFTER INSERT ON tasks
+                    BEGIN
+                        {stats_upsert_sql('NEW', '+')}
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS task_stats_delete
+                    AFTER DELETE ON tasks
+                    BEGIN
+                        {stats_upsert_sql('OLD', '-')}
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS task_stats_update
+                    AFTER UPDATE OF status, complexity, estimated_time, actual_time ON tasks
+                    BEGIN
+                        {stats_upsert_sql('OLD', '-')}
+                        {stats_upsert_sql('NEW', '+')}
+                    END
+                ''')
+                # Statistik mencakup arsip: memindah task (DELETE dari tasks + INSERT ke arsip) tidak
+                # mengubah total, jadi dashboard tidak berubah saat task diarsipkan
+                for event, row, sign in (('INSERT', 'NEW', '+'), ('DELETE', 'OLD', '-')):
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS task_stats_archive_{event.lower()}
+                        AFTER {event} ON tasks_archive
+                        BEGIN
+                            {stats_upsert_sql(row, sign)}
+                        END
+                    ''')
+                cursor.execute("SELECT 1 FROM task_stats WHERE key = 'total'")
+                if not cursor.fetchone():
+                    self.rebuild_stats(cursor)
+                
+                # Change log untuk delta sync: satu baris per task (versi terakhirnya),
+                # task yang dihapus (op 'delete') atau diarsipkan (op 'archive', diisi
+                # archive_tasks) tersisa sebagai tombstone sampai dikompaksi
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS task_changes (
+                        version INTEGER PRIMARY KEY AUTOINCREMENT,
+                        task_id INTEGER NOT NULL UNIQUE,
+                        op TEXT NOT NULL,
+                        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS sync_meta (
+                        key TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL
+                    )
+                ''')
+                # Identitas acak per file database: versi mulai lagi dari 0 jika tasks.db dibuat ulang,
+                # jadi ETag juga memuat id ini agar ETag lama tidak cocok dengan database baru
+                cursor.execute('''
+                    INSERT OR IGNORE INTO sync_meta (key, value) VALUES ('database_id', abs(random() >> 16))
+                ''')
+                for event, row, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE', 'NEW', 'upsert'),
+                                       ('DELETE', 'OLD', 'delete')):
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS task_changes_{event.lower()}
+                        AFTER {event} ON tasks
+                        BEGIN
+                            INSERT OR REPLACE INTO task_changes (task_id, op) VALUES ({row}.id, '{op}');
+                        END
+                    ''')
+                # Database lama: catat semua task yang sudah ada
+                cursor.execute('''
+                    INSERT OR IGNORE INTO task_changes (task_id, op)
+                    SELECT id, 'upsert' FROM tasks
+                    WHERE NOT EXISTS (SELECT 1 FROM task_changes)
+                ''')
+                
+                # Index full-text (external content: teks tidak disimpan dua kali). Arsip punya
+                # index sendiri, dipakai /tasks/search hanya dengan include_archived=1
+                new_indexes = []
+                for index, table in SEARCH_INDEXES.items():
+                    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (index,))
+                    if cursor.fetchone() is None:
+                        new_indexes.append(index)
+                    cursor.execute(f'''
+                        CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+                            title, description,
+                            content='{table}', content_rowid='id',
+                            tokenize='unicode61 remove_diacritics 2',
+                            prefix='2 3'
+                        )
+                    ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks
+                    BEGIN
+                        INSERT INTO tasks_fts (rowid, title, description)
+                        VALUES (NEW.id, NEW.title, NEW.description);
+                    END
+                ''')
                 cursor.execute('''
-                    CREATE TRIGGER IF NOT EXISTS update_timestamp 
-                    AFTER UPDATE ON tasks 
+                    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks
                     BEGIN
-                        UPDATE tasks SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                        VALUES ('delete', OLD.id, OLD.title, OLD.description);
                     END
                 ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks
+                    BEGIN
+                        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+                        INSERT INTO tasks_fts (rowid, title, description)
+                        VALUES (NEW.id, NEW.title, NEW.description);
+                    END
+                ''')
+                # Baris arsip tidak pernah di-UPDATE, cukup insert dan delete
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_insert AFTER INSERT ON tasks_archive
+                    BEGIN
+                        INSERT INTO tasks_archive_fts (rowid, title, description)
+                        VALUES (NEW.id, NEW.title, NEW.description);
+                    END
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_delete AFTER DELETE ON tasks_archive
+                    BEGIN
+                        INSERT INTO tasks_archive_fts (tasks_archive_fts, rowid, title, description)
+                        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+                    END
+                ''')
+                for index in SEARCH_INDEXES:
+                    # Ranking default (ORDER BY rank) = bm25 dengan judul lebih berbobot
+                    cursor.execute(
+                        f"INSERT INTO {index} ({index}, rank) VALUES ('rank', ?)",
+                        (f'bm25({SEARCH_TITLE_WEIGHT}, 1.0)',)
+                    )
+                    if index in new_indexes:
+                        cursor.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
                 logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing database: {str(e)}")
             raise
 
+    def rebuild_stats(self, cursor):
+        """Hitung ulang task_stats dari nol (untuk database lama / perbaikan), termasuk arsip"""
+        cursor.execute('DELETE FROM task_stats')
+        cursor.execute('''
+            INSERT INTO task_stats (key, value)
+            SELECT 'total', COUNT(*) FROM tasks_all
+            UNION ALL
+            SELECT 'estimated_sum', IFNULL(SUM(estimated_time), 0) FROM tasks_all
+            UNION ALL
+            SELECT 'estimated_count', COUNT(estimated_time) FROM tasks_all
+            UNION ALL
+            SELECT 'actual_sum', IFNULL(SUM(actual_time), 0) FROM tasks_all
+            UNION ALL
+            SELECT 'actual_count', COUNT(actual_time) FROM tasks_all
+        ''')
+        cursor.execute('''
+            INSERT INTO task_stats (key, value)
+            SELECT 'status:' || IFNULL(status, 'none'), COUNT(*) FROM tasks_all GROUP BY 1
+            UNION ALL
+            SELECT 'complexity:' || IFNULL(complexity, 'none'), COUNT(*) FROM tasks_all GROUP BY 1
+        ''')
+        logger.info("Task statistics rebuilt")
+
+    def get_stats(self):
+        """Baca task_stats; biayanya tidak bergantung pada jumlah task"""
+        rows = self.run(lambda conn: conn.cursor().execute('SELECT key, value FROM task_stats').fetchall())
+        return format_stats(dict(rows))
+    
+    @staticmethod
+    def current_version(cursor):
+        """Versi change log terbaru (0 jika belum ada perubahan)"""
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'task_changes'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    def get_version(self):
+        """Versi change log saat ini; satu baris sqlite_sequence, tabel tasks tidak disentuh"""
+        return self.run(lambda conn: self.current_version(conn.cursor()))
+    
+    def get_changes(self, since, limit=SYNC_MAX_CHANGES):
+        """Perubahan dengan versi > since; reset=True jika client harus fetch ulang penuh.
+
+        upserted adalah array JSON buatan SQLite (RawJSON), siap untuk compose().
+        deleted dan archived berisi id task yang hilang dari tabel tasks: dihapus,
+        atau dipindah ke tasks_archive (masih ada lewat include_archived=1).
+
+        since=0 (client belum punya apa pun) selalu dijawab dengan snapshot: setiap
+        task yang ada punya baris di log, jadi kompaksi tombstone tidak membuatnya
+        kurang lengkap, dan tombstone sendiri dilewati.
+        """
+        def read(conn):
+            cursor = conn.cursor()
+            version = self.current_version(cursor)
+            cursor.execute("SELECT value FROM sync_meta WHERE key = 'compacted_through'")
+            row = cursor.fetchone()
+            # Versi di bawah horizon kompaksi, atau di atas versi server (database baru)
+            if (row and 0 < since < row[0]) or since > version:
+                return version, None
+            
+            cursor.execute(f'''
+                SELECT c.version, c.task_id, c.op, {json_object_sql(TASK_COLUMNS, 't.')}
+                FROM task_changes c LEFT JOIN tasks t ON t.id = c.task_id
+                WHERE c.version > ? AND (? > 0 OR c.op = 'upsert')
+                ORDER BY c.version
+                LIMIT ?
+            ''', (since, since, limit + 1))
+            return version, cursor.fetchall()
+        
+        version, rows = self.run(read)
+        if rows is None:
+            return {'reset': True, 'version': version}
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        upserted = []
+        removed = {'delete': [], 'archive': []}
+        for row in rows:
+            if row[2] == 'upsert':
+                upserted.append(row[3])
+            else:
+                removed[row[2]].append(row[1])
+        
+        return {
+            'reset': False,
+            'version': rows[-1][0] if has_more else version,
+            'upserted': json_array(upserted),
+            'deleted': removed['delete'],
+            'archived': removed['archive'],
+            'has_more': has_more
+        }
+    
+    def compact_changes(self, retention_days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        """Hapus tombstone lama; client dengan versi sebelum itu harus fetch ulang penuh"""
+        def compact(conn):
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT MAX(version), COUNT(*) FROM task_changes
+                WHERE op != 'upsert' AND changed_at < datetime('now', ?)
+            ''', (f'-{retention_days} days',))
+            horizon, count = cursor.fetchone()
+            if count:
+                cursor.execute("DELETE FROM task_changes WHERE op != 'upsert' AND version <= ?", (horizon,))
+                cursor.execute('''
+                    INSERT INTO sync_meta (key, value) VALUES ('compacted_through', ?)
+                    ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)
+                ''', (horizon,))
+            return horizon, count
+        
+        horizon, count = self.run(compact, write=True)
+        if not count:
+            return 0
+        logger.info(f"Compacted {count} task tombstones up to version {horizon}")
+        return count
+
+    def archive_tasks(self, older_than_days, limit):
+        """Pindahkan hingga limit task completed/cancelled yang tidak berubah selama
+        older_than_days ke tasks_archive, dalam satu transaksi; return id yang dipindah.
+
+        DELETE dari tasks memicu trigger biasa (tombstone di change log, pindah dari
+        index FTS tasks ke index arsip); tombstone-nya lalu ditandai 'archive', supaya
+        client delta sync bisa membedakan task yang diarsipkan dari yang dihapus.
+        """
+        def move(conn):
+            cursor = conn.cursor()
+            ids = [row[0] for row in cursor.execute(ARCHIVE_TASKS_SQL, (f'-{older_than_days} days', limit))]
+            if ids:
+                cursor.execute('DELETE FROM tasks WHERE id IN (SELECT value FROM json_each(?))',
+                               (json.dumps(ids),))
+                cursor.execute("""
+                    UPDATE task_changes SET op = 'archive'
+                    WHERE task_id IN (SELECT value FROM json_each(?))
+                """, (json.dumps(ids),))
+            return ids
+        
+        return self.run(move, write=True)
+    
+    def incremental_vacuum(self, pages):
+        """Lepas hingga pages halaman kosong ke OS; return (halaman dilepas, halaman kosong tersisa)"""
+        def vacuum(conn):
+            cursor = conn.cursor()
+            before = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            cursor.execute(f'PRAGMA incremental_vacuum({int(pages)})').fetchall()
+            after = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            return before - after, after
+        
+        return self.run(vacuum, write=True)
+    
+    def optimize(self):
+        """PRAGMA optimize: ANALYZE hanya untuk tabel yang statistiknya sudah basi"""
+        self.run(lambda conn: conn.cursor().execute('PRAGMA optimize').fetchall(), write=True)
+    
+    def auto_vacuum_mode(self):
+        """0 = none, 1 = full, 2 = incremental"""
+        return self.run(lambda conn: conn.cursor().execute('PRAGMA auto_vacuum').fetchone()[0])
+    
+    def full_vacuum(self):
+        """VACUUM penuh (menulis ulang seluruh file, mengunci database); juga mengaktifkan
+        auto_vacuum=INCREMENTAL untuk database yang dibuat sebelum pengaturan itu ada"""
+        conn = self._acquire()
+        try:
+            # VACUUM tidak boleh di dalam transaksi
+            run_blocking(conn.execute, 'VACUUM')
+        finally:
+            self.pool.release(conn)
+    
+    def maintain_search_index(self, command):
+        """'rebuild' (bangun ulang dari tabel sumber) atau 'optimize' (gabungkan segmen b-tree),
+        untuk index tasks dan index arsip"""
+        if command not in ('rebuild', 'optimize'):
+            raise ValueError(f'Unknown search index command: {command}')
+        start = time.perf_counter()
+        with self.get_connection(write=True) as conn:
+            cursor = conn.cursor()
+            for index in SEARCH_INDEXES:
+                cursor.execute(f'INSERT INTO {index} ({index}) VALUES (?)', (command,))
+        elapsed = time.perf_counter() - start
+        logger.info(f"Search index {command} finished in {elapsed:.2f}s")
+        return elapsed
+    
+    def search_tasks(self, match, limit, offset, include_archived=False):
+        """Task yang cocok dengan ekspresi FTS5, urut bm25; judul dan snippet deskripsi di-highlight.
+
+        Setiap hasil adalah teks objek JSON (task + highlight + score) buatan SQLite.
+        include_archived=True ikut mencari di index arsip; skor bm25 kedua index dihitung
+        dari statistik index masing-masing, jadi urutan gabungannya mendekati, tidak persis.
+        """
+        selects = [search_select_sql(index, table) for index, table in SEARCH_INDEXES.items()
+                   if include_archived or table == 'tasks']
+        sql = ' UNION ALL '.join(selects) + ' ORDER BY rank LIMIT ? OFFSET ?'
+        params = (match,) * len(selects) + (limit, offset)
+        rows = self.run(lambda conn: conn.cursor().execute(sql, params).fetchall())
+        return [row[0] for row in rows]
+
+def search_select_sql(index, table):
+    """SELECT hasil pencarian dari satu index FTS (task + highlight + score sebagai JSON, dan rank)"""
+    return f'''
+        SELECT json_object({json_pairs_sql(TASK_COLUMNS, 't.')},
+            'highlight', json_object(
+                'title', highlight({index}, 0, '<mark>', '</mark>'),
+                'description', snippet({index}, 1, '<mark>', '</mark>', '…', {SEARCH_SNIPPET_TOKENS})),
+            -- bm25 negatif: makin kecil makin relevan
+            'score', -{index}.rank), {index}.rank AS rank
+        FROM {index} JOIN {table} t ON t.id = {index}.rowid
+        WHERE {index} MATCH ?
+    '''
+
+def stats_upsert_sql(row, sign):
+    """SQL trigger yang menambah (+) atau mengurangi (-) kontribusi satu baris ke task_stats"""
+    return f'''
+        INSERT INTO task_stats (key, value) VALUES
+            ('total', {sign}1),
+            ('status:' || IFNULL({row}.status, 'none'), {sign}1),
+            ('complexity:' || IFNULL({row}.complexity, 'none'), {sign}1),
+            ('estimated_sum', {sign}IFNULL({row}.estimated_time, 0)),
+            ('estimated_count', {sign}({row}.estimated_time IS NOT NULL)),
+            ('actual_sum', {sign}IFNULL({row}.actual_time, 0)),
+            ('actual_count', {sign}({row}.actual_time IS NOT NULL))
+        ON CONFLICT (key) DO UPDATE SET value = value + excluded.value;
+    '''
+
+def stats_number(value):
+    """Nilai kolom waktu untuk *_sum; seperti IFNULL(...) di SQLite, nilai bukan angka
+    (baris lama yang tersimpan sebagai teks) dihitung 0, bukan membuat delta gagal"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return 0
+
+def stats_contribution(task):
+    """Kontribusi satu task ke task_stats, sama dengan stats_upsert_sql"""
+    if not task:
+        return {}
+    return {
+        'total': 1,
+        f"status:{task.get('status') or 'none'}": 1,
+        f"complexity:{task.get('complexity') or 'none'}": 1,
+        'estimated_sum': stats_number(task.get('estimated_time')),
+        'estimated_count': int(task.get('estimated_time') is not None),
+        'actual_sum': stats_number(task.get('actual_time')),
+        'actual_count': int(task.get('actual_time') is not None)
+    }
+
+def stats_delta(old_task, new_task):
+    """Selisih task_stats akibat perubahan old_task -> new_task (hanya key yang berubah)"""
+    delta = stats_contribution(new_task)
+    for key, value in stats_contribution(old_task).items():
+        delta[key] = delta.get(key, 0) - value
+    return {key: value for key, value in delta.items() if value}
+
+def format_stats(values):
+    """Ubah isi task_stats menjadi payload /tasks/stats"""
+    total = values.get('total', 0)
+    status_counts = {status: 0 for status in VALID_STATUSES}
+    complexity_counts = {complexity: 0 for complexity in VALID_COMPLEXITY}
+    for key, value in values.items():
+        if key.startswith('status:') and value:
+            status_counts[key[len('status:'):]] = value
+        elif key.startswith('complexity:') and value:
+            complexity_counts[key[len('complexity:'):]] = value
+    
+    estimated_count = values.get('estimated_count', 0)
+    actual_count = values.get('actual_count', 0)
+    return {
+        'total': total,
+        'status_counts': status_counts,
+        'complexity_counts': complexity_counts,
+        'average_estimated': values.get('estimated_sum', 0) / estimated_count if estimated_count else 0,
+        'average_actual': values.get('actual_sum', 0) / actual_count if actual_count else 0,
+        'completion_rate': status_counts['completed'] / total * 100 if total else 0,
+        # Nilai mentah, agar client bisa menerapkan event stats_delta sendiri
+        'counters': values
+    }
+
+def emit_stats_delta(old_task, new_task):
+    """Kirim perubahan statistik sebagai delta kecil, bukan daftar task lengkap"""
+    delta = stats_delta(old_task, new_task)
+    if delta:
+        broadcast_bus.publish_stats(delta)
+
+class BroadcastBus:
+    """Antrean event keluar ke room Socket.IO, dikirim per jendela waktu.
+
+    Perubahan dalam satu jendela ``window`` dilipat per task id (created lalu
+    updated tetap created, created lalu deleted hilang sama sekali), delta
+    statistik dijumlahkan, lalu semuanya dikirim sebagai satu frame
+    ``tasks_batch`` yang diserialisasi sekali untuk semua socket di room.
+    """
+    
+    def __init__(self, socketio, room='tasks', window=BROADCAST_WINDOW, max_pending=BROADCAST_MAX_PENDING):
+        self.socketio = socketio
+        self.room = room
+        self.window = window
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.changes = OrderedDict()
+        self.stats_delta = {}
+        self.imported = 0
+        self.first_pending_at = None
+        self.metrics = {
+            'published': 0, 'folded': 0, 'frames_sent': 0,
+            'last_flush_latency_ms': 0.0, 'max_flush_latency_ms': 0.0
+        }
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='broadcast-bus', daemon=True)
+        self.thread.start()
+    
+    def _mark_pending(self):
+        # Dipanggil dengan self.lock dipegang
+        self.metrics['published'] += 1
+        if self.first_pending_at is None:
+            self.first_pending_at = time.monotonic()
+            self.wakeup.set()
+        elif len(self.changes) >= self.max_pending:
+            self.wakeup.set()
+    
+    def publish_task(self, op, task):
+        """op adalah 'created', 'updated', 'deleted' atau 'archived'"""
+        task_id = task['id']
+        with self.lock:
+            previous = self.changes.get(task_id)
+            if previous is not None:
+                self.metrics['folded'] += 1
+            
+            if previous is not None and previous[0] == 'created':
+                if op in ('deleted', 'archived'):
+                    # Client belum pernah melihat task ini
+                    del self.changes[task_id]
+                else:
+                    self.changes[task_id] = ('created', task)
+            elif op in ('deleted', 'archived'):
+                self.changes[task_id] = (op, {'id': task_id})
+            else:
+                self.changes[task_id] = (op, task)
+            self._mark_pending()
+    
+    def publish_stats(self, delta):
+        with self.lock:
+            for key, value in delta.items():
+                self.stats_delta[key] = self.stats_delta.get(key, 0) + value
+            self._mark_pending()
+    
+    def publish_import(self, count):
+        with self.lock:
+            self.imported += count
+            self._mark_pending()
+    
+    def _run(self):
+        while True:
+            self.wakeup.wait()
+            # Tunggu sisa jendela, kecuali antrean sudah penuh
+            with self.lock:
+                started = self.first_pending_at
+            if started is not None:
+                remaining = self.window - (time.monotonic() - started)
+                if remaining > 0 and len(self.changes) < self.max_pending:
+                    time.sleep(remaining)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing broadcast batch: {str(e)}")
+    
+    def flush(self):
+        """Kirim semua perubahan yang tertunda sebagai satu frame tasks_batch"""
+        with self.lock:
+            self.wakeup.clear()
+            changes, self.changes = self.changes, OrderedDict()
+            delta, self.stats_delta = self.stats_delta, {}
+            imported, self.imported = self.imported, 0
+            started, self.first_pending_at = self.first_pending_at, None
+        
+        if started is None:
+            return
+        
+        payload = {}
+        for op, task in changes.values():
+            if op in ('deleted', 'archived'):
+                payload.setdefault(op, []).append(task['id'])
+            else:
+                payload.setdefault(op, []).append(task)
+        delta = {key: value for key, value in delta.items() if value}
+        if delta:
+            payload['stats_delta'] = delta
+        if imported:
+            payload['imported'] = imported
+        
+        if payload:
+            with emit_latency.time():
+                self.socketio.emit('tasks_batch', payload, room=self.room)
+            socketio_emits.inc(event='tasks_batch')
+        
+        latency = time.monotonic() - started
+        if payload:
+            broadcast_flush_latency.observe(latency)
+        latency_ms = latency * 1000
+        with self.lock:
+            if payload:
+                self.metrics['frames_sent'] += 1
+            self.metrics['last_flush_latency_ms'] = round(latency_ms, 3)
+            self.metrics['max_flush_latency_ms'] = round(max(self.metrics['max_flush_latency_ms'], latency_ms), 3)
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.metrics, queue_depth=len(self.changes), window_ms=self.window * 1000)
+
+def make_ai_session():
+    """requests.Session keep-alive untuk AI service (tidak dibagi antar thread)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def request_estimates(session, ai_service_url, tasks):
+    """Panggil POST /predict/batch per AI_BATCH_LIMIT task; return estimated_time sesuai urutan"""
+    estimates = []
+    headers = {'X-Deadline-Ms': f'{AI_REQUEST_DEADLINE_MS:g}'} if AI_REQUEST_DEADLINE_MS > 0 else None
+    for start in range(0, len(tasks), AI_BATCH_LIMIT):
+        with ai_call_latency.time():
+            response = session.post(f'{ai_service_url}/predict/batch', json={
+                'tasks': [{
+                    'title': task['title'],
+                    'description': task.get('description') or '',
+                    'complexity': task.get('complexity') or 'medium'
+                } for task in tasks[start:start + AI_BATCH_LIMIT]]
+            }, headers=headers, timeout=AI_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        estimates.extend(prediction.get('estimated_time') for prediction in response.json()['predictions'])
+    return estimates
+
+class CircuitBreaker:
+    """Circuit breaker sederhana untuk panggilan ke AI service.
+
+    Setelah ``failure_threshold`` kegagalan berturut-turut circuit terbuka
+    dan panggilan dilewati selama ``reset_timeout`` detik; setelah itu satu
+    panggilan percobaan (half-open) menentukan apakah circuit ditutup lagi.
+    """
+    
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.half_open_trial = False
+        self.lock = threading.Lock()
+    
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return 'half_open'
+            return 'open'
+    
+    def allow_request(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self.half_open_trial:
+                return False
+            self.half_open_trial = True
+            return True
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.half_open_trial = False
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.half_open_trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.half_open_trial:
+                    logger.warning(f"AI service circuit opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+                self.half_open_trial = False
+
+class EstimationWorker:
+    """Isi estimated_time task baru di background lewat POST /predict/batch.
+
+    create_task() hanya memasukkan task ke antrean (bounded); worker thread
+    mengambilnya per batch, memanggil AI service dengan session keep-alive,
+    menyimpan hasilnya lalu mengirim event task_updated.
+    """
+    
+    def __init__(self, db_manager, ai_service_url, workers=ESTIMATION_WORKERS,
+                 queue_size=ESTIMATION_QUEUE_SIZE, batch_size=ESTIMATION_BATCH_SIZE,
+                 batch_window=ESTIMATION_BATCH_WINDOW):
+        self.db_manager = db_manager
+        self.ai_service_url = ai_service_url
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.breaker = CircuitBreaker()
+        self.stats_lock = threading.Lock()
+        self.stats = {'queued': 0, 'dropped': 0, 'estimated': 0, 'failed': 0, 'skipped': 0}
+        self.threads = []
+    
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'estimation-worker-{i}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+    
+    def _count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+    
+    def submit(self, task):
+        """Antrekan task untuk diestimasi; return False jika antrean penuh"""
+        try:
+            self.pending.put_nowait(task)
+        except queue.Full:
+            self._count('dropped')
+            logger.warning(f"Estimation queue full, task {task['id']} left without estimate")
+            return False
+        self._count('queued')
+        return True
+    
+    def _collect(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _predict(self, session, batch):
+        return request_estimates(session, self.ai_service_url, batch)
+    
+    def _store(self, batch, estimates):
+        """Simpan estimasi yang masih kosong; return task yang benar-benar berubah"""
+        def store(conn):
+            updated = []
+            cursor = conn.cursor()
+            for task, estimated_time in zip(batch, estimates):
+                if estimated_time is None:
+                    continue
+                row = execute_one(cursor, STORE_ESTIMATE_SQL, (estimated_time, task['id']))
+                if row:
+                    updated.append(dict(zip(TASK_COLUMNS, row)))
+            return updated
+        
+        return self.db_manager.run(store, write=True)
+    
+    def _wait_for_circuit(self):
+        """True jika boleh memanggil AI service; selama panggilan percobaan half-open
+        masih berjalan di thread lain, tunggu hasilnya daripada langsung melewati batch"""
+        deadline = time.monotonic() + AI_REQUEST_TIMEOUT
+        while not self.breaker.allow_request():
+            if self.breaker.state == 'open' or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def _run(self):
+        # Satu session per thread: requests.Session tidak dijamin thread-safe
+        session = make_ai_session()
+        while True:
+            batch = self._collect()
+            try:
+                self._process(session, batch)
+            finally:
+                # Dihitung drain(): task baru selesai setelah estimasinya tersimpan (atau gagal)
+                for _ in batch:
+                    self.pending.task_done()
+    
+    def _process(self, session, batch):
+        if not self._wait_for_circuit():
+            self._count('skipped', len(batch))
+            return
+        
+        try:
+            estimates = self._predict(session, batch)
+            self.breaker.record_success()
+        except Exception as e:
+            self.breaker.record_failure()
+            self._count('failed', len(batch))
+            logger.warning(f"AI prediction failed for {len(batch)} tasks: {str(e)}")
+            return
+        
+        try:
+            updated = self._store(batch, estimates)
+        except Exception as e:
+            self._count('failed', len(batch))
+            logger.error(f"Error storing estimates: {str(e)}")
+            return
+        
+        self._count('estimated', len(updated))
+        for task in updated:
+            broadcast_bus.publish_task('updated', task)
+            emit_stats_delta(dict(task, estimated_time=None), task)
+    
+    def drain(self, timeout):
+        """Tunggu antrean dan batch yang sedang diproses selesai; return jumlah task yang tersisa"""
+        deadline = time.monotonic() + timeout
+        while self.pending.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return self.pending.unfinished_tasks
+    
+    def get_stats(self):
+        with self.stats_lock:
+            return dict(self.stats, queue_depth=self.pending.qsize(), circuit=self.breaker.state)
+
+class CachedBody:
+    """Body JSON satu bentuk query pada satu versi change log, plus hasil kompresinya"""
+    
+    __slots__ = ('version', 'etag', 'body', 'encoded')
+    
+    def __init__(self, version, body):
+        self.version = version
+        self.etag = task_list_etag(version)
+        self.body = body
+        self.encoded = {}
+
+def task_list_etag(version):
+    return f'tasks-{db_manager.database_id:x}-{version}'
+
+class ResponseCache:
+    """Cache LRU body GET /tasks per bentuk query (filter, cursor, limit, fields).
+
+    Entry hanya dipakai selama versi change log sama dengan versinya. Setiap
+    INSERT/UPDATE/DELETE menaikkan versi itu lewat trigger task_changes, jadi
+    write dari proses mana pun membuat entry lama basi; entry basi dibuang
+    saat ditemukan. Hasil gzip/brotli dibuat sekali per entry lalu dipakai ulang.
+    """
+    
+    def __init__(self, max_size=RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0,
+                      'not_modified': 0, 'compressions': 0}
+    
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.version != version:
+                del self.entries[key]
+                self.stats['stale'] += 1
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+    
+    def put(self, key, version, body):
+        entry = CachedBody(version, body)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return entry
+    
+    def encode(self, entry, encoding):
+        """Body entry dalam encoding 'gzip' atau 'br', dikompres sekali saja"""
+        body = entry.encoded.get(encoding)
+        if body is None:
+            # Dua request bersamaan bisa sama-sama mengompres; hasilnya identik
+            if encoding == 'br':
+                body = brotli.compress(entry.body, quality=BROTLI_QUALITY)
+            else:
+                body = gzip.compress(entry.body, compresslevel=GZIP_LEVEL, mtime=0)
+            entry.encoded[encoding] = body
+            with self.lock:
+                self.stats['compressions'] += 1
+        return body
+    
+    def count_not_modified(self):
+        with self.lock:
+            self.stats['not_modified'] += 1
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, size=len(self.entries), max_size=self.max_size)
+
+# Encoding yang ditawarkan, urut preferensi server
+RESPONSE_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def negotiate_encoding(accept_encodings, size):
+    """Encoding terbaik dari Accept-Encoding, atau None (identity)"""
+    if size < COMPRESSION_MIN_SIZE:
+        return None
+    return accept_encodings.best_match(RESPONSE_ENCODINGS)
+
+def set_validators(response, etag):
+    response.set_etag(etag, weak=True)
+    # Browser/proxy boleh menyimpan, tapi harus revalidasi dengan If-None-Match tiap kali
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def cached_body_response(entry):
+    encoding = negotiate_encoding(request.accept_encodings, len(entry.body))
+    body = response_cache.encode(entry, encoding) if encoding else entry.body
+    response = Response(body, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return set_validators(response, entry.etag)
+
+def not_modified_response(etag):
+    response_cache.count_not_modified()
+    return set_validators(Response(status=304), etag)
+
 # Instance database manager
 db_manager = DatabaseManager(DATABASE_PATH)
 
-# Validasi input
-def validate_task_input(data):
-    """Validasi input untuk task"""
-    errors = []
+# Cache body GET /tasks per bentuk query
+response_cache = ResponseCache()
+
+# Event bus untuk broadcast Socket.IO
+broadcast_bus = BroadcastBus(socketio)
+broadcast_bus.start()
+
+def run_change_log_compaction():
+    while True:
+        time.sleep(SYNC_COMPACT_INTERVAL)
+        try:
+            db_manager.compact_changes()
+        except Exception as e:
+            logger.error(f"Error compacting change log: {str(e)}")
+
+threading.Thread(target=run_change_log_compaction, name='change-log-compaction', daemon=True).start()
+
+class StorageLifecycle:
+    """Job background yang menjaga working set tabel tasks tetap kecil.
+
+    Setiap interval: pindahkan task completed/cancelled yang tidak berubah
+    selama archive_after_days ke tasks_archive, lalu lepas halaman kosong
+    dengan incremental_vacuum dan jalankan PRAGMA optimize. Arsip dan vacuum
+    dikerjakan per batch kecil, masing-masing satu transaksi pendek dengan
+    jeda di antaranya, jadi writer lain hanya menunggu satu batch.
+    """
+    
+    def __init__(self, db_manager, on_archived, archive_after_days=ARCHIVE_AFTER_DAYS,
+                 batch_size=ARCHIVE_BATCH_SIZE, vacuum_pages=VACUUM_PAGES_PER_STEP,
+                 interval=DB_MAINTENANCE_INTERVAL):
+        self.db_manager = db_manager
+        self.on_archived = on_archived
+        self.archive_after_days = archive_after_days
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stats = {'runs': 0, 'failed': 0, 'archived': 0, 'vacuumed_pages': 0}
+        self.last_run = None
+    
+    def start(self):
+        threading.Thread(target=self._run, name='storage-lifecycle', daemon=True).start()
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.run_once()
+    
+    def _count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+    
+    def run_once(self):
+        """Arsip, vacuum, optimize; return ringkasan run ini"""
+        started = time.perf_counter()
+        try:
+            summary = {'archived': self.archive(), 'vacuumed_pages': self.vacuum()}
+            self.db_manager.optimize()
+        except Exception as e:
+            self._count('failed')
+            logger.error(f"Error in storage maintenance: {str(e)}")
+            return None
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        with self.lock:
+            self.stats['runs'] += 1
+            self.last_run = dict(summary, finished_at=datetime.datetime.now().isoformat(timespec='seconds'))
+        if summary['archived'] or summary['vacuumed_pages']:
+            logger.info(f"Storage maintenance: archived {summary['archived']} tasks, "
+                        f"released {summary['vacuumed_pages']} pages in {summary['seconds']}s")
+        return summary
+    
+    def archive(self):
+        if self.archive_after_days <= 0:
+            return 0
+        total = 0
+        while True:
+            ids = self.db_manager.archive_tasks(self.archive_after_days, self.batch_size)
+            if ids:
+                total += len(ids)
+                self._count('archived', len(ids))
+                self.on_archived(ids)
+            if len(ids) < self.batch_size:
+                return total
+            time.sleep(ARCHIVE_BATCH_PAUSE)
+    
+    def vacuum(self):
+        """Hanya berpengaruh jika auto_vacuum=INCREMENTAL (file baru atau setelah VACUUM)"""
+        total = 0
+        while True:
+            freed, remaining = self.db_manager.incremental_vacuum(self.vacuum_pages)
+            total += freed
+            self._count('vacuumed_pages', freed)
+            if not freed or not remaining:
+                return total
+            time.sleep(ARCHIVE_BATCH_PAUSE)
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, archive_after_days=self.archive_after_days, last_run=self.last_run)
+
+def publish_archived(ids):
+    """Task yang diarsipkan hilang dari daftar aktif client (statistik tetap)"""
+    for task_id in ids:
+        broadcast_bus.publish_task('archived', {'id': task_id})
+
+storage_lifecycle = StorageLifecycle(db_manager, publish_archived)
+storage_lifecycle.start()
+if db_manager.auto_vacuum_mode() != 2:
+    logger.info("tasks.db was created without auto_vacuum=INCREMENTAL; "
+                "run 'flask --app app storage full-vacuum' once to enable incremental vacuum")
+
+# Worker estimasi AI
+estimation_worker = EstimationWorker(db_manager, AI_SERVICE_URL)
+estimation_worker.start()
+
+def stats_subset(stats, keys):
+    return {key: stats[key] for key in keys}
+
+# Statistik yang sudah dihitung komponen di atas, dibaca saat /metrics di-scrape
+metrics.callback('db_pool_checkouts_total', 'Connection pool checkouts by outcome; waits/timeouts = pool exhausted',
+                 'counter', lambda: stats_subset(db_manager.pool.get_stats(),
+                                                 ('hits', 'misses', 'waits', 'timeouts', 'discarded')), ['outcome'])
+metrics.callback('db_pool_connections', 'Pooled connections by state', 'gauge',
+                 lambda: stats_subset(db_manager.pool.get_stats(), ('opened', 'idle')), ['state'])
+metrics.callback('estimation_tasks_total', 'Background estimation tasks by outcome', 'counter',
+                 lambda: stats_subset(estimation_worker.get_stats(),
+                                      ('queued', 'dropped', 'estimated', 'failed', 'skipped')), ['outcome'])
+metrics.callback('estimation_queue_depth', 'Tasks waiting for an AI estimate', 'gauge',
+                 lambda: {(): estimation_worker.pending.qsize()})
+metrics.callback('ai_circuit_open', '1 while the AI service circuit breaker is open or half-open', 'gauge',
+                 lambda: {(): int(estimation_worker.breaker.state != 'closed')})
+metrics.callback('broadcast_task_events_total', 'Task events published to the broadcast bus (folded = merged)',
+                 'counter', lambda: stats_subset(broadcast_bus.get_stats(), ('published', 'folded')), ['event'])
+metrics.callback('broadcast_queue_depth', 'Task changes waiting for the next tasks_batch frame', 'gauge',
+                 lambda: {(): broadcast_bus.get_stats()['queue_depth']})
+metrics.callback('storage_maintenance_total', 'Storage lifecycle runs, archived tasks and released pages',
+                 'counter', lambda: stats_subset(storage_lifecycle.get_stats(),
+                                                 ('runs', 'failed', 'archived', 'vacuumed_pages')), ['event'])
+metrics.callback('response_cache_events_total', 'GET /tasks response cache lookups, 304s and compressions', 'counter',
+                 lambda: stats_subset(response_cache.get_stats(),
+                                      ('hits', 'misses', 'stale', 'evictions', 'not_modified', 'compressions')),
+                 ['event'])
+
+# Kolom task, urutannya sama dengan SELECT di semua route
+TASK_COLUMNS = [
+    'id', 'title', 'description', 'status', 'estimated_time',
+    'actual_time', 'complexity', 'created_at', 'updated_at'
+]
+STATS_COLUMNS = ['status', 'complexity', 'estimated_time', 'actual_time']
+# Kolom yang boleh diubah lewat PUT/PATCH
+UPDATABLE_COLUMNS = ['title', 'description', 'status', 'actual_time', 'complexity']
+VALID_STATUSES = ['pending', 'in_progress', 'completed', 'cancelled']
+VALID_COMPLEXITY = ['low', 'medium', 'high']
+
+# Konfigurasi pagination GET /tasks
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# SQL tulis satu statement dengan RETURNING; teksnya konstan sehingga statement cache apsw terpakai
+INSERT_TASK_SQL = f'''
+    INSERT INTO tasks (title, description, status, estimated_time, complexity)
+    VALUES (?, ?, ?, ?, ?)
+    RETURNING {", ".join(TASK_COLUMNS)}
+'''
+DELETE_TASK_SQL = f'DELETE FROM tasks WHERE id = ? RETURNING {", ".join(STATS_COLUMNS)}'
+STORE_ESTIMATE_SQL = f'''
+    UPDATE tasks SET estimated_time = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND estimated_time IS NULL
+    RETURNING {", ".join(TASK_COLUMNS)}
+'''
+# Salin satu batch task selesai yang sudah lama tidak berubah ke arsip (memakai idx_tasks_status_created)
+ARCHIVE_TASKS_SQL = f'''
+    INSERT INTO tasks_archive ({", ".join(TASK_COLUMNS)})
+    SELECT {", ".join(TASK_COLUMNS)} FROM tasks
+    WHERE status IN ({", ".join(f"'{status}'" for status in ARCHIVE_STATUSES)})
+      AND updated_at < datetime('now', ?)
+    LIMIT ?
+    RETURNING id
+'''
+
+def execute_one(cursor, sql, params):
+    """Jalankan statement dan ambil satu baris (atau None); statement dihabiskan
+    agar transaksi bisa di-commit (RETURNING yang belum selesai menahan commit)"""
+    rows = cursor.execute(sql, params).fetchall()
+    return rows[0] if rows else None
+
+@lru_cache(maxsize=None)
+def update_task_sql(columns):
+    """UPDATE ... RETURNING untuk tuple kolom tertentu (urutan UPDATABLE_COLUMNS).
+
+    Parameter: id lalu nilai kolom. Baris hasil: TASK_COLUMNS baru diikuti
+    STATS_COLUMNS lama (untuk stats_delta). RETURNING hanya melihat nilai baru,
+    jadi nilai lama diambil dari CTE MATERIALIZED; karena WHERE memakainya, CTE
+    itu sudah terisi sebelum baris diubah.
+    """
+    assignments = ', '.join(f'{column} = ?' for column in columns)
+    old_columns = ', '.join(f'(SELECT {column} FROM old)' for column in STATS_COLUMNS)
+    return f'''
+        WITH old AS MATERIALIZED (SELECT id, {", ".join(STATS_COLUMNS)} FROM tasks WHERE id = ?)
+        UPDATE tasks SET {assignments}, updated_at = CURRENT_TIMESTAMP
+        WHERE id = (SELECT id FROM old)
+        RETURNING {", ".join(TASK_COLUMNS)}, {old_columns}
+    '''
+
+def validate_task_input(data, partial=False):
+    """Validasi input untuk task; partial=True (PATCH) hanya memeriksa field yang dikirim"""
+    if not isinstance(data, dict):
+        return ['Request body must be a JSON object']
+    if partial and not any(column in data for column in UPDATABLE_COLUMNS):
+        return [f'At least one of {", ".join(UPDATABLE_COLUMNS)} is required']
+    
+    # Tipe dulu: pemeriksaan panjang dan nilai di bawah mengandaikan string/int
+    errors = [f'{column} must be a string' for column in ('title', 'description', 'status', 'complexity')
+              if data.get(column) is not None and not isinstance(data[column], str)]
+    for column in ('estimated_time', 'actual_time'):
+        value = data.get(column)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            errors.append(f'{column} must be an integer')
+    if errors:
+        return errors
     
-    if not data.get('title') or not data['title'].strip():
+    if partial:
+        if 'title' in data and (data['title'] is None or not data['title'].strip()):
+            errors.append('Title must not be empty')
+    elif not data.get('title') or not data['title'].strip():
         errors.append('Title is required')
     
     if data.get('title') and len(data['title']) > 200:
@@ -91,115 +1688,477 @@ def validate_task_input(data):
     if data.get('description') and len(data['description']) > 1000:
         errors.append('Description must be less than 1000 characters')
     
-    valid_statuses = ['pending', 'in_progress', 'completed', 'cancelled']
-    if data.get('status') and data['status'] not in valid_statuses:
-        errors.append(f'Status must be one of: {", ".join(valid_statuses)}')
+    if data.get('status') and data['status'] not in VALID_STATUSES:
+        errors.append(f'Status must be one of: {", ".join(VALID_STATUSES)}')
     
-    valid_complexity = ['low', 'medium', 'high']
-    if data.get('complexity') and data['complexity'] not in valid_complexity:
-        errors.append(f'Complexity must be one of: {", ".join(valid_complexity)}')
+    if data.get('complexity') and data['complexity'] not in VALID_COMPLEXITY:
+        errors.append(f'Complexity must be one of: {", ".join(VALID_COMPLEXITY)}')
     
     return errors
 
+def encode_cursor(created_at, task_id):
+    """Encode posisi (created_at, id) terakhir menjadi cursor opaque"""
+    raw = json.dumps([created_at, task_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor_value):
+    """Decode cursor dari encode_cursor; raise ValueError jika tidak valid"""
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor_value.encode('ascii')))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(created_at, str) or not isinstance(task_id, int):
+        raise ValueError('Invalid cursor')
+    return created_at, task_id
+
+def parse_task_query(args):
+    """Validasi query string GET /tasks (limit, cursor, status, complexity, fields, include_archived)"""
+    errors = []
+    query = {'limit': DEFAULT_PAGE_SIZE, 'after': None, 'status': None,
+             'complexity': None, 'fields': TASK_COLUMNS, 'include_archived': False}
+    
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            query['limit'] = int(limit)
+            if not 1 <= query['limit'] <= MAX_PAGE_SIZE:
+                raise ValueError
+        except ValueError:
+            errors.append(f'Limit must be an integer between 1 and {MAX_PAGE_SIZE}')
+    
+    if args.get('cursor'):
+        try:
+            query['after'] = decode_cursor(args['cursor'])
+        except ValueError:
+            errors.append('Invalid cursor')
+    
+    status = args.get('status')
+    if status:
+        if status not in VALID_STATUSES:
+            errors.append(f'Status must be one of: {", ".join(VALID_STATUSES)}')
+        query['status'] = status
+    
+    complexity = args.get('complexity')
+    if complexity:
+        if complexity not in VALID_COMPLEXITY:
+            errors.append(f'Complexity must be one of: {", ".join(VALID_COMPLEXITY)}')
+        query['complexity'] = complexity
+    
+    fields = args.get('fields')
+    if fields:
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in requested if f not in TASK_COLUMNS]
+        if unknown:
+            errors.append(f'Unknown fields: {", ".join(unknown)}')
+        # Urutan mengikuti TASK_COLUMNS, duplikat dibuang
+        query['fields'] = [c for c in TASK_COLUMNS if c in requested]
+    
+    try:
+        query['include_archived'] = parse_flag(args.get('include_archived'))
+    except ValueError:
+        errors.append('include_archived must be 0 or 1')
+    
+    return query, errors
+
+def parse_flag(value):
+    """Flag query string: kosong/0/false = False, 1/true = True; raise ValueError selain itu"""
+    if value in (None, '', '0', 'false'):
+        return False
+    if value in ('1', 'true'):
+        return True
+    raise ValueError(f'Invalid flag: {value}')
+
+def parse_optional_int(value):
+    """int dari JSON/CSV; string kosong atau None menjadi None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError('not an integer')
+    return int(value)
+
+def parse_import_record(record):
+    """Validasi satu baris import; return (tuple kolom INSERT, errors)"""
+    if not isinstance(record, dict):
+        return None, ['Each record must be an object']
+    
+    record = {key: (value if value != '' else None) for key, value in record.items()}
+    if any(not isinstance(record.get(key), (str, type(None))) for key in ('title', 'description')):
+        return None, ['Title and description must be strings']
+    
+    # CSV memberi angka sebagai teks: ubah dulu ke int sebelum validate_task_input
+    try:
+        record['estimated_time'] = parse_optional_int(record.get('estimated_time'))
+        record['actual_time'] = parse_optional_int(record.get('actual_time'))
+    except (TypeError, ValueError):
+        return None, ['estimated_time and actual_time must be integers']
+    
+    errors = validate_task_input(record)
+    if errors:
+        return None, errors
+    
+    return (
+        record['title'],
+        record.get('description') or '',
+        record.get('status') or 'pending',
+        record['estimated_time'],
+        record['actual_time'],
+        record.get('complexity') or 'medium'
+    ), []
+
+def iter_import_records(stream, content_type):
+    """Baca body request baris per baris (NDJSON atau CSV) tanpa memuat seluruhnya"""
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    
+    if content_type == 'text/csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json_loads(line)
+        except ValueError:
+            yield line_number, None
+
+def import_chunk(rows, estimate, session):
+    """Isi estimasi yang kosong per batch lalu INSERT satu chunk dalam satu transaksi.
+
+    Baris yang estimasinya gagal (AI service error atau circuit terbuka) diantrekan
+    ke estimation_worker setelah commit, sama seperti POST /tasks.
+    """
+    missing = [i for i, row in enumerate(rows) if row[3] is None]
+    if estimate and missing and estimation_worker.breaker.allow_request():
+        try:
+            estimates = request_estimates(session, AI_SERVICE_URL, [
+                {'title': rows[i][0], 'description': rows[i][1], 'complexity': rows[i][5]}
+                for i in missing
+            ])
+            estimation_worker.breaker.record_success()
+            for i, estimated_time in zip(missing, estimates):
+                rows[i] = rows[i][:3] + (estimated_time,) + rows[i][4:]
+        except Exception as e:
+            estimation_worker.breaker.record_failure()
+            logger.warning(f"AI prediction failed for imported chunk: {str(e)}")
+    
+    inserted = db_manager.run(lambda conn: conn.cursor().executemany('''
+        INSERT INTO tasks (title, description, status, estimated_time, actual_time, complexity)
+        VALUES (?, ?, ?, ?, ?, ?)
+        RETURNING id, estimated_time
+    ''', rows).fetchall(), write=True)
+    
+    if estimate:
+        for (task_id, estimated_time), row in zip(inserted, rows):
+            if estimated_time is None and not estimation_worker.submit(
+                    {'id': task_id, 'title': row[0], 'description': row[1], 'complexity': row[5]}):
+                break  # antrean penuh; sisanya tetap tanpa estimasi
+    
+    # Kontribusi chunk ini ke task_stats, untuk satu event stats_delta di akhir
+    delta = {}
+    for row in rows:
+        task = dict(zip(['status', 'estimated_time', 'actual_time', 'complexity'],
+                        (row[2], row[3], row[4], row[5])))
+        for key, value in stats_contribution(task).items():
+            delta[key] = delta.get(key, 0) + value
+    return delta
+
 # Routes
 @app.route('/tasks', methods=['GET'])
 def get_tasks():
-    """Mengambil semua tugas"""
+    """Mengambil tugas per halaman (keyset pagination pada created_at, id).
+
+    ETag = versi change log: If-None-Match yang cocok dijawab 304 tanpa
+    membaca tabel tasks, dan body yang sama dipakai ulang dari response_cache.
+    """
     try:
+        query, errors = parse_task_query(request.args)
+        if errors:
+            return jsonify({'errors': errors}), 400
+        
+        version = db_manager.get_version()
+        if request.if_none_match.contains_weak(task_list_etag(version)):
+            return not_modified_response(task_list_etag(version))
+        
+        key = (query['status'], query['complexity'], query['after'], query['limit'], tuple(query['fields']),
+               query['include_archived'])
+        entry = response_cache.get(key, version)
+        if entry is None:
+            entry = response_cache.put(key, *build_task_page(query))
+        return cached_body_response(entry)
+    
+    except Exception as e:
+        logger.error(f"Error fetching tasks: {str(e)}")
+        return jsonify({'error': 'Failed to fetch tasks'}), 500
+
+def build_task_page(query):
+    """Jalankan query halaman GET /tasks; return (versi, body JSON dalam bytes)"""
+    where = []
+    params = []
+    if query['status']:
+        where.append('status = ?')
+        params.append(query['status'])
+    if query['complexity']:
+        where.append('complexity = ?')
+        params.append(query['complexity'])
+    if query['after']:
+        where.append('(created_at, id) < (?, ?)')
+        params.extend(query['after'])
+    
+    # id dan created_at untuk cursor berikutnya, lalu baris sebagai objek JSON buatan SQLite
+    select = f'SELECT id, created_at, {json_object_sql(query["fields"])} FROM tasks'
+    if where:
+        select += ' WHERE ' + ' AND '.join(where)
+    sql = select
+    if query['include_archived']:
+        # Compound ORDER BY digabung SQLite secara merge dari dua scan index yang sudah urut
+        sql += ' UNION ALL ' + select.replace(' FROM tasks', ' FROM tasks_archive', 1)
+        params = params + params
+    sql += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+    params.append(query['limit'] + 1)
+    
+    def read(conn):
+        cursor = conn.cursor()
+        rows = cursor.execute(sql, params).fetchall()
+        # Dibaca di transaksi yang sama: basis untuk /tasks/changes?since=
+        return rows, db_manager.current_version(cursor)
+    
+    rows, version = db_manager.run(read)
+    
+    next_cursor = None
+    if len(rows) > query['limit']:
+        rows = rows[:query['limit']]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+    
+    tasks = json_array([row[2] for row in rows])
+    return version, compose({'tasks': tasks, 'next_cursor': next_cursor, 'version': version})
+
+SEARCH_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+def build_match_query(q):
+    """Ubah teks bebas menjadi ekspresi MATCH FTS5 yang aman: semua kata wajib ada,
+    kata terakhir dicocokkan sebagai prefix (pencarian saat mengetik)"""
+    terms = SEARCH_TERM_PATTERN.findall(q)[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+@app.route('/tasks/search', methods=['GET'])
+def search_tasks():
+    """Cari tugas berdasarkan kata di judul/deskripsi (bm25, highlight, pagination);
+    ?include_archived=1 ikut mencari di tasks_archive."""
+    try:
+        errors = []
+        match = build_match_query(request.args.get('q', ''))
+        if match is None:
+            errors.append('q must contain at least one word')
+        
+        limit = offset = None
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            offset = int(request.args.get('offset', 0))
+            if not 1 <= limit <= MAX_PAGE_SIZE or offset < 0:
+                raise ValueError
+        except ValueError:
+            errors.append(f'limit must be between 1 and {MAX_PAGE_SIZE} and offset must not be negative')
+        
+        include_archived = False
+        try:
+            include_archived = parse_flag(request.args.get('include_archived'))
+        except ValueError:
+            errors.append('include_archived must be 0 or 1')
+        
+        if errors:
+            return jsonify({'errors': errors}), 400
+        
+        # Ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+        results = db_manager.search_tasks(match, limit + 1, offset, include_archived)
+        next_offset = offset + limit if len(results) > limit else None
+        
+        body = compose({'tasks': json_array(results[:limit]), 'next_offset': next_offset})
+        return Response(body, mimetype='application/json')
+    
+    except Exception as e:
+        logger.error(f"Error searching tasks: {str(e)}")
+        return jsonify({'error': 'Failed to search tasks'}), 500
+
+def parse_since(value):
+    """Versi 'since' untuk delta sync; raise ValueError jika bukan int >= 0"""
+    since = int(value)
+    if since < 0:
+        raise ValueError('since must not be negative')
+    return since
+
+@app.route('/tasks/changes', methods=['GET'])
+def get_task_changes():
+    """Perubahan tugas sejak versi tertentu (delta sync)"""
+    try:
+        try:
+            since = parse_since(request.args.get('since', 0))
+        except (TypeError, ValueError):
+            return jsonify({'errors': ['since must be a non-negative integer']}), 400
+        
+        return Response(compose(db_manager.get_changes(since)), mimetype='application/json')
+    
+    except Exception as e:
+        logger.error(f"Error fetching task changes: {str(e)}")
+        return jsonify({'error': 'Failed to fetch task changes'}), 500
+
+@app.route('/tasks/stats', methods=['GET'])
+def get_task_stats():
+    """Statistik agregat untuk dashboard (dibaca dari task_stats); mencakup semua task,
+    termasuk yang sudah diarsipkan"""
+    try:
+        return jsonify(db_manager.get_stats()), 200
+    except Exception as e:
+        logger.error(f"Error fetching task stats: {str(e)}")
+        return jsonify({'error': 'Failed to fetch task stats'}), 500
+
+@app.route('/tasks/bulk', methods=['POST'])
+def bulk_create_tasks():
+    """Import banyak tugas dari NDJSON atau CSV (streaming, per chunk)"""
+    try:
+        content_type = request.mimetype
+        if content_type not in ('application/x-ndjson', 'application/jsonl', 'text/csv'):
+            return jsonify({'error': 'Content-Type must be application/x-ndjson or text/csv'}), 415
+        
+        estimate = request.args.get('estimate', '1') != '0'
+        
+        imported = 0
+        failed = 0
+        errors = []
+        stats_total = {}
+        chunk = []
+        
+        with make_ai_session() if estimate else nullcontext() as session:
+            def flush():
+                delta = import_chunk(chunk, estimate, session)
+                for key, value in delta.items():
+                    stats_total[key] = stats_total.get(key, 0) + value
+                chunk.clear()
+            
+            for line_number, record in iter_import_records(request.stream, content_type):
+                row, row_errors = parse_import_record(record) if record is not None else (None, ['Invalid JSON'])
+                if row_errors:
+                    failed += 1
+                    if len(errors) < BULK_MAX_ERRORS:
+                        errors.append({'line': line_number, 'errors': row_errors})
+                    continue
+                
+                chunk.append(row)
+                imported += 1
+                if len(chunk) >= BULK_CHUNK_SIZE:
+                    flush()
+            
+            if chunk:
+                flush()
+        
+        # Satu broadcast ringkas, bukan satu event per task
+        if imported:
+            broadcast_bus.publish_import(imported)
+            broadcast_bus.publish_stats(stats_total)
+        
+        return jsonify({'imported': imported, 'failed': failed, 'errors': errors}), 201 if imported else 400
+    
+    except Exception as e:
+        logger.error(f"Error importing tasks: {str(e)}")
+        return jsonify({'error': 'Failed to import tasks'}), 500
+
+@app.route('/tasks/export', methods=['GET'])
+def export_tasks():
+    """Export semua tugas sebagai NDJSON, array JSON atau CSV, di-stream langsung dari cursor
+    (chunked transfer encoding). Baris JSON dibuat oleh SQLite (json_object).
+    ?include_archived=1 ikut mengekspor tasks_archive."""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Format must be one of: {", ".join(EXPORT_FORMATS)}'}), 400
+    try:
+        include_archived = parse_flag(request.args.get('include_archived'))
+    except ValueError:
+        return jsonify({'error': 'include_archived must be 0 or 1'}), 400
+    
+    def generate():
         with db_manager.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, title, description, status, estimated_time, 
-                       actual_time, complexity, created_at, updated_at
-                FROM tasks 
-                ORDER BY created_at DESC
-            ''')
+            buffer = io.StringIO()
+            writer = csv.writer(buffer) if export_format == 'csv' else None
+            if writer:
+                writer.writerow(TASK_COLUMNS)
             
-            tasks = []
-            for row in cursor.fetchall():
-                tasks.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'description': row[2],
-                    'status': row[3],
-                    'estimated_time': row[4],
-                    'actual_time': row[5],
-                    'complexity': row[6],
-                    'created_at': row[7],
-                    'updated_at': row[8]
-                })
+            def next_chunk():
+                """Format hingga EXPORT_ROWS_PER_CHUNK baris berikutnya; '' jika cursor habis"""
+                rows = itertools.islice(cursor, EXPORT_ROWS_PER_CHUNK)
+                if writer:
+                    writer.writerows(rows)
+                    chunk = buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                    return chunk
+                lines = [row[0] for row in rows]
+                if not lines:
+                    return ''
+                if export_format == 'json':
+                    return ','.join(lines)
+                return '\n'.join(lines) + '\n'
             
-            return jsonify({'tasks': tasks}), 200
+            columns = ', '.join(TASK_COLUMNS) if writer else f'{json_object_sql(TASK_COLUMNS)}, id'
+            sql = f'SELECT {columns} FROM tasks'
+            if include_archived:
+                sql += f' UNION ALL SELECT {columns} FROM tasks_archive'
+            run_blocking(cursor.execute, sql + ' ORDER BY id')
+            # Tiap chunk dibaca di threadpool (mode gevent), di-yield dari greenlet request
+            separator = ''
+            if export_format == 'json':
+                yield '['
+            while True:
+                chunk = run_blocking(next_chunk)
+                if not chunk:
+                    break
+                if export_format == 'json':
+                    yield separator
+                    separator = ','
+                yield chunk
+            if export_format == 'json':
+                yield ']'
     
-    except Exception as e:
-        logger.error(f"Error fetching tasks: {str(e)}")
-        return jsonify({'error': 'Failed to fetch tasks'}), 500
+    return Response(generate(), mimetype=EXPORT_FORMATS[export_format], headers={
+        'Content-Disposition': f'attachment; filename=tasks.{export_format}'
+    })
 
 @app.route('/tasks', methods=['POST'])
 def create_task():
     try:
-        data = request.get_json()
+        # silent: body yang bukan JSON menjadi None dan ditolak validate_task_input (400)
+        data = request.get_json(silent=True)
         
         # Validasi input
         errors = validate_task_input(data)
         if errors:
             return jsonify({'errors': errors}), 400
         
-        # Prediksi estimasi waktu menggunakan AI service
+        # Estimasi waktu diisi belakangan oleh estimation_worker
         estimated_time = None
-        try:
-            ai_response = requests.post(f'{AI_SERVICE_URL}/predict', 
-                                      json={
-                                          'title': data['title'],
-                                          'description': data.get('description', ''),
-                                          'complexity': data.get('complexity', 'medium')
-                                      }, timeout=5)
-            
-            if ai_response.status_code == 200:
-                prediction = ai_response.json()
-                estimated_time = prediction.get('prediction', {}).get('estimated_time')
-        except Exception as e:
-            logger.warning(f"AI prediction failed: {str(e)}")
         
         # Simpan ke database
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO tasks (title, description, status, estimated_time, complexity)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                data['title'],
-                data.get('description', ''),
-                data.get('status', 'pending'),
-                estimated_time,
-                data.get('complexity', 'medium')
-            ))
-            
-            # Get the last inserted rowid using APSW's proper method
-            task_id = cursor.getconnection().last_insert_rowid()
-            
-            # Ambil data lengkap task yang baru dibuat
-            cursor.execute('''
-                SELECT id, title, description, status, estimated_time, 
-                       actual_time, complexity, created_at, updated_at
-                FROM tasks WHERE id = ?
-            ''', (task_id,))
-            
-            row = cursor.fetchone()
-            new_task = {
-                'id': row[0],
-                'title': row[1],
-                'description': row[2],
-                'status': row[3],
-                'estimated_time': row[4],
-                'actual_time': row[5],
-                'complexity': row[6],
-                'created_at': row[7],
-                'updated_at': row[8]
-            }
+        row = db_manager.run(lambda conn: execute_one(conn.cursor(), INSERT_TASK_SQL, (
+            data['title'],
+            data.get('description', ''),
+            data.get('status', 'pending'),
+            estimated_time,
+            data.get('complexity', 'medium')
+        )), write=True)
+        new_task = dict(zip(TASK_COLUMNS, row))
         
         # Emit real-time update
-        socketio.emit('task_created', new_task, room='tasks')
+        broadcast_bus.publish_task('created', new_task)
+        emit_stats_delta(None, new_task)
+        
+        # Prediksi estimasi waktu menggunakan AI service (non-blocking)
+        estimation_worker.submit(new_task)
         
         return jsonify(new_task), 201
     
@@ -207,86 +2166,61 @@ def create_task():
         logger.error(f"Error creating task: {str(e)}")
         return jsonify({'error': 'Failed to create task'}), 500
 
+def apply_task_update(task_id, data, partial):
+    """Validasi lalu satu UPDATE ... RETURNING; dipakai PUT (semua kolom) dan PATCH (kolom yang dikirim)"""
+    errors = validate_task_input(data, partial=partial)
+    if errors:
+        return jsonify({'errors': errors}), 400
+    
+    columns = tuple(column for column in UPDATABLE_COLUMNS if not partial or column in data)
+    
+    row = db_manager.run(lambda conn: execute_one(conn.cursor(), update_task_sql(columns), (
+        task_id, *(data.get(column) for column in columns)
+    )), write=True)
+    if not row:
+        return jsonify({'error': 'Task not found'}), 404
+    updated_task = dict(zip(TASK_COLUMNS, row))
+    old_task = dict(zip(STATS_COLUMNS, row[len(TASK_COLUMNS):]))
+    
+    # Emit real-time update
+    broadcast_bus.publish_task('updated', updated_task)
+    emit_stats_delta(old_task, updated_task)
+    
+    return jsonify(updated_task), 200
+
 @app.route('/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
-    """Update tugas"""
+    """Update tugas (semua kolom yang bisa diubah)"""
     try:
-        data = request.get_json()
-        
-        # Validasi input
-        errors = validate_task_input(data)
-        if errors:
-            return jsonify({'errors': errors}), 400
-        
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if task exists
-            cursor.execute('SELECT id FROM tasks WHERE id = ?', (task_id,))
-            if not cursor.fetchone():
-                return jsonify({'error': 'Task not found'}), 404
-            
-            # Update task
-            cursor.execute('''
-                UPDATE tasks 
-                SET title = ?, description = ?, status = ?, 
-                    actual_time = ?, complexity = ?
-                WHERE id = ?
-            ''', (
-                data.get('title'),
-                data.get('description'),
-                data.get('status'),
-                data.get('actual_time'),
-                data.get('complexity'),
-                task_id
-            ))
-            
-            # Fetch updated task
-            cursor.execute('''
-                SELECT id, title, description, status, estimated_time, 
-                       actual_time, complexity, created_at, updated_at
-                FROM tasks WHERE id = ?
-            ''', (task_id,))
-            
-            row = cursor.fetchone()
-            updated_task = {
-                'id': row[0],
-                'title': row[1],
-                'description': row[2],
-                'status': row[3],
-                'estimated_time': row[4],
-                'actual_time': row[5],
-                'complexity': row[6],
-                'created_at': row[7],
-                'updated_at': row[8]
-            }
-        
-        # Emit real-time update
-        socketio.emit('task_updated', updated_task, room='tasks')
-        
-        return jsonify(updated_task), 200
+        return apply_task_update(task_id, request.get_json(silent=True), partial=False)
     
     except Exception as e:
         logger.error(f"Error updating task: {str(e)}")
         return jsonify({'error': 'Failed to update task'}), 500
 
+@app.route('/tasks/<int:task_id>', methods=['PATCH'])
+def patch_task(task_id):
+    """Update sebagian: hanya kolom yang ada di body yang diubah"""
+    try:
+        return apply_task_update(task_id, request.get_json(silent=True), partial=True)
+    
+    except Exception as e:
+        logger.error(f"Error patching task: {str(e)}")
+        return jsonify({'error': 'Failed to update task'}), 500
+
 @app.route('/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
     """Hapus tugas"""
     try:
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if task exists
-            cursor.execute('SELECT id FROM tasks WHERE id = ?', (task_id,))
-            if not cursor.fetchone():
-                return jsonify({'error': 'Task not found'}), 404
-            
-            # Delete task
-            cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+        # RETURNING memberi kolom statistik baris yang dihapus (untuk stats_delta)
+        old_row = db_manager.run(lambda conn: execute_one(conn.cursor(), DELETE_TASK_SQL, (task_id,)), write=True)
+        if not old_row:
+            return jsonify({'error': 'Task not found'}), 404
+        old_task = dict(zip(STATS_COLUMNS, old_row))
         
         # Emit real-time update
-        socketio.emit('task_deleted', {'id': task_id}, room='tasks')
+        broadcast_bus.publish_task('deleted', {'id': task_id})
+        emit_stats_delta(old_task, None)
         
         return '', 204
     
@@ -300,6 +2234,7 @@ def handle_connect():
     """Handle client connection"""
     logger.info(f"Client connected: {request.sid}")
     emit('connected', {'message': 'Connected to task management system'})
+    socketio_emits.inc(event='connected')
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -313,6 +2248,21 @@ def handle_join_tasks():
     join_room('tasks')
     logger.info(f"Client {request.sid} joined tasks room")
     emit('joined_tasks', {'message': 'Joined tasks room'})
+    socketio_emits.inc(event='joined_tasks')
+
+@socketio.on('sync')
+def handle_sync(data):
+    """Kirim balik perubahan sejak versi milik client (lewat ack)"""
+    try:
+        since = parse_since((data or {}).get('since', 0))
+    except (TypeError, ValueError):
+        return {'error': 'since must be a non-negative integer'}
+    try:
+        # Satu argumen ack yang sudah berupa JSON; SocketIOJSON menyisipkannya apa adanya
+        return RawJSON(compose(db_manager.get_changes(since)).decode('utf-8'))
+    except Exception as e:
+        logger.error(f"Error syncing client {request.sid}: {str(e)}")
+        return {'error': 'Failed to sync'}
 
 @socketio.on('leave_tasks')
 def handle_leave_tasks():
@@ -324,18 +2274,58 @@ def handle_leave_tasks():
 @app.route('/test-db')
 def test_db():
     try:
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            return jsonify({'status': 'success', 'tables': tables})
+        tables = db_manager.run(
+            lambda conn: conn.cursor().execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall())
+        return jsonify({'status': 'success', 'tables': tables, 'pool': db_manager.pool.get_stats()})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'task-management-backend'}), 200
+    return jsonify({
+        'status': 'healthy',
+        'service': 'task-management-backend',
+        'estimation': estimation_worker.get_stats(),
+        'broadcast': broadcast_bus.get_stats(),
+        'storage': storage_lifecycle.get_stats(),
+        # Manager in-memory bawaan tidak punya atribut name
+        'message_queue': getattr(socketio.server.manager, 'name', 'memory')
+    }), 200
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Pola route (/tasks/<int:task_id>), bukan path, agar jumlah seri tetap kecil
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_latency.observe(time.perf_counter() - started, method=request.method,
+                                route=route, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Metrik dalam format teks Prometheus"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+if PROFILER_ENABLED:
+    @app.route('/debug/profile', methods=['GET'])
+    @admin_required
+    def profile():
+        """Sampling profiler: stack semua thread selama ?seconds= (default 5), format collapsed"""
+        try:
+            seconds = float(request.args.get('seconds', 5))
+            interval = float(request.args.get('interval', 0.005))
+            if not 0 < seconds <= PROFILER_MAX_SECONDS or not 0.001 <= interval <= 1:
+                raise ValueError
+        except ValueError:
+            return jsonify({'errors': [f'seconds must be in (0, {PROFILER_MAX_SECONDS}] '
+                                       'and interval in [0.001, 1]']}), 400
+        return Response(sample_stacks(seconds, interval), mimetype='text/plain')
 
 # Error handlers
 @app.errorhandler(400)
@@ -350,5 +2340,59 @@ def not_found(error):
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
+@app.cli.command('search-index')
+@click.argument('command', type=click.Choice(['rebuild', 'optimize']))
+def search_index_command(command):
+    """Maintenance index FTS5: flask --app app search-index rebuild|optimize"""
+    elapsed = db_manager.maintain_search_index(command)
+    click.echo(f"Search index {command} finished in {elapsed:.2f}s")
+
+@app.cli.command('storage')
+@click.argument('command', type=click.Choice(['maintain', 'full-vacuum']))
+def storage_command(command):
+    """Pemeliharaan database: flask --app app storage maintain|full-vacuum
+
+    maintain: satu putaran arsip + incremental vacuum + optimize (seperti job background).
+    full-vacuum: VACUUM penuh; mengunci database, jalankan saat maintenance window.
+    """
+    if command == 'maintain':
+        summary = storage_lifecycle.run_once()
+        if summary is None:
+            raise click.ClickException('Storage maintenance failed, see the log')
+        click.echo(f"Archived {summary['archived']} tasks, released {summary['vacuumed_pages']} pages "
+                   f"in {summary['seconds']}s")
+        return
+    start = time.perf_counter()
+    db_manager.full_vacuum()
+    click.echo(f"VACUUM finished in {time.perf_counter() - start:.2f}s "
+               f"(auto_vacuum={db_manager.auto_vacuum_mode()})")
+
+def shutdown(timeout=SHUTDOWN_DRAIN_TIMEOUT):
+    """Graceful shutdown: selesaikan estimasi yang antre, kirim broadcast tertunda, tutup pool.
+
+    Dipanggil hook worker_exit di gunicorn.conf.py, atau saat python app.py
+    menerima SIGTERM/Ctrl+C. Request yang sedang berjalan sudah ditunggu server.
+    """
+    left = estimation_worker.drain(timeout)
+    if left:
+        logger.warning(f"Shutting down with {left} tasks still waiting for an estimate")
+    try:
+        broadcast_bus.flush()
+    except Exception as e:
+        logger.error(f"Error flushing broadcast batch on shutdown: {str(e)}")
+    db_manager.pool.close()
+    logger.info("Backend shut down")
+
+def interrupt_on_sigterm(signum, frame):
+    # SIGTERM (docker stop, systemd) diperlakukan seperti Ctrl+C agar shutdown() tetap jalan
+    raise KeyboardInterrupt
+
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
+    signal.signal(signal.SIGTERM, interrupt_on_sigterm)
+    try:
+        # Server development; untuk produksi pakai gunicorn -c gunicorn.conf.py app:app
+        socketio.run(app, debug=SERVER_DEBUG, host='0.0.0.0', port=PORT, allow_unsafe_werkzeug=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown()
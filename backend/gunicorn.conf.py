@@ -0,0 +1,41 @@
+# gunicorn.conf.py
+"""Konfigurasi produksi backend: gunicorn dengan worker gevent.
+
+    cd backend && gunicorn -c gunicorn.conf.py app:app
+
+Satu worker gevent melayani ribuan koneksi (HTTP dan Socket.IO) secara
+bersamaan; query SQLite dijalankan di threadpool hub (lihat BlockingRunner
+di common/serving.py). Lebih dari satu worker butuh SOCKETIO_MESSAGE_QUEUE agar
+broadcast sampai ke client di worker lain, dan sticky session di load
+balancer untuk transport long-polling.
+"""
+import logging
+import os
+import sys
+
+# Harus diset sebelum app.py di-import worker
+os.environ.setdefault('ASYNC_MODE', 'gevent')
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_WORKERS', 1))
+worker_class = 'gevent'
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
+# Detik menunggu request yang masih berjalan setelah SIGTERM, sebelum worker dimatikan paksa
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 60))
+keepalive = int(os.environ.get('KEEPALIVE', 5))
+accesslog = os.environ.get('ACCESS_LOG')  # '-' untuk stdout
+
+
+def on_starting(server):
+    if workers > 1 and not os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+        logging.getLogger('gunicorn.error').warning(
+            'WEB_WORKERS > 1 without SOCKETIO_MESSAGE_QUEUE: '
+            'Socket.IO broadcasts will only reach clients of the same worker')
+
+
+def worker_exit(server, worker):
+    # Dipanggil setelah worker berhenti menerima request dan request berjalan selesai
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        app_module.shutdown()
@@ -0,0 +1,115 @@
+# serialization.py
+"""Serialisasi JSON bersama untuk route HTTP dan event Socket.IO.
+
+Dua jalur:
+
+* Daftar task (GET /tasks, pencarian, export, delta sync) dibuat sebagai
+  teks JSON oleh SQLite sendiri lewat ``json_object(...)`` (lihat
+  json_object_sql). Python hanya menyambung teks per baris, jadi baris tidak
+  pernah menjadi tuple + dict + objek encoder.
+* Payload lain (task tunggal, stats, tasks_batch) di-encode dengan orjson
+  jika terpasang, fallback ke modul json stdlib. Flask (jsonify) dan
+  python-socketio memakai encoder yang sama lewat JSONProvider dan SocketIOJSON.
+"""
+import decimal
+import json
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Tipe yang tidak dikenal encoder, sama dengan provider bawaan Flask"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj):
+        """Encode obj menjadi JSON ringkas (bytes UTF-8)"""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    _encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=_default)
+
+    def dumps(obj):
+        """Encode obj menjadi JSON ringkas (bytes UTF-8)"""
+        return _encoder.encode(obj).encode('utf-8')
+
+    loads = json.loads
+
+
+class RawJSON(str):
+    """Teks yang sudah berupa JSON valid; compose() menyisipkannya apa adanya"""
+    __slots__ = ()
+
+
+def json_pairs_sql(columns, prefix=''):
+    """Argumen json_object untuk kolom-kolom ini: 'id', t.id, 'title', t.title, ..."""
+    return ', '.join(f"'{column}', {prefix}{column}" for column in columns)
+
+
+def json_object_sql(columns, prefix=''):
+    """Ekspresi SQL yang membuat satu objek JSON per baris: json_object('id', t.id, ...)"""
+    return f'json_object({json_pairs_sql(columns, prefix)})'
+
+
+def json_array(texts):
+    """Gabungkan teks objek JSON per baris menjadi satu array"""
+    return RawJSON('[' + ','.join(texts) + ']')
+
+
+def compose(obj):
+    """Encode dict satu tingkat menjadi bytes; nilai RawJSON tidak di-encode ulang"""
+    parts = []
+    for key, value in obj.items():
+        if isinstance(value, RawJSON):
+            parts.append(dumps(key) + b':' + value.encode('utf-8'))
+        else:
+            parts.append(dumps(key) + b':' + dumps(value))
+    return b'{' + b','.join(parts) + b'}'
+
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider Flask di atas dumps()/loads(); jsonify() memakai jalur ini"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+class SocketIOJSON:
+    """Pengganti modul json untuk python-socketio (argumen json= SocketIO dan client manager).
+
+    python-socketio meng-encode argumen event/ack sebagai satu list; argumen
+    bertipe RawJSON (mis. hasil compose() yang di-decode) disisipkan apa adanya.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        if type(obj) is list and any(isinstance(item, RawJSON) for item in obj):
+            return '[' + ','.join(item if isinstance(item, RawJSON) else dumps(item).decode('utf-8')
+                                  for item in obj) + ']'
+        return dumps(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return loads(s)
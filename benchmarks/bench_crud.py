@@ -0,0 +1,157 @@
+# bench_crud.py
+"""Task CRUD latency and throughput at several table sizes.
+
+For each size a fresh SQLite database is seeded with that many synthetic
+tasks (fixed seed), then the backend routes are driven in-process through
+Flask's test client, so the numbers cover routing, validation, SQL and
+JSON but not the network:
+
+* ``list_first_page``: ``GET /tasks?limit=100``
+* ``list_filtered``: ``GET /tasks?status=completed&complexity=high&limit=100``
+* ``list_deep_page``: the page after following 20 keyset cursors (the last page on smaller tables)
+* ``list_not_modified``: ``GET /tasks?limit=100`` revalidated with ``If-None-Match`` (304)
+* ``list_gzip``: ``GET /tasks?limit=100`` with ``Accept-Encoding: gzip``
+* ``create``: ``POST /tasks``
+* ``update``: ``PATCH /tasks/<id>`` on random seeded tasks
+* ``delete``: ``DELETE /tasks/<id>`` on the tasks created above
+
+The list cases repeat one URL between writes, so after the warm-up they
+are served from the response cache, as repeated dashboard polls are.
+Background AI estimation is disabled; broadcasts go to an empty room.
+
+    python benchmarks/bench_crud.py --sizes 10000,100000,1000000 --output crud.json
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# app.py membuka tasks.db di direktori kerja saat di-import; jangan sentuh database asli
+WORKDIR = tempfile.mkdtemp(prefix='bench-crud-')
+os.chdir(WORKDIR)
+logging.disable(logging.WARNING)
+
+from bench_utils import latency_summary, synthetic_tasks, write_results  # noqa: E402
+import app  # noqa: E402
+
+SEED_CHUNK = 10000
+
+
+def seed_database(db, size, seed):
+    rows = synthetic_tasks(size, seed)
+    started = time.perf_counter()
+    while True:
+        chunk = [row for _, row in zip(range(SEED_CHUNK), rows)]
+        if not chunk:
+            break
+        db.run(lambda conn: conn.cursor().executemany('''
+            INSERT INTO tasks (title, description, status, estimated_time, actual_time, complexity)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', chunk), write=True)
+    return time.perf_counter() - started
+
+
+def timed(operations):
+    """Jalankan setiap operasi (callable) dan kembalikan (latencies, total detik)"""
+    latencies = []
+    started = time.perf_counter()
+    for operation in operations:
+        op_started = time.perf_counter()
+        response = operation()
+        latencies.append(time.perf_counter() - op_started)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return latencies, time.perf_counter() - started
+
+
+def deep_page_url(client, depth):
+    """URL of the page after following depth keyset cursors, or of the last page
+    when the table has fewer pages (next_cursor is None there)"""
+    url = '/tasks?limit=100'
+    for _ in range(depth):
+        cursor = client.get(url).get_json()['next_cursor']
+        if cursor is None:
+            break
+        url = f'/tasks?limit=100&cursor={cursor}'
+    return url
+
+
+def run_size(size, ops, seed):
+    db = app.DatabaseManager(os.path.join(WORKDIR, f'tasks-{size}.db'))
+    seed_seconds = seed_database(db, size, seed)
+    app.db_manager = db
+    client = app.app.test_client()
+    rng = random.Random(seed)
+
+    deep_page = deep_page_url(client, 20)
+    etag = client.get('/tasks?limit=100').headers['ETag']
+    created = []
+
+    def create(i):
+        response = client.post('/tasks', json={'title': f'bench task {i}', 'description': 'benchmark',
+                                               'complexity': 'medium'})
+        created.append(response.get_json()['id'])
+        return response
+
+    cases = [
+        ('list_first_page', [lambda: client.get('/tasks?limit=100')] * ops),
+        ('list_filtered', [lambda: client.get('/tasks?status=completed&complexity=high&limit=100')] * ops),
+        ('list_deep_page', [lambda: client.get(deep_page)] * ops),
+        ('list_not_modified', [lambda: client.get('/tasks?limit=100', headers={'If-None-Match': etag})] * ops),
+        ('list_gzip', [lambda: client.get('/tasks?limit=100', headers={'Accept-Encoding': 'gzip'})] * ops),
+        ('create', [lambda i=i: create(i) for i in range(ops)]),
+        ('update', [lambda task_id=rng.randint(1, size): client.patch(
+            f'/tasks/{task_id}', json={'status': 'completed', 'actual_time': 42}) for _ in range(ops)]),
+        ('delete', [lambda i=i: client.delete(f'/tasks/{created[i]}') for i in range(ops)]),
+    ]
+
+    results = []
+    for case, operations in cases:
+        # Warm-up: statement cache dan halaman database
+        if case not in ('create', 'delete'):
+            for operation in operations[:min(50, ops)]:
+                operation()
+        latencies, elapsed = timed(operations)
+        result = dict({'name': f'crud/{size}/{case}', 'size': size, 'case': case,
+                       'ops_per_s': round(len(latencies) / elapsed, 1)}, **latency_summary(latencies))
+        results.append(result)
+        print(f"size={size:>8d} {case:>18s}  {result['ops_per_s']:>8.1f} ops/s  "
+              f"p50={result['p50_ms']:>7.3f}ms  p99={result['p99_ms']:>7.3f}ms")
+
+    db.pool.close()
+    os.remove(db.db_path)
+    return seed_seconds, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--ops', type=int, default=1000, help='operations per case')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    # Tanpa AI service: task baru tidak diantrekan untuk estimasi
+    app.estimation_worker.submit = lambda task: True
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        seed_seconds, size_results = run_size(size, args.ops, args.seed)
+        print(f"size={size:>8d} seeded in {seed_seconds:.1f}s")
+        results.append({'name': f'crud/{size}/seed', 'size': size, 'case': 'seed',
+                        'ops_per_s': round(size / seed_seconds, 1)})
+        results.extend(size_results)
+
+    if args.output:
+        write_results(args.output, 'crud', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
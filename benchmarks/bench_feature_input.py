@@ -0,0 +1,133 @@
+# bench_feature_input.py
+"""Per-prediction latency and allocations of the model input path.
+
+``legacy`` rebuilds the old path: a fresh zero-padded [1, 256] array per
+task (stacked for batches), the ``np.pad`` shape check and ``set_tensor``.
+``in_place`` is the current ``predict_with_model``, which writes features
+straight into the interpreter's input tensor. ``in_place_hashed`` uses the
+``hashed-ngram-v2`` schema on the same model, which costs more per task.
+
+Allocations are the peak bytes traced by tracemalloc during one call,
+above what was live before it.
+
+    python benchmarks/bench_feature_input.py
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ai_service'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from stub_model import write_stub_model  # noqa: E402
+import ai_service  # noqa: E402
+
+TITLES = ['code review', 'daily meeting', 'implement login page', 'debug flaky test',
+          'write documentation', 'research caching options', 'deploy release 1.2']
+
+
+def make_items(count):
+    return [{'title': TITLES[i % len(TITLES)],
+             'description': f'task number {i} ' + 'with some details ' * (i % 5),
+             'complexity': ('low', 'medium', 'high')[i % 3]} for i in range(count)]
+
+
+def legacy_features(predictor, item, keywords):
+    """preprocess_input() sebelum FeatureExtractor: array padded baru per task"""
+    main_features = np.array([
+        len(item['title']) / 100.0,
+        len(item['description']) / 500.0,
+        predictor.complexity_map.get(item['complexity'].lower(), 1) / 2.0,
+        len(keywords) / 10.0
+    ], dtype=np.float32)
+    padded_features = np.zeros(predictor.expected_input_size, dtype=np.float32)
+    padded_features[:len(main_features)] = main_features
+    return padded_features.reshape(1, -1)
+
+
+def legacy_predict(predictor, items, keywords):
+    features = np.concatenate([legacy_features(predictor, item, k) for item, k in zip(items, keywords)])
+    if features.shape[1] != predictor.expected_input_size:
+        features = np.pad(features, ((0, 0), (0, predictor.expected_input_size - features.shape[1])))
+    output_data = predictor.run_interpreter(features)
+    return [(int(row[0] * 240), 0.85) for row in output_data]
+
+
+def in_place_predict(predictor, items, keywords):
+    return predictor.predict_with_model(items, keywords)
+
+
+def measure(func, predictor, items, keywords, repeat):
+    # Warm-up: resize tensor ke ukuran batch ini
+    for _ in range(3):
+        func(predictor, items, keywords)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(predictor, items, keywords)
+    latency_us = (time.perf_counter() - start) / repeat * 1e6
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func(predictor, items, keywords)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return latency_us, peak - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-sizes', default='1,8,32,256')
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--input-size', type=int, default=256)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, 'stub.tflite')
+        write_stub_model(model_path, args.input_size)
+        predictor = ai_service.TaskPredictor(model_path, pool_mode='thread', pool_size=1)
+        hashed = ai_service.FeatureExtractor(predictor.expected_input_size, predictor.complexity_map,
+                                             'hashed-ngram-v2')
+        dense = predictor.feature_extractor
+
+        results = []
+        for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+            items = make_items(batch_size)
+            keywords = [predictor.match_keywords(item['title'], item['description']) for item in items]
+            repeat = max(20, args.repeat // batch_size)
+
+            for case, func, extractor in (('legacy', legacy_predict, dense),
+                                          ('in_place', in_place_predict, dense),
+                                          ('in_place_hashed', in_place_predict, hashed)):
+                predictor.active.feature_extractor = extractor
+                latency_us, alloc_bytes = measure(func, predictor, items, keywords, repeat)
+                result = {
+                    'case': case,
+                    'batch_size': batch_size,
+                    'us_per_prediction': round(latency_us / batch_size, 2),
+                    'alloc_bytes_per_prediction': round(alloc_bytes / batch_size),
+                }
+                results.append(result)
+                print(f"batch={batch_size:>4d} {case:>16s}  {result['us_per_prediction']:>8.2f}us/pred  "
+                      f"{result['alloc_bytes_per_prediction']:>7d} B/pred")
+            predictor.active.feature_extractor = dense
+
+        predictor.interpreter_pool.close()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
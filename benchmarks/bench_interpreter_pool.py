@@ -0,0 +1,89 @@
+# bench_interpreter_pool.py
+"""Compare TaskPredictor throughput across interpreter pool modes.
+
+Runs ``predict()`` from many client threads against a stub model for:
+a single interpreter (the old behaviour), the thread pool and the
+process pool.
+
+    python benchmarks/bench_interpreter_pool.py --clients 32 --requests 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ai_service'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from stub_model import write_stub_model  # noqa: E402
+import ai_service  # noqa: E402
+
+TITLES = ['code review', 'daily meeting', 'implement login page', 'debug flaky test',
+          'write documentation', 'research caching options', 'deploy release 1.2']
+
+
+def run_case(name, predictor, clients, total_requests):
+    def one(i):
+        start = time.perf_counter()
+        predictor.predict(TITLES[i % len(TITLES)], f'task number {i}', 'medium')
+        return time.perf_counter() - start
+
+    # Warm-up: alokasi tensor di setiap interpreter
+    with ThreadPoolExecutor(clients) as executor:
+        list(executor.map(one, range(clients * 2)))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        latencies = np.array(list(executor.map(one, range(total_requests))))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'case': name,
+        'requests': total_requests,
+        'clients': clients,
+        'throughput_rps': round(total_requests / elapsed, 1),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--pool-size', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--num-threads', type=int, default=1)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    model_path = write_stub_model(os.path.join(tempfile.mkdtemp(), 'stub.tflite'))
+    cases = [
+        ('single-interpreter', 'thread', 1),
+        ('thread-pool', 'thread', args.pool_size),
+        ('process-pool', 'process', args.pool_size),
+    ]
+
+    results = []
+    for name, mode, size in cases:
+        predictor = ai_service.TaskPredictor(model_path, pool_mode=mode, pool_size=size,
+                                             num_threads=args.num_threads)
+        result = run_case(name, predictor, args.clients, args.requests)
+        result.update(pool_size=size, num_threads=args.num_threads)
+        predictor.interpreter_pool.close()
+        results.append(result)
+        print(f"{name:20s} pool={size:<3d} {result['throughput_rps']:>10.1f} req/s  "
+              f"p50={result['p50_ms']:.3f}ms  p99={result['p99_ms']:.3f}ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# bench_keyword_matcher.py
+"""Keyword matching latency as the vocabulary grows.
+
+Compares the compiled KeywordMatcher against the old per-keyword
+``keyword in text`` scan for vocabularies of 10 to 10k terms.
+
+    python benchmarks/bench_keyword_matcher.py
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ai_service'))
+
+from ai_service import KeywordMatcher  # noqa: E402
+
+BASE_KEYWORDS = {
+    'review': 30, 'code': 60, 'debug': 45, 'test': 40,
+    'document': 90, 'meeting': 60, 'research': 120,
+    'implement': 180, 'design': 150, 'deploy': 90
+}
+
+
+def make_vocabulary(size, rng):
+    vocabulary = dict(BASE_KEYWORDS)
+    while len(vocabulary) < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        vocabulary[word] = rng.randint(15, 240)
+    return dict(list(vocabulary.items())[:size])
+
+
+def make_texts(count, rng):
+    words = list(BASE_KEYWORDS) + ['the', 'api', 'for', 'user', 'login', 'page', 'fix', 'update']
+    texts = []
+    for _ in range(count):
+        title = ' '.join(rng.choice(words) for _ in range(rng.randint(2, 8)))
+        description = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 60)))
+        texts.append(f"{title} {description}")
+    return texts
+
+
+def naive_match(weights, text):
+    text = text.lower()
+    return {keyword: weight for keyword, weight in weights.items() if keyword in text}
+
+
+def time_per_call(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000,10000')
+    parser.add_argument('--texts', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = make_texts(args.texts, rng)
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        vocabulary = make_vocabulary(size, rng)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(vocabulary)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # Hasil harus identik dengan scan lama
+        for text in texts[:20]:
+            assert matcher.match(text) == naive_match(matcher.weights, text)
+
+        result = {
+            'vocabulary_size': size,
+            'compile_ms': round(compile_ms, 2),
+            'matcher_us': round(time_per_call(matcher.match, texts, args.repeat), 2),
+            'naive_us': round(time_per_call(lambda t: naive_match(matcher.weights, t), texts, args.repeat), 2),
+        }
+        results.append(result)
+        print(f"{size:>6d} keywords  compiled={result['matcher_us']:>8.2f}us  "
+              f"naive={result['naive_us']:>9.2f}us  (compile {result['compile_ms']:.1f}ms)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# bench_predict.py
+"""Prediction latency of the model and fallback paths across batch sizes.
+
+``TaskPredictor.predict_many()`` is called with the prediction cache
+disabled, so every call runs the full path (keyword matching, features,
+invoke or rules, calibration). ``model`` uses a stub TFLite model written
+by stub_model.py; ``fallback`` uses a predictor without a model file, which
+is what the service does when the model is missing. No download needed.
+
+    python benchmarks/bench_predict.py --batch-sizes 1,8,32,256 --output predict.json
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'ai_service'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# ai_service.py memuat model dan registry dari direktori kerja saat di-import
+WORKDIR = tempfile.mkdtemp(prefix='bench-predict-')
+os.chdir(WORKDIR)
+os.environ.setdefault('ONLINE_LEARNING', '0')
+os.environ.setdefault('PREDICTION_CACHE_SIZE', '0')
+logging.disable(logging.WARNING)
+
+from bench_utils import latency_summary, synthetic_items, write_results  # noqa: E402
+from stub_model import write_stub_model  # noqa: E402
+import ai_service  # noqa: E402
+
+
+def measure(predictor, items, repeat):
+    for _ in range(3):
+        predictor.predict_many(items)
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        predictor.predict_many(items)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-sizes', default='1,2,4,8,16,32,64,128,256')
+    parser.add_argument('--repeat', type=int, default=200, help='calls per batch size')
+    parser.add_argument('--input-size', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    model_path = os.path.join(WORKDIR, 'stub.tflite')
+    write_stub_model(model_path, args.input_size)
+    predictors = {
+        'model': ai_service.TaskPredictor(model_path, pool_mode='thread', pool_size=1),
+        'fallback': ai_service.TaskPredictor(os.path.join(WORKDIR, 'missing.tflite'), pool_mode='thread'),
+    }
+    for predictor in predictors.values():
+        predictor.cache = None
+
+    results = []
+    for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+        items = synthetic_items(batch_size, args.seed)
+        for path, predictor in predictors.items():
+            latencies = measure(predictor, items, args.repeat)
+            result = dict({'name': f'predict/{path}/{batch_size}', 'path': path, 'batch_size': batch_size,
+                           'ops_per_s': round(len(latencies) * batch_size / sum(latencies), 1)},
+                          **latency_summary(latencies))
+            results.append(result)
+            print(f"batch={batch_size:>4d} {path:>8s}  p50={result['p50_ms']:>8.3f}ms  "
+                  f"p99={result['p99_ms']:>8.3f}ms  {result['ops_per_s']:>10.1f} predictions/s")
+
+    predictors['model'].interpreter_pool.close()
+    if args.output:
+        write_results(args.output, 'predict', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
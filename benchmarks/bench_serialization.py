@@ -0,0 +1,153 @@
+# bench_serialization.py
+"""Task row serialization: legacy dict + stdlib json vs the shared layer.
+
+``legacy`` is what the routes used to do: fetch tuples, build a dict per
+row (twice for GET /tasks), then encode with the stdlib encoder behind
+jsonify(). ``shared`` is serialization.py: SQLite builds each row's JSON
+with json_object() and Python only joins the texts; other payloads go
+through orjson when it is installed.
+
+* ``page``: one GET /tasks body of ``--page-size`` rows (no response cache)
+* ``export``: the whole table as NDJSON, as /tasks/export streams it
+* ``emit``: encoding a tasks_batch payload of ``--page-size`` task dicts
+
+    python benchmarks/bench_serialization.py --sizes 10000,100000 --output serialization.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# app.py membuka tasks.db di direktori kerja saat di-import; jangan sentuh database asli
+WORKDIR = tempfile.mkdtemp(prefix='bench-serialization-')
+os.chdir(WORKDIR)
+logging.disable(logging.WARNING)
+
+from bench_utils import latency_summary, synthetic_tasks, write_results  # noqa: E402
+import app  # noqa: E402
+import serialization  # noqa: E402
+
+SELECT_PAGE_SQL = f'''
+    SELECT {", ".join(app.TASK_COLUMNS)} FROM tasks
+    ORDER BY created_at DESC, id DESC LIMIT ?
+'''
+
+
+def legacy_page(db, limit):
+    rows = db.run(lambda conn: conn.cursor().execute(SELECT_PAGE_SQL, (limit + 1,)).fetchall())
+    rows = rows[:limit]
+    tasks = []
+    for row in rows:
+        record = dict(zip(app.TASK_COLUMNS, row))
+        tasks.append({f: record[f] for f in app.TASK_COLUMNS})
+    return json.dumps({'tasks': tasks, 'next_cursor': None, 'version': 0}).encode('utf-8')
+
+
+def shared_page(db, limit):
+    query = {'limit': limit, 'after': None, 'status': None, 'complexity': None, 'fields': app.TASK_COLUMNS,
+             'include_archived': False}
+    return app.build_task_page(query)[1]
+
+
+def legacy_export(db):
+    size = 0
+    with db.get_connection() as conn:
+        cursor = conn.cursor().execute(f'SELECT {", ".join(app.TASK_COLUMNS)} FROM tasks ORDER BY id')
+        while True:
+            chunk = ''.join(json.dumps(dict(zip(app.TASK_COLUMNS, row))) + '\n'
+                            for row in itertools.islice(cursor, app.EXPORT_ROWS_PER_CHUNK))
+            if not chunk:
+                return size
+            size += len(chunk)
+
+
+def shared_export(db):
+    size = 0
+    with db.get_connection() as conn:
+        cursor = conn.cursor().execute(
+            f'SELECT {serialization.json_object_sql(app.TASK_COLUMNS)} FROM tasks ORDER BY id')
+        while True:
+            lines = [row[0] for row in itertools.islice(cursor, app.EXPORT_ROWS_PER_CHUNK)]
+            if not lines:
+                return size
+            size += len('\n'.join(lines)) + 1
+
+
+def measure(func, repeat):
+    func()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_size(size, page_size, repeat, seed):
+    db = app.DatabaseManager(os.path.join(WORKDIR, f'tasks-{size}.db'))
+    rows = synthetic_tasks(size, seed)
+    while True:
+        chunk = list(itertools.islice(rows, 10000))
+        if not chunk:
+            break
+        db.run(lambda conn: conn.cursor().executemany('''
+            INSERT INTO tasks (title, description, status, estimated_time, actual_time, complexity)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', chunk), write=True)
+    app.db_manager = db
+
+    batch = db.run(lambda conn: conn.cursor().execute(SELECT_PAGE_SQL, (page_size,)).fetchall())
+    payload = {'updated': [dict(zip(app.TASK_COLUMNS, row)) for row in batch]}
+    export_repeat = max(3, repeat * 1000 // size)
+    cases = [
+        ('page', page_size, 'legacy', lambda: legacy_page(db, page_size), repeat),
+        ('page', page_size, 'shared', lambda: shared_page(db, page_size), repeat),
+        ('export', size, 'legacy', lambda: legacy_export(db), export_repeat),
+        ('export', size, 'shared', lambda: shared_export(db), export_repeat),
+        ('emit', page_size, 'legacy', lambda: json.dumps(payload, separators=(',', ':')), repeat),
+        ('emit', page_size, 'shared', lambda: serialization.SocketIOJSON.dumps(payload), repeat),
+    ]
+
+    results = []
+    for case, rows_per_call, impl, func, case_repeat in cases:
+        latencies = measure(func, case_repeat)
+        result = dict({'name': f'serialization/{size}/{case}/{impl}', 'size': size, 'case': case,
+                       'impl': impl, 'ops_per_s': round(rows_per_call * len(latencies) / sum(latencies), 1)},
+                      **latency_summary(latencies))
+        results.append(result)
+        print(f"size={size:>8d} {case:>7s} {impl:>7s}  {result['ops_per_s']:>12.1f} rows/s  "
+              f"p50={result['p50_ms']:>9.3f}ms  p99={result['p99_ms']:>9.3f}ms")
+
+    db.pool.close()
+    os.remove(db.db_path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--page-size', type=int, default=app.MAX_PAGE_SIZE)
+    parser.add_argument('--repeat', type=int, default=100, help='calls per page/emit case')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if serialization.orjson is not None else 'json (stdlib)'}")
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        results.extend(run_size(size, args.page_size, args.repeat, args.seed))
+
+    if args.output:
+        write_results(args.output, 'serialization', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# bench_socketio_fanout.py
+"""Socket.IO fan-out: delivery latency of task events to N subscribers.
+
+Starts the backend (dev server or gunicorn + gevent, as in loadtest.py),
+connects ``--subscribers`` python-socketio clients that join the ``tasks``
+room, then creates ``--events`` tasks over HTTP at ``--rate`` per second.
+For every (subscriber, task) pair the latency is measured from just before
+the POST to the arrival of the ``tasks_batch`` frame that contains the task,
+so it includes the broadcast window (BROADCAST_WINDOW, default 50 ms).
+
+Clients use WebSocket when the websocket-client package is installed,
+long-polling otherwise; the transport is recorded in the results.
+
+    python benchmarks/bench_socketio_fanout.py --subscribers 50 --events 200 --mode gevent
+"""
+import argparse
+import http.client
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import socketio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_utils import latency_summary, write_results  # noqa: E402
+from loadtest import request, start_server, stop_server  # noqa: E402
+
+DEFAULT_PORT = 5102
+
+
+def connect_subscribers(count, url):
+    """Client yang sudah join room tasks; received[i] = {judul task: waktu tiba}"""
+    clients = []
+    received = []
+    for index in range(count):
+        client = socketio.Client(reconnection=False)
+        arrivals = {}
+        joined = threading.Event()
+
+        def on_batch(payload, arrivals=arrivals):
+            now = time.perf_counter()
+            for task in payload.get('created', []):
+                arrivals.setdefault(task['title'], now)
+
+        client.on('tasks_batch', on_batch)
+        client.on('joined_tasks', lambda data, joined=joined: joined.set())
+        client.connect(url, wait_timeout=10)
+        client.emit('join_tasks')
+        if not joined.wait(10):
+            raise RuntimeError(f'Subscriber {index} did not join the tasks room')
+        clients.append(client)
+        received.append(arrivals)
+    return clients, received
+
+
+def publish(port, events, rate):
+    """POST task sebanyak events dengan laju rate/detik; return {judul: waktu kirim}"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    sent = {}
+    interval = 1.0 / rate
+    next_at = time.perf_counter()
+    for i in range(events):
+        title = f'fanout task {i}'
+        sent[title] = time.perf_counter()
+        status, _ = request(conn, 'POST', '/tasks', {'title': title, 'description': 'fan-out benchmark'})
+        if status != 201:
+            raise RuntimeError(f'POST /tasks returned {status}')
+        next_at += interval
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+    conn.close()
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=50)
+    parser.add_argument('--events', type=int, default=200, help='tasks created during the run')
+    parser.add_argument('--rate', type=float, default=50.0, help='tasks created per second')
+    parser.add_argument('--mode', choices=['dev', 'gevent'], default='gevent')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-fanout-')
+    process, log = start_server('backend', args.mode, workdir, args.port)
+    clients = []
+    try:
+        clients, received = connect_subscribers(args.subscribers, f'http://127.0.0.1:{args.port}')
+        transport = clients[0].transport()
+        sent = publish(args.port, args.events, args.rate)
+        # Tunggu frame terakhir (jendela broadcast + pengiriman ke semua client)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and any(len(arrivals) < len(sent) for arrivals in received):
+            time.sleep(0.05)
+    finally:
+        for client in clients:
+            client.disconnect()
+        stop_server(process, log)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = [arrivals[title] - sent_at for arrivals in received
+                 for title, sent_at in sent.items() if title in arrivals]
+    expected = len(sent) * len(received)
+    result = dict({'name': f'fanout/{args.mode}/{args.subscribers}', 'mode': args.mode,
+                   'subscribers': args.subscribers, 'events': len(sent), 'transport': transport,
+                   'delivered_ratio': round(len(latencies) / expected, 4) if expected else 0.0,
+                   'deliveries_per_s': round(len(latencies) / (len(sent) / args.rate), 1)},
+                  **latency_summary(latencies))
+    print(f"{args.mode:>7s} subscribers={args.subscribers} transport={transport}  "
+          f"delivered={result['delivered_ratio']:.2%}  p50={result.get('p50_ms', 0):.1f}ms  "
+          f"p99={result.get('p99_ms', 0):.1f}ms")
+
+    if args.output:
+        write_results(args.output, 'fanout', vars(args), [result])
+
+
+if __name__ == '__main__':
+    main()
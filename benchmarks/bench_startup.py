@@ -0,0 +1,110 @@
+# bench_startup.py
+"""AI service cold start: time to first response, time to ready, RSS per worker.
+
+Each run starts ai_service in a scratch directory with the stub model
+(dev server or gunicorn + gevent, as in loadtest.py) and polls it every
+10 ms. Measured from the moment the process is spawned:
+
+* ``health``: first ``200`` from ``/health`` (the service answers; /predict uses the fallback)
+* ``ready``: first ``200`` from ``/ready`` (model loaded and warmed up)
+
+The worker's own view comes from the ``startup`` block of ``/ready``:
+milliseconds from import to each phase and RSS split into private
+(``rss_anon_mb``) and file-backed pages (``rss_file_mb``, which includes the
+memory-mapped model shared between workers).
+
+    python benchmarks/bench_startup.py --modes dev,gevent --runs 5
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_utils import latency_summary, write_results  # noqa: E402
+from loadtest import SERVICES, request, server_command, stop_server  # noqa: E402
+from stub_model import write_stub_model  # noqa: E402
+
+DEFAULT_PORT = 5103
+
+
+def poll(port, path):
+    try:
+        status, body = request(http.client.HTTPConnection('127.0.0.1', port, timeout=2), 'GET', path)
+        return status, body
+    except OSError:
+        return None, None
+
+
+def cold_start(mode, port, input_size):
+    """Satu cold start; return (health detik, ready detik, isi /ready)"""
+    workdir = tempfile.mkdtemp(prefix=f'bench-startup-{mode}-')
+    write_stub_model(os.path.join(workdir, 'task_predictor.tflite'), input_size)
+    env = dict(os.environ, PORT=str(port), SERVER_DEBUG='0', WEB_WORKERS='1', ONLINE_LEARNING='0',
+               ASYNC_MODE='gevent' if mode == 'gevent' else 'threading')
+    log = open(os.path.join(workdir, f'{mode}.log'), 'w')
+    started = time.perf_counter()
+    process = subprocess.Popen(server_command(SERVICES['ai'], mode, port), cwd=workdir, env=env,
+                               stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    health = ready = None
+    try:
+        deadline = time.monotonic() + 120
+        while ready is None and time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f'{mode} server exited early, see {log.name}')
+            if health is None and poll(port, '/health')[0] == 200:
+                health = time.perf_counter() - started
+            if health is not None:
+                status, body = poll(port, '/ready')
+                if status == 200:
+                    ready = time.perf_counter() - started
+                    report = json.loads(body)
+            time.sleep(0.01)
+        if ready is None:
+            raise RuntimeError(f'{mode} server did not become ready, see {log.name}')
+    finally:
+        stop_server(process, log)
+    shutil.rmtree(workdir, ignore_errors=True)
+    return health, ready, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', default='dev,gevent', help='comma separated: dev, gevent')
+    parser.add_argument('--runs', type=int, default=5, help='cold starts per mode')
+    parser.add_argument('--input-size', type=int, default=256, help='stub model input width')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes.split(','):
+        health, ready, reports = [], [], []
+        for _ in range(args.runs):
+            health_seconds, ready_seconds, report = cold_start(mode, args.port, args.input_size)
+            health.append(health_seconds)
+            ready.append(ready_seconds)
+            reports.append(report)
+        last = reports[-1]['startup']
+        for case, samples in (('health', health), ('ready', ready)):
+            result = dict({'name': f'startup/{mode}/{case}', 'mode': mode, 'case': case,
+                           'model_load_ms': reports[-1]['model_load_ms'], 'phases': last['phases'],
+                           **last['memory']}, **latency_summary(samples))
+            results.append(result)
+            print(f"{mode:>7s} {case:>7s}  p50={result['p50_ms']:>8.1f}ms  max={result['max_ms']:>8.1f}ms  "
+                  f"rss={result.get('rss_mb', result.get('max_rss_mb'))}MB "
+                  f"(anon {result.get('rss_anon_mb')}, file {result.get('rss_file_mb')})")
+
+    if args.output:
+        write_results(args.output, 'startup', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
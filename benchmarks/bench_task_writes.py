@@ -0,0 +1,156 @@
+# bench_task_writes.py
+"""Task write throughput: legacy multi-statement path vs RETURNING.
+
+The legacy path is what create/update/delete used to run: INSERT + SELECT,
+SELECT + UPDATE (plus the update_timestamp trigger's second UPDATE) + SELECT,
+and SELECT + DELETE. The new path uses the constant SQL from backend/app.py
+(one RETURNING statement per write; the update also returns the old stats
+columns through a CTE). Each write runs in its own transaction, as in the routes.
+
+    python benchmarks/bench_task_writes.py
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+# app.py membuka tasks.db di direktori kerja saat di-import; jangan sentuh database asli
+WORKDIR = tempfile.mkdtemp(prefix='bench-writes-')
+os.chdir(WORKDIR)
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+SELECT_TASK_SQL = f'SELECT {", ".join(app.TASK_COLUMNS)} FROM tasks WHERE id = ?'
+LEGACY_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS update_timestamp
+    AFTER UPDATE ON tasks
+    BEGIN
+        UPDATE tasks SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+'''
+
+
+def legacy_create(db, i):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO tasks (title, description, status, estimated_time, complexity)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (f'task {i}', 'benchmark', 'pending', None, 'medium'))
+        task_id = conn.last_insert_rowid()
+        cursor.execute(f'''
+            SELECT {", ".join(app.TASK_COLUMNS)}
+            FROM tasks WHERE id = ?
+        ''', (task_id,))
+        return cursor.fetchall()[0][0]
+
+
+def legacy_update(db, task_id, i):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT status, complexity, estimated_time, actual_time
+            FROM tasks WHERE id = ?
+        ''', (task_id,))
+        cursor.fetchall()
+        cursor.execute('''
+            UPDATE tasks
+            SET title = ?, description = ?, status = ?,
+                actual_time = ?, complexity = ?
+            WHERE id = ?
+        ''', (f'task {i}', 'benchmark', 'completed', i % 90, 'high', task_id))
+        cursor.execute(f'''
+            SELECT {", ".join(app.TASK_COLUMNS)}
+            FROM tasks WHERE id = ?
+        ''', (task_id,))
+        cursor.fetchall()
+
+
+def legacy_delete(db, task_id):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT status, complexity, estimated_time, actual_time
+            FROM tasks WHERE id = ?
+        ''', (task_id,))
+        cursor.fetchall()
+        cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+
+
+def returning_create(db, i):
+    with db.get_connection() as conn:
+        row = app.execute_one(conn.cursor(), app.INSERT_TASK_SQL,
+                              (f'task {i}', 'benchmark', 'pending', None, 'medium'))
+        return row[0]
+
+
+def returning_update(db, task_id, i, columns=tuple(app.UPDATABLE_COLUMNS)):
+    values = {'title': f'task {i}', 'description': 'benchmark', 'status': 'completed',
+              'actual_time': i % 90, 'complexity': 'high'}
+    with db.get_connection() as conn:
+        app.execute_one(conn.cursor(), app.update_task_sql(columns),
+                        (task_id, *(values[column] for column in columns)))
+
+
+def returning_patch(db, task_id, i):
+    returning_update(db, task_id, i, columns=('status', 'actual_time'))
+
+
+def returning_delete(db, task_id):
+    with db.get_connection() as conn:
+        app.execute_one(conn.cursor(), app.DELETE_TASK_SQL, (task_id,))
+
+
+def writes_per_second(func, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return len(args_list) / (time.perf_counter() - start)
+
+
+def run_variant(name, count, create, update, delete, legacy=False):
+    db = app.DatabaseManager(os.path.join(WORKDIR, f'{name}.db'), pool_size=1)
+    if legacy:
+        with db.get_connection() as conn:
+            conn.cursor().execute(LEGACY_TRIGGER_SQL)
+
+    ids = []
+    start = time.perf_counter()
+    for i in range(count):
+        ids.append(create(db, i))
+    result = {'variant': name, 'create_per_s': round(count / (time.perf_counter() - start))}
+    result['update_per_s'] = round(writes_per_second(update, [(db, task_id, i) for i, task_id in enumerate(ids)]))
+    result['delete_per_s'] = round(writes_per_second(delete, [(db, task_id) for task_id in ids]))
+    db.pool.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=5000, help='tasks written per phase')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = [
+        run_variant('legacy', args.count, legacy_create, legacy_update, legacy_delete, legacy=True),
+        run_variant('returning', args.count, returning_create, returning_update, returning_delete),
+        run_variant('returning_patch', args.count, returning_create, returning_patch, returning_delete),
+    ]
+    for result in results:
+        print(f"{result['variant']:>16s}  create={result['create_per_s']:>7d}/s  "
+              f"update={result['update_per_s']:>7d}/s  delete={result['delete_per_s']:>7d}/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
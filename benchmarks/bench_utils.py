@@ -0,0 +1,80 @@
+# bench_utils.py
+"""Helpers shared by the benchmark suite: seeded synthetic data, latency
+summaries and result files with enough metadata to compare runs.
+"""
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = ['deploy', 'review', 'login', 'api', 'database', 'migration', 'meeting', 'bug', 'fix',
+         'test', 'documentation', 'release', 'refactor', 'cache', 'search', 'dashboard', 'report',
+         'design', 'research', 'customer', 'invoice', 'staging', 'backup', 'monitoring']
+STATUSES = ['pending', 'in_progress', 'completed', 'cancelled']
+COMPLEXITIES = ['low', 'medium', 'high']
+
+
+def synthetic_tasks(count, seed=42):
+    """Rows (title, description, status, estimated_time, actual_time, complexity); same seed, same rows"""
+    rng = random.Random(seed)
+    for i in range(count):
+        status = rng.choice(STATUSES)
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 40)))
+        estimated = rng.randint(15, 480) if rng.random() < 0.9 else None
+        actual = rng.randint(10, 600) if status == 'completed' else None
+        yield (f'{title} {i}', description, status, estimated, actual, rng.choice(COMPLEXITIES))
+
+
+def synthetic_items(count, seed=42):
+    """Dict title/description/complexity, the input of TaskPredictor.predict_many()"""
+    return [{'title': title, 'description': description, 'complexity': complexity}
+            for title, description, _, _, _, complexity in synthetic_tasks(count, seed)]
+
+
+def latency_summary(samples):
+    """Percentiles (ms) of per-operation latencies given in seconds"""
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 3)
+
+    return {
+        'count': len(ordered),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50_ms': percentile(0.50),
+        'p90_ms': percentile(0.90),
+        'p99_ms': percentile(0.99),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def environment():
+    """Where and on what the results were measured"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'argv': sys.argv,
+    }
+
+
+def write_results(path, suite, params, results):
+    """JSON result file: {"suite", "environment", "params", "results": [{"name": ..., ...}]}"""
+    with open(path, 'w') as f:
+        json.dump({'suite': suite, 'environment': environment(), 'params': params, 'results': results},
+                  f, indent=2)
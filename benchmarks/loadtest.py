@@ -0,0 +1,215 @@
+# loadtest.py
+"""HTTP load test: dev server (threading) vs gunicorn + gevent workers.
+
+Each mode starts the service as a subprocess in a scratch directory (its
+own tasks.db, or a stub model for the AI service), waits for /health
+(/ready for the AI service, so the model is loaded and warmed up),
+then drives ``--concurrency`` keep-alive client threads for
+``--duration`` seconds and reports requests/s, p50/p99 latency and errors.
+The server is stopped with SIGTERM, which also exercises graceful shutdown.
+
+Scenarios:
+
+* ``backend``: 80% ``GET /tasks?limit=20``, 20% ``POST /tasks``.
+* ``ai``: ``POST /predict`` over a rotating set of task texts. With
+  ``--deadline-ms`` every request carries ``X-Deadline-Ms``; the results then
+  count which path answered (``model``, ``fallback``, ``degraded``) and how
+  many requests were shed with ``503``.
+
+    python benchmarks/loadtest.py --service backend --modes dev,gevent
+    python benchmarks/loadtest.py --service ai --concurrency 64 --output ai.json
+    python benchmarks/loadtest.py --service ai --concurrency 128 --deadline-ms 250
+
+The load generator runs on the same host, so on small machines it competes
+with the server for CPU; compare modes against each other, not absolute numbers.
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_utils import latency_summary, write_results  # noqa: E402
+from stub_model import write_stub_model  # noqa: E402
+
+SERVICES = {
+    'backend': {'dir': 'backend', 'script': 'app.py', 'app': 'app:app', 'port': 5100, 'ready': '/health'},
+    # /ready: model sudah dimuat dan warm-up, bukan lagi prediksi fallback
+    'ai': {'dir': 'ai_service', 'script': 'ai_service.py', 'app': 'ai_service:app', 'port': 5101,
+           'ready': '/ready'},
+}
+TITLES = ['code review', 'daily meeting', 'implement login page', 'debug flaky test',
+          'write documentation', 'research caching options', 'deploy release 1.2']
+
+
+def server_command(service, mode, port):
+    service_dir = os.path.join(ROOT, service['dir'])
+    if mode == 'dev':
+        return [sys.executable, os.path.join(service_dir, service['script'])]
+    if mode == 'gevent':
+        return [sys.executable, '-m', 'gunicorn', '-c', os.path.join(service_dir, 'gunicorn.conf.py'),
+                '--pythonpath', service_dir, '--bind', f'127.0.0.1:{port}', service['app']]
+    raise ValueError(f'Unknown mode {mode}')
+
+
+def start_server(name, mode, workdir, port, workers=1):
+    """Jalankan service di workdir dan tunggu sampai siap (/health atau /ready); return (process, log)"""
+    service = SERVICES[name]
+    env = dict(os.environ, PORT=str(port), SERVER_DEBUG='0', WEB_WORKERS=str(workers),
+               ONLINE_LEARNING='0', AI_SERVICE_URL='http://127.0.0.1:9')  # port discard: estimasi gagal cepat
+    env['ASYNC_MODE'] = 'gevent' if mode == 'gevent' else 'threading'
+    if name == 'ai':
+        write_stub_model(os.path.join(workdir, 'task_predictor.tflite'), 256)
+    log = open(os.path.join(workdir, f'{mode}.log'), 'w')
+    process = subprocess.Popen(server_command(service, mode, port), cwd=workdir, env=env,
+                               stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{mode} server exited early, see {log.name}')
+        try:
+            status, _ = request(http.client.HTTPConnection('127.0.0.1', port, timeout=2), 'GET', service['ready'])
+            if status == 200:
+                return process, log
+        except OSError:
+            pass
+        time.sleep(0.2)
+    stop_server(process, log)
+    raise RuntimeError(f'{mode} server did not become ready, see {log.name}')
+
+
+def stop_server(process, log):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+    log.close()
+    return process.returncode
+
+
+def request(conn, method, path, body=None, headers=None):
+    headers = dict(headers or {}, **({'Content-Type': 'application/json'} if body is not None else {}))
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def backend_request(conn, i, deadline_ms=None):
+    if i % 5 == 0:
+        return request(conn, 'POST', '/tasks', {'title': f'{TITLES[i % len(TITLES)]} {i}',
+                                                'description': 'load test', 'complexity': 'medium'})
+    return request(conn, 'GET', '/tasks?limit=20')
+
+
+def ai_request(conn, i, deadline_ms=None):
+    return request(conn, 'POST', '/predict', {'title': TITLES[i % len(TITLES)],
+                                             'description': f'task number {i % 500}',
+                                             'complexity': ('low', 'medium', 'high')[i % 3]},
+                   {'X-Deadline-Ms': str(deadline_ms)} if deadline_ms else None)
+
+
+def seed(name, port, count=200):
+    if name != 'backend':
+        return
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    for i in range(count):
+        backend_request(conn, i * 5)
+    conn.close()
+
+
+def run_load(name, port, concurrency, duration, deadline_ms=None):
+    send = backend_request if name == 'backend' else ai_request
+    stop_at = time.monotonic() + duration
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    # Jalur yang menjawab request AI service (field path) atau 'shed' untuk 503
+    paths = [{} for _ in range(concurrency)]
+
+    def client(index):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        i = index
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                status, body = send(conn, i, deadline_ms)
+                if status >= 400:
+                    errors[index] += 1
+                if name == 'ai':
+                    path = 'shed' if status == 503 else json.loads(body).get('path') if status == 200 else None
+                    paths[index][path] = paths[index].get(path, 0) + 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            latencies[index].append(time.perf_counter() - start)
+            i += concurrency
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = [latency for per_client in latencies for latency in per_client]
+    result = dict({'errors': sum(errors), 'rps': round(len(merged) / elapsed, 1)}, **latency_summary(merged))
+    if name == 'ai':
+        result['paths'] = {}
+        for per_client in paths:
+            for path, count in per_client.items():
+                result['paths'][str(path)] = result['paths'].get(str(path), 0) + count
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--service', choices=sorted(SERVICES), default='backend')
+    parser.add_argument('--modes', default='dev,gevent', help='comma separated: dev, gevent')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load per mode')
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn workers (WEB_WORKERS)')
+    parser.add_argument('--deadline-ms', type=float, help='AI service: latency budget sent as X-Deadline-Ms')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+    args.port = args.port or SERVICES[args.service]['port']
+
+    results = []
+    for mode in args.modes.split(','):
+        workdir = tempfile.mkdtemp(prefix=f'loadtest-{mode}-')
+        process, log = start_server(args.service, mode, workdir, args.port, args.workers)
+        try:
+            seed(args.service, args.port)
+            result = run_load(args.service, args.port, args.concurrency, args.duration, args.deadline_ms)
+        finally:
+            exit_code = stop_server(process, log)
+        result = dict({'name': f'load/{args.service}/{mode}', 'service': args.service, 'mode': mode,
+                       'concurrency': args.concurrency}, **result, exit_code=exit_code)
+        results.append(result)
+        print(f"{args.service:>8s} {mode:>7s}  {result.get('rps', 0):>8.1f} req/s  "
+              f"p50={result.get('p50_ms', 0):>7.2f}ms  p99={result.get('p99_ms', 0):>8.2f}ms  "
+              f"errors={result['errors']}  exit={exit_code}  {result.get('paths', '')}")
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        write_results(args.output, 'load', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
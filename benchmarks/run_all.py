@@ -0,0 +1,136 @@
+# run_all.py
+"""Run the benchmark suite and write one JSON file; optionally compare with a baseline.
+
+Suites (each also runs on its own, see its docstring):
+
+* ``crud``: bench_crud.py, task CRUD at 10k/100k/1M rows
+* ``serialization``: bench_serialization.py, task rows to JSON, legacy vs shared layer
+* ``predict``: bench_predict.py, model and fallback paths at batch 1-256
+* ``startup``: bench_startup.py, AI service time to first response and to ready, RSS
+* ``fanout``: bench_socketio_fanout.py, Socket.IO delivery to N subscribers
+* ``load``: loadtest.py, HTTP load on both services (dev server vs gevent)
+
+Everything runs offline: data is synthetic with a fixed seed and the model is
+the stub from stub_model.py. ``--quick`` shrinks every suite for a smoke run.
+
+    python benchmarks/run_all.py --output results/$(git rev-parse --short HEAD).json
+    python benchmarks/run_all.py --quick --baseline results/main.json --fail-on-regression
+
+When comparing, ``p50_ms``/``p99_ms`` are lower-is-better and ``ops_per_s``,
+``rps`` and ``deliveries_per_s`` higher-is-better; a change worse than
+``--threshold`` percent is reported as a regression. Compare results from
+the same machine only.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_utils import environment  # noqa: E402
+
+SUITES = {
+    'crud': {
+        'full': ['bench_crud.py', '--sizes', '10000,100000,1000000', '--ops', '1000'],
+        'quick': ['bench_crud.py', '--sizes', '10000', '--ops', '200'],
+    },
+    'serialization': {
+        'full': ['bench_serialization.py', '--sizes', '10000,100000'],
+        'quick': ['bench_serialization.py', '--sizes', '10000', '--repeat', '20'],
+    },
+    'predict': {
+        'full': ['bench_predict.py', '--repeat', '200'],
+        'quick': ['bench_predict.py', '--batch-sizes', '1,32,256', '--repeat', '30'],
+    },
+    'startup': {
+        'full': ['bench_startup.py', '--runs', '5'],
+        'quick': ['bench_startup.py', '--runs', '1'],
+    },
+    'fanout': {
+        'full': ['bench_socketio_fanout.py', '--subscribers', '50', '--events', '200'],
+        'quick': ['bench_socketio_fanout.py', '--subscribers', '10', '--events', '40'],
+    },
+    'load_backend': {
+        'full': ['loadtest.py', '--service', 'backend', '--duration', '10'],
+        'quick': ['loadtest.py', '--service', 'backend', '--duration', '3'],
+    },
+    'load_ai': {
+        'full': ['loadtest.py', '--service', 'ai', '--duration', '10'],
+        'quick': ['loadtest.py', '--service', 'ai', '--duration', '3'],
+    },
+}
+LOWER_IS_BETTER = ('p50_ms', 'p99_ms')
+HIGHER_IS_BETTER = ('ops_per_s', 'rps', 'deliveries_per_s')
+
+
+def run_suite(name, profile, workdir):
+    script, *arguments = SUITES[name][profile]
+    output = os.path.join(workdir, f'{name}.json')
+    print(f"== {name}", flush=True)
+    subprocess.run([sys.executable, os.path.join(ROOT, 'benchmarks', script), *arguments, '--output', output],
+                   check=True)
+    with open(output) as f:
+        result = json.load(f)
+    return {'params': result['params'], 'results': result['results']}
+
+
+def compare(current, baseline, threshold):
+    """Cetak perubahan per metrik; return jumlah regresi melewati threshold (%)"""
+    previous = {result['name']: result for suite in baseline['suites'].values() for result in suite['results']}
+    regressions = 0
+    for suite in current['suites'].values():
+        for result in suite['results']:
+            before = previous.get(result['name'])
+            if before is None:
+                continue
+            for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                old, new = before.get(metric), result.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old * 100
+                worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+                regressions += worse
+                if worse or abs(change) > threshold:
+                    print(f"{'REGRESSION' if worse else 'improved':>10s}  {result['name']:<32s} {metric:<16s} "
+                          f"{old:>10.3f} -> {new:>10.3f}  ({change:+.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', default=','.join(SUITES), help=f'comma separated: {", ".join(SUITES)}')
+    parser.add_argument('--quick', action='store_true', help='small sizes and short runs')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='earlier run_all.py output to compare with')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 if anything regressed')
+    args = parser.parse_args()
+
+    profile = 'quick' if args.quick else 'full'
+    current = {'environment': environment(), 'profile': profile, 'suites': {}}
+    with tempfile.TemporaryDirectory(prefix='bench-run-') as workdir:
+        for name in args.suites.split(','):
+            current['suites'][name] = run_suite(name, profile, workdir)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('profile') != profile:
+            print(f"Warning: baseline profile is {baseline.get('profile')}, this run is {profile}")
+        regressions = compare(current, baseline, args.threshold)
+        print(f"{regressions} regression(s) over {args.threshold:g}%")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
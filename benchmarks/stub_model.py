@@ -0,0 +1,141 @@
+# stub_model.py
+"""Build a tiny TFLite model for offline benchmarks.
+
+The model is a single FULLY_CONNECTED layer mapping ``[batch, input_size]``
+float32 features to ``[batch, 1]``, which is the contract TaskPredictor
+expects. It is written directly with the ``flatbuffers`` builder so no
+TensorFlow install or download through load_ai.py is needed.
+
+    python benchmarks/stub_model.py ai_service/task_predictor.tflite
+"""
+import sys
+
+import flatbuffers
+import numpy as np
+
+FLOAT32 = 0                     # TensorType.FLOAT32
+FULLY_CONNECTED = 9             # BuiltinOperator.FULLY_CONNECTED
+FULLY_CONNECTED_OPTIONS = 8     # BuiltinOptions.FullyConnectedOptions
+SCHEMA_VERSION = 3
+
+
+def _int_vector(builder, values):
+    builder.StartVector(4, len(values), 4)
+    for value in reversed(values):
+        builder.PrependInt32(value)
+    return builder.EndVector()
+
+
+def _offset_vector(builder, offsets):
+    builder.StartVector(4, len(offsets), 4)
+    for offset in reversed(offsets):
+        builder.PrependUOffsetTRelative(offset)
+    return builder.EndVector()
+
+
+def _buffer(builder, data=None):
+    data_offset = None
+    if data is not None:
+        raw = data.tobytes()
+        builder.StartVector(1, len(raw), 16)
+        builder.head = builder.head - len(raw)
+        builder.Bytes[builder.head:builder.head + len(raw)] = raw
+        data_offset = builder.EndVector()
+    builder.StartObject(3)
+    if data_offset is not None:
+        builder.PrependUOffsetTRelativeSlot(0, data_offset, 0)
+    return builder.EndObject()
+
+
+def _tensor(builder, name, shape, buffer_index, shape_signature=None):
+    name_offset = builder.CreateString(name)
+    shape_offset = _int_vector(builder, shape)
+    signature_offset = _int_vector(builder, shape_signature) if shape_signature else None
+    builder.StartObject(8)
+    builder.PrependUOffsetTRelativeSlot(0, shape_offset, 0)
+    builder.PrependInt8Slot(1, FLOAT32, 0)
+    builder.PrependUint32Slot(2, buffer_index, 0)
+    builder.PrependUOffsetTRelativeSlot(3, name_offset, 0)
+    if signature_offset is not None:
+        builder.PrependUOffsetTRelativeSlot(7, signature_offset, 0)
+    return builder.EndObject()
+
+
+def build_stub_model(input_size=256, seed=0):
+    """Return the bytes of a ``[-1, input_size] -> [-1, 1]`` float32 model."""
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((1, input_size), dtype=np.float32)
+    # Only the leading engineered features carry signal, like the real input
+    weights[0, :4] = [0.15, 0.1, 0.35, 0.3]
+    weights[0, 4:] = rng.normal(0.0, 0.001, input_size - 4)
+    bias = np.array([0.1], dtype=np.float32)
+
+    builder = flatbuffers.Builder(input_size * 8 + 1024)
+
+    buffers = [_buffer(builder), _buffer(builder), _buffer(builder, weights),
+               _buffer(builder, bias), _buffer(builder)]
+    tensors = [
+        _tensor(builder, 'features', [1, input_size], 1, [-1, input_size]),
+        _tensor(builder, 'weights', [1, input_size], 2),
+        _tensor(builder, 'bias', [1], 3),
+        _tensor(builder, 'estimate', [1, 1], 4, [-1, 1]),
+    ]
+
+    builder.StartObject(4)
+    fc_options = builder.EndObject()
+
+    op_inputs = _int_vector(builder, [0, 1, 2])
+    op_outputs = _int_vector(builder, [3])
+    builder.StartObject(5)
+    builder.PrependUint32Slot(0, 0, 0)
+    builder.PrependUOffsetTRelativeSlot(1, op_inputs, 0)
+    builder.PrependUOffsetTRelativeSlot(2, op_outputs, 0)
+    builder.PrependUint8Slot(3, FULLY_CONNECTED_OPTIONS, 0)
+    builder.PrependUOffsetTRelativeSlot(4, fc_options, 0)
+    operator = builder.EndObject()
+
+    tensors_offset = _offset_vector(builder, tensors)
+    inputs_offset = _int_vector(builder, [0])
+    outputs_offset = _int_vector(builder, [3])
+    operators_offset = _offset_vector(builder, [operator])
+    subgraph_name = builder.CreateString('main')
+    builder.StartObject(5)
+    builder.PrependUOffsetTRelativeSlot(0, tensors_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(1, inputs_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(2, outputs_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(3, operators_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(4, subgraph_name, 0)
+    subgraph = builder.EndObject()
+
+    builder.StartObject(4)
+    builder.PrependInt8Slot(0, FULLY_CONNECTED, 0)
+    builder.PrependInt32Slot(2, 1, 1)
+    builder.PrependInt32Slot(3, FULLY_CONNECTED, 0)
+    operator_code = builder.EndObject()
+
+    operator_codes_offset = _offset_vector(builder, [operator_code])
+    subgraphs_offset = _offset_vector(builder, [subgraph])
+    buffers_offset = _offset_vector(builder, buffers)
+    description = builder.CreateString('TMSSimple benchmark stub model')
+    builder.StartObject(8)
+    builder.PrependUint32Slot(0, SCHEMA_VERSION, 0)
+    builder.PrependUOffsetTRelativeSlot(1, operator_codes_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(2, subgraphs_offset, 0)
+    builder.PrependUOffsetTRelativeSlot(3, description, 0)
+    builder.PrependUOffsetTRelativeSlot(4, buffers_offset, 0)
+    model = builder.EndObject()
+
+    builder.Finish(model, file_identifier=b'TFL3')
+    return bytes(builder.Output())
+
+
+def write_stub_model(path, input_size=256):
+    with open(path, 'wb') as f:
+        f.write(build_stub_model(input_size))
+    return path
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else 'task_predictor.tflite'
+    write_stub_model(target)
+    print(f"Stub model written to {target}")
@@ -0,0 +1,251 @@
+# metrics.py
+"""Metrik in-process berformat Prometheus, tanpa dependency tambahan.
+
+Counter, gauge dan histogram menyimpan satu objek seri per kombinasi
+label. Hot path memakai seri yang sudah diikat lewat labels(), sehingga
+observe() hanya bisect plus satu lock, tanpa membangun key label.
+Statistik yang sudah dihitung komponen lain (get_stats()) diekspor lewat
+callback saat /metrics di-scrape, bukan dihitung ulang.
+
+Nilai bersifat per proses: dengan beberapa worker gunicorn, setiap
+scrape hanya melihat worker yang melayaninya.
+
+Dipakai backend dan AI service; keduanya menambahkan direktori common/
+ke sys.path sebelum meng-import modul ini (begitu juga serving.py).
+"""
+import bisect
+import math
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Detik; dari query SQLite/invoke yang cepat sampai panggilan HTTP yang timeout
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Series:
+    """Nilai satu kombinasi label; didapat sekali lewat Metric.labels() untuk dipakai di hot path"""
+
+    __slots__ = ('lock', 'value')
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.value = 0
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+
+class HistogramSeries:
+    __slots__ = ('lock', 'buckets', 'counts', 'total')
+
+    def __init__(self, lock, buckets):
+        self.lock = lock
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        # bisect_left: nilai yang sama dengan batas masuk ke bucket itu (le = "<=")
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+
+    def time(self):
+        """Context manager: catat durasi block with (detik), juga jika block melempar exception"""
+        return Timer(self)
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.total
+
+
+class Timer:
+    # Kelas kecil, bukan @contextmanager: generator menambah beberapa mikrodetik per block
+    __slots__ = ('series', 'started')
+
+    def __init__(self, series):
+        self.series = series
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.series.observe(time.perf_counter() - self.started)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def _new_series(self):
+        return Series(self.lock)
+
+    def labels(self, **labels):
+        """Seri untuk kombinasi label ini (KeyError jika ada label yang tidak diisi)"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self.series.get(key)
+        if series is None:
+            with self.lock:
+                series = self.series.setdefault(key, self._new_series())
+        return series
+
+    def samples(self):
+        """(nama, [(label, nilai)], nilai) untuk setiap seri"""
+        for key, series in list(self.series.items()):
+            yield self.name, list(zip(self.labelnames, key)), series.snapshot()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for name, labels, value in self.samples():
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self.labels(**labels).inc(amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        self.labels(**labels).set(value)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return HistogramSeries(self.lock, self.buckets)
+
+    def observe(self, value, **labels):
+        self.labels(**labels).observe(value)
+
+    def time(self, **labels):
+        return self.labels(**labels).time()
+
+    def samples(self):
+        for key, series in list(self.series.items()):
+            counts, total = series.snapshot()
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', labels + [('le', _format_value(float(bound)))], cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class CallbackMetric(Metric):
+    """Nilai dibaca dari func() saat render: dict {nilai label (tuple): nilai}"""
+
+    def __init__(self, name, documentation, kind, func, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.func = func
+
+    def samples(self):
+        for key, value in self.func().items():
+            if value is None:
+                continue
+            key = key if isinstance(key, tuple) else (key,)
+            yield self.name, list(zip(self.labelnames, key)), value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, kind, func, labelnames=()):
+        return self._add(CallbackMetric(name, documentation, kind, func, labelnames))
+
+    def render(self):
+        """Semua metrik dalam text exposition format Prometheus 0.0.4"""
+        blocks = []
+        for metric in self.metrics:
+            try:
+                blocks.append(metric.render())
+            except Exception as e:
+                # Satu callback yang rusak tidak boleh menggagalkan seluruh scrape
+                blocks.append(f'# {metric.name} unavailable: {_escape(e)}')
+        return '\n'.join(blocks) + '\n'
+
+
+def sample_stacks(seconds, interval):
+    """Profiler sampling: ambil stack semua thread lain setiap interval detik selama seconds.
+
+    Hasilnya format collapsed stack ("fungsi;fungsi;fungsi jumlah" per baris),
+    bisa langsung dibuka di speedscope atau flamegraph.pl. Di mode gevent
+    hanya thread OS yang terlihat (threadpool: SQLite/invoke), bukan greenlet.
+    """
+    own_thread = threading.get_ident()
+    stacks = StackCounter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+                frame = frame.f_back
+            stacks[';'.join(reversed(names))] += 1
+        time.sleep(interval)
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
@@ -0,0 +1,58 @@
+# serving.py
+"""Helper serving yang dipakai bersama backend dan AI service.
+
+BlockingRunner memindah kerja yang tidak bisa di-monkey patch (query
+SQLite, invoke() TFLite) ke threadpool hub gevent. admin_required menjaga
+endpoint admin (profiler, reload dan rollback model) dengan header
+X-Admin-Token.
+"""
+import hmac
+import os
+from functools import wraps
+
+from flask import jsonify, request
+
+# Token endpoint admin; tanpa ADMIN_TOKEN semua endpoint admin ditolak
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+
+class BlockingRunner:
+    """Jalankan func(*args) dan kembalikan hasilnya.
+
+    Di mode gevent func dipindah ke threadpool hub, sehingga kerja yang
+    melepas GIL (query SQLite, invoke() TFLite) tidak menghentikan greenlet
+    lain. Threadpool dinaikkan ke ``pool_size`` thread saat pertama dipakai.
+    Di mode threading func langsung dipanggil.
+    """
+
+    def __init__(self, async_mode, pool_size):
+        self.async_mode = async_mode
+        self.pool_size = pool_size
+
+    def __call__(self, func, *args):
+        if self.async_mode == 'gevent':
+            return self.threadpool().apply(func, args)
+        return func(*args)
+
+    def threadpool(self):
+        import gevent
+        threadpool = gevent.get_hub().threadpool
+        if threadpool.maxsize < self.pool_size:
+            threadpool.maxsize = self.pool_size
+        return threadpool
+
+
+def admin_required(view):
+    """Tolak request (403) tanpa header X-Admin-Token yang cocok dengan ADMIN_TOKEN.
+
+    Jika ADMIN_TOKEN tidak diisi, endpoint admin selalu ditolak: lupa
+    mengisi token tidak boleh membuka profiler atau reload model untuk
+    siapa pun.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = request.headers.get('X-Admin-Token', '')
+        if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            return jsonify({'error': 'Admin token required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
@@ -1,5 +1,5 @@
 // Updated App.js
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef, useCallback } from 'react';
 import io from 'socket.io-client';
 import axios from 'axios';
 import TaskList from './components/TaskList';
@@ -7,13 +7,112 @@ import TaskForm from './components/TaskForm';
 import Dashboard from './components/Dashboard';
 import './App.css';
 
+const PAGE_SIZE = 100;
+
+// Same order as GET /tasks: newest first, ties broken by id
+const compareTasks = (a, b) => {
+  if (a.created_at !== b.created_at) return a.created_at < b.created_at ? 1 : -1;
+  return b.id - a.id;
+};
+
+const matchesFilters = (task, filters) =>
+  (!filters.status || task.status === filters.status) &&
+  (!filters.complexity || task.complexity === filters.complexity);
+
+// Apply changed and deleted tasks to the pages loaded so far for the current filters
+const mergeTasks = (prev, changed, deletedIds, filters, hasMore) => {
+  const changedById = new Map(changed.map(task => [task.id, task]));
+  // Tasks past the last loaded one arrive with the next page instead
+  const boundary = hasMore ? prev[prev.length - 1] : null;
+  const kept = [];
+  prev.forEach(task => {
+    if (deletedIds.has(task.id)) return;
+    const next = changedById.get(task.id);
+    changedById.delete(task.id);
+    if (!next) {
+      kept.push(task);
+    } else if (matchesFilters(next, filters)) {
+      kept.push(next);
+    }
+  });
+  const added = [...changedById.values()].filter(task =>
+    !deletedIds.has(task.id) && matchesFilters(task, filters) &&
+    (!boundary || compareTasks(task, boundary) < 0)
+  );
+  return added.length ? [...kept, ...added].sort(compareTasks) : kept;
+};
+
 function App() {
   const [tasks, setTasks] = useState([]);
+  const [filters, setFilters] = useState({ status: '', complexity: '' });
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [statsCounters, setStatsCounters] = useState(null);
   const [isConnected, setIsConnected] = useState(false);
   const [activeTab, setActiveTab] = useState('tasks');
   const [socket, setSocket] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  // Change-log version the local task list is synced to (null = never fetched)
+  const syncVersion = useRef(null);
+  // Read by the socket handlers, which are registered once
+  const filtersRef = useRef(filters);
+  const hasMoreRef = useRef(false);
+
+  // Load the first page for the current filters; status/complexity are filtered server-side
+  const fetchTasks = useCallback(async () => {
+    const requestFilters = filtersRef.current;
+    try {
+      const params = { limit: PAGE_SIZE };
+      if (requestFilters.status) params.status = requestFilters.status;
+      if (requestFilters.complexity) params.complexity = requestFilters.complexity;
+      const response = await axios.get('http://localhost:5000/tasks', { params });
+      // The filters changed while this page was loading; the newer request wins
+      if (filtersRef.current !== requestFilters) return;
+      setTasks(response.data.tasks);
+      setNextCursor(response.data.next_cursor);
+      hasMoreRef.current = Boolean(response.data.next_cursor);
+      syncVersion.current = response.data.version;
+    } catch (err) {
+      setError('Failed to fetch tasks');
+      console.error('Error fetching tasks:', err);
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
+  const loadMoreTasks = async () => {
+    if (!nextCursor || loadingMore) return;
+    const requestFilters = filtersRef.current;
+    setLoadingMore(true);
+    try {
+      const params = { limit: PAGE_SIZE, cursor: nextCursor };
+      if (requestFilters.status) params.status = requestFilters.status;
+      if (requestFilters.complexity) params.complexity = requestFilters.complexity;
+      const response = await axios.get('http://localhost:5000/tasks', { params });
+      if (filtersRef.current !== requestFilters) return;
+      // A task can already be here if a live update added it while the page was loading
+      setTasks(prev => {
+        const loadedIds = new Set(prev.map(task => task.id));
+        return [...prev, ...response.data.tasks.filter(task => !loadedIds.has(task.id))];
+      });
+      setNextCursor(response.data.next_cursor);
+      hasMoreRef.current = Boolean(response.data.next_cursor);
+    } catch (err) {
+      console.error('Error loading more tasks:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleFilterChange = (changes) => {
+    const next = { ...filtersRef.current, ...changes };
+    filtersRef.current = next;
+    setFilters(next);
+    setNextCursor(null);
+    hasMoreRef.current = false;
+    fetchTasks();
+  };
 
   // Initialize socket and fetch tasks
   useEffect(() => {
@@ -23,47 +122,95 @@ function App() {
     });
     setSocket(newSocket);
 
-    // Fetch initial tasks
-    const fetchTasks = async () => {
+    // Aggregated stats are maintained server-side and patched via stats_delta
+    const fetchStats = async () => {
       try {
-        const response = await axios.get('http://localhost:5000/tasks');
-        setTasks(response.data.tasks);
+        const response = await axios.get('http://localhost:5000/tasks/stats');
+        setStatsCounters(response.data.counters);
       } catch (err) {
-        setError('Failed to fetch tasks');
-        console.error('Error fetching tasks:', err);
-      } finally {
-        setLoading(false);
+        console.error('Error fetching task stats:', err);
+      }
+    };
+
+    // Pull only the changes since the last known version (on reconnect and after imports).
+    // One sync at a time; a request made meanwhile runs once the current one finishes.
+    let syncing = false;
+    let resyncRequested = false;
+    const syncTasks = () => {
+      if (syncing) {
+        resyncRequested = true;
+        return;
       }
+      syncing = true;
+      newSocket.emit('sync', { since: syncVersion.current }, (delta) => {
+        syncing = false;
+        if (!delta || delta.error || delta.reset) {
+          // Our version was compacted away (or sync failed): fall back to a full reload
+          resyncRequested = false;
+          fetchTasks();
+          return;
+        }
+        // Archived tasks leave the active list just like deleted ones
+        const removed = [...delta.deleted, ...(delta.archived || [])];
+        if (delta.upserted.length || removed.length) {
+          setTasks(prev => mergeTasks(prev, delta.upserted, new Set(removed),
+                                      filtersRef.current, hasMoreRef.current));
+        }
+        syncVersion.current = delta.version;
+        if (delta.has_more || resyncRequested) {
+          resyncRequested = false;
+          syncTasks();
+        }
+      });
     };
 
     newSocket.on('connect', () => {
       setIsConnected(true);
-      fetchTasks();
+      newSocket.emit('join_tasks');
+      if (syncVersion.current === null) {
+        fetchTasks();
+      } else {
+        syncTasks();
+      }
+      fetchStats();
     });
 
     newSocket.on('disconnect', () => {
       setIsConnected(false);
     });
 
-    // Socket event listeners
-    newSocket.on('task_created', (newTask) => {
-      setTasks(prev => [...prev, newTask]);
-    });
+    // Server batches changes into one tasks_batch frame per broadcast window
+    newSocket.on('tasks_batch', (batch) => {
+      const { created = [], updated = [], deleted = [], archived = [], stats_delta: delta, imported } = batch;
 
-    newSocket.on('task_updated', (updatedTask) => {
-      setTasks(prev => prev.map(task => 
-        task.id === updatedTask.id ? updatedTask : task
-      ));
-    });
+      if (imported) {
+        // Bulk imports only send a count; pull the imported tasks from the change log
+        if (syncVersion.current === null) {
+          fetchTasks();
+        } else {
+          syncTasks();
+        }
+      } else if (created.length || updated.length || deleted.length || archived.length) {
+        setTasks(prev => mergeTasks(prev, [...created, ...updated], new Set([...deleted, ...archived]),
+                                    filtersRef.current, hasMoreRef.current));
+      }
 
-    newSocket.on('task_deleted', ({id}) => {
-      setTasks(prev => prev.filter(task => task.id !== id));
+      if (delta) {
+        setStatsCounters(prev => {
+          if (!prev) return prev;
+          const next = { ...prev };
+          Object.entries(delta).forEach(([key, value]) => {
+            next[key] = (next[key] || 0) + value;
+          });
+          return next;
+        });
+      }
     });
 
     return () => {
       newSocket.disconnect();
     };
-  }, []);
+  }, [fetchTasks]);
 
   // Update the socket usage in App.js
   const emitTaskUpdate = (event, data) => {
@@ -173,6 +320,12 @@ function App() {
         {activeTab === 'tasks' && (
           <TaskList 
             tasks={tasks}
+            counters={statsCounters}
+            filters={filters}
+            onFilterChange={handleFilterChange}
+            hasMore={Boolean(nextCursor)}
+            loadingMore={loadingMore}
+            onLoadMore={loadMoreTasks}
             onUpdateTask={handleUpdateTask}
             onDeleteTask={handleDeleteTask}
           />
@@ -187,7 +340,7 @@ function App() {
         )}
         
         {activeTab === 'dashboard' && (
-          <Dashboard tasks={tasks} />
+          <Dashboard tasks={tasks} counters={statsCounters} />
         )}
       </main>
     </div>
@@ -23,8 +23,36 @@ ChartJS.register(
   ArcElement
 );
 
-const Dashboard = ({ tasks = [] }) => {
+// Derive dashboard stats from the raw counters served by GET /tasks/stats
+const statsFromCounters = (counters) => {
+  const statusCounts = { pending: 0, in_progress: 0, completed: 0, cancelled: 0 };
+  const complexityCounts = { low: 0, medium: 0, high: 0 };
+
+  Object.entries(counters).forEach(([key, value]) => {
+    if (key.startsWith('status:')) {
+      statusCounts[key.slice('status:'.length)] = value;
+    } else if (key.startsWith('complexity:')) {
+      complexityCounts[key.slice('complexity:'.length)] = value;
+    }
+  });
+
+  const total = counters.total || 0;
+  return {
+    total,
+    statusCounts,
+    complexityCounts,
+    averageEstimated: counters.estimated_count > 0 ? counters.estimated_sum / counters.estimated_count : 0,
+    averageActual: counters.actual_count > 0 ? counters.actual_sum / counters.actual_count : 0,
+    completionRate: total > 0 ? (statusCounts.completed / total) * 100 : 0
+  };
+};
+
+const Dashboard = ({ tasks = [], counters = null }) => {
   const stats = useMemo(() => {
+    if (counters) {
+      return statsFromCounters(counters);
+    }
+
     const statusCounts = { pending: 0, in_progress: 0, completed: 0, cancelled: 0 };
     const complexityCounts = { low: 0, medium: 0, high: 0 };
     let totalEstimated = 0;
@@ -57,7 +85,7 @@ const Dashboard = ({ tasks = [] }) => {
       averageActual: tasksWithActual > 0 ? totalActual / tasksWithActual : 0,
       completionRate: tasks.length > 0 ? (statusCounts.completed / tasks.length) * 100 : 0
     };
-  }, [tasks]);
+  }, [tasks, counters]);
 
   const formatTime = (minutes) => {
     const hours = Math.floor(minutes / 60);
@@ -3,18 +3,37 @@ import React, { useState } from 'react';
 import TaskItem from './TaskItem';
 import './TaskList.css';
 
-const TaskList = ({ tasks = [], onUpdateTask, onDeleteTask }) => {
-  const [filter, setFilter] = useState('all');
+const STATUS_OPTIONS = [
+  ['pending', 'Pending'],
+  ['in_progress', 'In Progress'],
+  ['completed', 'Completed'],
+  ['cancelled', 'Cancelled']
+];
+
+const COMPLEXITY_OPTIONS = [
+  ['low', 'Low'],
+  ['medium', 'Medium'],
+  ['high', 'High']
+];
+
+// Filtering and paging happen server-side; this component only sorts the pages loaded so far
+const TaskList = ({
+  tasks = [],
+  counters = null,
+  filters = { status: '', complexity: '' },
+  onFilterChange,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
+  onUpdateTask,
+  onDeleteTask
+}) => {
   const [sortBy, setSortBy] = useState('created_at');
   const [sortOrder, setSortOrder] = useState('desc');
 
-  const filteredTasks = tasks.filter(task => {
-    if (!task) return false;
-    if (filter === 'all') return true;
-    return task.status === filter;
-  });
+  const loadedTasks = tasks.filter(Boolean);
 
-  const sortedTasks = [...filteredTasks].sort((a, b) => {
+  const sortedTasks = [...loadedTasks].sort((a, b) => {
     if (!a || !b) return 0;
     
     let aValue = a[sortBy];
@@ -32,27 +51,29 @@ const TaskList = ({ tasks = [], onUpdateTask, onDeleteTask }) => {
     }
   });
 
-  const statusCounts = tasks.reduce((acc, task) => {
-    if (task && task.status) {
-      acc[task.status] = (acc[task.status] || 0) + 1;
-    }
-    return acc;
-  }, {});
+  // Totals over all tasks come from the server-maintained counters, not the loaded pages
+  const count = (key) => (counters ? ` (${counters[key] || 0})` : '');
+  const filtered = Boolean(filters.status || filters.complexity);
 
   return (
     <div className="task-list">
       <div className="task-list-header">
-        <h2>Tasks ({tasks.length})</h2>
+        <h2>Tasks ({loadedTasks.length}{hasMore ? '+' : ''})</h2>
         
         <div className="task-list-controls">
           <div className="filter-controls">
             <label>Filter:</label>
-            <select value={filter} onChange={(e) => setFilter(e.target.value)}>
-              <option value="all">All ({tasks.length})</option>
-              <option value="pending">Pending ({statusCounts.pending || 0})</option>
-              <option value="in_progress">In Progress ({statusCounts.in_progress || 0})</option>
-              <option value="completed">Completed ({statusCounts.completed || 0})</option>
-              <option value="cancelled">Cancelled ({statusCounts.cancelled || 0})</option>
+            <select value={filters.status} onChange={(e) => onFilterChange({ status: e.target.value })}>
+              <option value="">All statuses{count('total')}</option>
+              {STATUS_OPTIONS.map(([value, label]) => (
+                <option key={value} value={value}>{label}{count(`status:${value}`)}</option>
+              ))}
+            </select>
+            <select value={filters.complexity} onChange={(e) => onFilterChange({ complexity: e.target.value })}>
+              <option value="">All complexities</option>
+              {COMPLEXITY_OPTIONS.map(([value, label]) => (
+                <option key={value} value={value}>{label}{count(`complexity:${value}`)}</option>
+              ))}
             </select>
           </div>
 
@@ -79,8 +100,8 @@ const TaskList = ({ tasks = [], onUpdateTask, onDeleteTask }) => {
         {sortedTasks.length === 0 ? (
           <div className="empty-state">
             <p>No tasks found</p>
-            {filter !== 'all' && (
-              <button onClick={() => setFilter('all')}>
+            {filtered && (
+              <button onClick={() => onFilterChange({ status: '', complexity: '' })}>
                 Show all tasks
               </button>
             )}
@@ -99,6 +120,13 @@ const TaskList = ({ tasks = [], onUpdateTask, onDeleteTask }) => {
             ))}
           </div>
         )}
+        {hasMore && (
+          <div className="load-more">
+            <button onClick={onLoadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,76 @@
+# conftest.py
+"""Setup bersama test backend dan AI service.
+
+app.py dan ai_service.py membuat database, predictor dan thread background
+saat di-import, jadi konfigurasinya diarahkan ke direktori sementara lewat
+environment sebelum modul itu di-import oleh test mana pun.
+
+    python -m pytest -q tests
+"""
+import logging
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix='tms-tests-')
+
+os.environ.update({
+    'DATABASE_PATH': os.path.join(WORKDIR, 'tasks.db'),
+    # Port discard: estimasi background langsung gagal tanpa menunggu timeout
+    'AI_SERVICE_URL': 'http://127.0.0.1:9',
+    'MODEL_BACKGROUND_LOAD': '0',
+    'MODEL_REGISTRY_DIR': os.path.join(WORKDIR, 'models'),
+    'ONLINE_LEARNING': '0',
+    'ONLINE_STATE_PATH': os.path.join(WORKDIR, 'online_state.npz'),
+    # Daftarkan /debug/profile di kedua service; ADMIN_TOKEN diatur per test
+    'PROFILER_ENABLED': '1',
+})
+# benchmarks/ untuk stub_model (model TFLite kecil tanpa download)
+for directory in ('common', 'backend', 'ai_service', 'benchmarks'):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+logging.disable(logging.WARNING)
+
+
+@pytest.fixture(scope='session')
+def backend():
+    """Modul app.py (satu instance per sesi test)"""
+    import app
+    return app
+
+
+@pytest.fixture
+def client(backend):
+    """Test client Flask dengan tabel tasks dan arsip yang kosong"""
+    def clear(conn):
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM tasks')
+        cursor.execute('DELETE FROM tasks_archive')
+    backend.db_manager.run(clear, write=True)
+    backend.response_cache.clear()
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def db(backend, tmp_path):
+    """DatabaseManager baru di file sendiri, untuk test yang memeriksa isi database"""
+    manager = backend.DatabaseManager(str(tmp_path / 'tasks.db'), pool_size=2)
+    yield manager
+    manager.pool.close()
+
+
+@pytest.fixture(scope='session')
+def ai():
+    """Modul ai_service.py (tanpa model terpasang: predictor memakai fallback)"""
+    import ai_service
+    return ai_service
+
+
+@pytest.fixture(scope='session')
+def stub_model_path(tmp_path_factory):
+    """Model TFLite satu layer dengan input [1, 16]"""
+    from stub_model import write_stub_model
+    return write_stub_model(str(tmp_path_factory.mktemp('model') / 'stub.tflite'), 16)
@@ -0,0 +1,92 @@
+# test_admission_control.py
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def admission(ai):
+    return ai.AdmissionController(max_inflight=2, max_queue=1)
+
+
+def test_idle_request_is_admitted(admission):
+    # Jalur model kosong: perkiraan yang melebihi deadline tetap dicoba agar terukur ulang
+    assert admission.acquire(1, time.monotonic() + 0.01, expected=1.0) == ('model', 'admitted')
+    assert admission.acquire(1) == ('model', 'admitted')
+    assert admission.get_stats()['inflight'] == 2
+
+
+@pytest.mark.parametrize('offset', [0.0, -1.0])
+def test_expired_deadline_is_degraded_not_shed(admission, offset):
+    assert admission.acquire(1, time.monotonic() + offset) == ('degraded', 'expired')
+    stats = admission.get_stats()
+    assert (stats['inflight'], stats['shed'], stats['reasons']['expired']) == (0, 0, 1)
+
+
+def test_expected_wait_beyond_deadline_is_degraded(admission):
+    admission.acquire(1)
+
+    assert admission.acquire(1, time.monotonic() + 0.01, expected=1.0) == ('degraded', 'deadline')
+    assert admission.get_stats()['inflight'] == 1
+
+
+def test_full_queue_is_shed(admission):
+    admission.acquire(2)
+    waiter = threading.Thread(target=admission.acquire, args=(1,))
+    waiter.start()
+    while not admission.get_stats()['waiting']:
+        time.sleep(0.001)
+
+    assert admission.acquire(1) == ('shed', 'queue_full')
+
+    admission.release(2)
+    waiter.join(timeout=5)
+    assert admission.get_stats()['inflight'] == 1
+
+
+def test_queued_request_degrades_when_its_deadline_passes(admission):
+    admission.acquire(2)
+
+    assert admission.acquire(1, time.monotonic() + 0.05) == ('degraded', 'deadline')
+    assert admission.get_stats()['waiting'] == 0
+
+
+@pytest.mark.parametrize('route, body', [
+    ('/predict', {'title': 'write documentation', 'deadline_ms': 0}),
+    ('/predict/batch', {'tasks': [{'title': 'write documentation'}], 'deadline_ms': 0}),
+])
+def test_zero_deadline_is_served_degraded(ai, route, body):
+    response = ai.app.test_client().post(route, json=body)
+
+    assert response.status_code == 200
+    assert response.get_json()['path'] == 'degraded'
+
+
+@pytest.fixture
+def stub_model(ai, stub_model_path, monkeypatch):
+    """Pasang model stub di predictor global (tanpa cache); return handle-nya"""
+    pool = ai.ThreadInterpreterPool(stub_model_path, size=1, num_threads=1)
+    handle = ai.ModelHandle('stub', stub_model_path, 'file', pool, ai.predictor.make_feature_extractor(16))
+    monkeypatch.setattr(ai.predictor, 'active', handle)
+    monkeypatch.setattr(ai.predictor, 'cache', None)
+    yield handle
+    pool.close()
+
+
+@pytest.mark.parametrize('route, body', [
+    ('/predict', {'title': 'write documentation'}),
+    ('/predict/batch', {'tasks': [{'title': 'write documentation'}]}),
+])
+def test_path_reports_model_or_actual_fallback(ai, stub_model, monkeypatch, route, body):
+    client = ai.app.test_client()
+    assert client.post(route, json=body).get_json()['path'] == 'model'
+
+    # Model gagal saat invoke: hasilnya dari fallback_prediction, dan response mengatakannya
+    def fail(fill, batch_size):
+        raise RuntimeError('invoke failed')
+    monkeypatch.setattr(stub_model.pool, 'run_with', fail)
+
+    response = client.post(route, json=body)
+    assert response.status_code == 200
+    assert response.get_json()['path'] == 'fallback'
@@ -0,0 +1,95 @@
+# test_broadcast_bus.py
+import pytest
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, payload, room=None):
+        self.emitted.append((event, payload, room))
+
+
+@pytest.fixture
+def bus(backend):
+    # Tanpa start(): test memanggil flush() sendiri
+    return backend.BroadcastBus(FakeSocketIO(), window=60, max_pending=100)
+
+
+def task(task_id, title='task'):
+    return {'id': task_id, 'title': title}
+
+
+def test_changes_in_one_window_are_folded_into_one_frame(bus):
+    bus.publish_task('created', task(1))
+    bus.publish_task('updated', task(1, 'renamed'))
+    bus.publish_task('updated', task(2))
+    bus.publish_task('deleted', task(2))
+    bus.publish_task('deleted', task(3))
+    bus.publish_stats({'total': 1, 'status:pending': 1})
+    bus.publish_stats({'status:pending': -1, 'status:completed': 1})
+    bus.publish_import(40)
+
+    bus.flush()
+
+    assert bus.socketio.emitted == [('tasks_batch', {
+        'created': [task(1, 'renamed')],
+        'deleted': [2, 3],
+        'stats_delta': {'total': 1, 'status:completed': 1},
+        'imported': 40,
+    }, 'tasks')]
+    assert (bus.metrics['published'], bus.metrics['folded'], bus.metrics['frames_sent']) == (8, 2, 1)
+
+
+def test_created_then_deleted_sends_nothing(bus):
+    bus.publish_task('created', task(1))
+    bus.publish_task('deleted', task(1))
+
+    bus.flush()
+
+    assert bus.socketio.emitted == []
+
+
+def test_archived_tasks_are_sent_apart_from_deleted(bus):
+    bus.publish_task('updated', task(1))
+    bus.publish_task('archived', task(1))
+    bus.publish_task('deleted', task(2))
+    bus.publish_task('created', task(3))
+    bus.publish_task('archived', task(3))
+
+    bus.flush()
+
+    assert bus.socketio.emitted == [('tasks_batch', {'archived': [1], 'deleted': [2]}, 'tasks')]
+
+
+def test_flush_without_pending_changes_is_a_no_op(bus):
+    bus.flush()
+    bus.publish_task('updated', task(1))
+    bus.flush()
+    bus.flush()
+
+    assert bus.socketio.emitted == [('tasks_batch', {'updated': [task(1)]}, 'tasks')]
+
+
+def test_full_queue_wakes_the_sender_early(bus):
+    bus.max_pending = 2
+    bus.publish_task('updated', task(1))
+    bus.wakeup.clear()
+    bus.publish_task('updated', task(2))
+
+    assert bus.wakeup.is_set()
+
+
+def test_flush_latency_is_exported_as_a_histogram(client, backend, bus):
+    def count():
+        for line in client.get('/metrics').get_data(as_text=True).splitlines():
+            if line.startswith('broadcast_flush_latency_seconds_count'):
+                return int(float(line.split()[-1]))
+        return 0
+    before = count()
+
+    bus.flush()
+    bus.publish_task('updated', task(1))
+    bus.flush()
+
+    assert count() == before + 1
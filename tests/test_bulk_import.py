@@ -0,0 +1,57 @@
+# test_bulk_import.py
+import json
+
+import pytest
+
+
+@pytest.fixture
+def submitted(backend, monkeypatch):
+    """Task yang diantrekan ke estimation_worker (tanpa benar-benar memanggil AI service)"""
+    tasks = []
+    monkeypatch.setattr(backend.estimation_worker, 'submit', lambda task: tasks.append(task) or True)
+    return tasks
+
+
+@pytest.fixture
+def sessions(backend, monkeypatch):
+    """Session AI yang dibuat selama import, untuk memeriksa bahwa semuanya ditutup"""
+    created = []
+    make_ai_session = backend.make_ai_session
+
+    def tracking_session():
+        session = make_ai_session()
+        session.closed = False
+        close = session.close
+
+        def tracked_close():
+            session.closed = True
+            close()
+        session.close = tracked_close
+        created.append(session)
+        return session
+    monkeypatch.setattr(backend, 'make_ai_session', tracking_session)
+    return created
+
+
+def import_ndjson(client, records, estimate='1'):
+    body = '\n'.join(json.dumps(record) for record in records) + '\n'
+    return client.post(f'/tasks/bulk?estimate={estimate}', data=body, content_type='application/x-ndjson')
+
+
+def test_failed_estimates_are_queued_after_commit(client, backend, submitted, sessions):
+    # AI service tidak bisa dihubungi: estimasi per chunk gagal
+    response = import_ndjson(client, [{'title': 'a'}, {'title': 'b', 'estimated_time': 30},
+                                      {'title': 'c', 'complexity': 'high'}])
+
+    assert response.get_json()['imported'] == 3
+    stored = {task['title']: task for task in client.get('/tasks').get_json()['tasks']}
+    assert [(task['id'], task['title'], task['complexity']) for task in submitted] == [
+        (stored['a']['id'], 'a', 'medium'), (stored['c']['id'], 'c', 'high')]
+    assert [session.closed for session in sessions] == [True]
+
+
+def test_no_estimates_are_queued_when_disabled(client, submitted, sessions):
+    response = import_ndjson(client, [{'title': 'a'}], estimate='0')
+
+    assert response.get_json()['imported'] == 1
+    assert (submitted, sessions) == ([], [])
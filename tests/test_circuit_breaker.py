@@ -0,0 +1,91 @@
+# test_circuit_breaker.py
+import pytest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(backend, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(backend.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(backend, clock):
+    return backend.CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+
+def open_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert (breaker.state, breaker.allow_request()) == ('closed', True)
+
+    breaker.record_failure()
+    assert (breaker.state, breaker.allow_request()) == ('open', False)
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == 'closed'
+
+
+def test_half_open_allows_a_single_trial(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 9.9
+    assert breaker.allow_request() is False
+
+    clock.now += 0.1
+    assert breaker.state == 'half_open'
+    assert breaker.allow_request() is True
+    # Selama percobaan berjalan, panggilan lain tetap dilewati
+    assert breaker.allow_request() is False
+    assert breaker.state == 'half_open'
+
+
+def test_successful_trial_closes_circuit(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 10
+    breaker.allow_request()
+    breaker.record_success()
+
+    assert (breaker.state, breaker.allow_request(), breaker.failures) == ('closed', True, 0)
+
+
+def test_failed_trial_reopens_for_a_full_timeout(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 10
+    breaker.allow_request()
+    breaker.record_failure()
+
+    assert (breaker.state, breaker.allow_request()) == ('open', False)
+    clock.now += 9.9
+    assert breaker.state == 'open'
+    clock.now += 0.1
+    assert breaker.allow_request() is True
+
+
+def test_failures_while_open_extend_the_timeout(breaker, clock):
+    open_circuit(breaker)
+    clock.now += 5
+    # Panggilan yang sudah berjalan sebelum circuit terbuka bisa gagal belakangan
+    breaker.record_failure()
+    clock.now += 5
+
+    assert breaker.state == 'open'
@@ -0,0 +1,150 @@
+# test_connection_pool.py
+import threading
+import time
+
+import apsw
+import pytest
+
+
+@pytest.fixture
+def make_pool(backend, tmp_path):
+    pools = []
+
+    def make(size=2, timeout=0.05):
+        pool = backend.ConnectionPool(str(tmp_path / 'pool.db'), size=size, timeout=timeout)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_released_connection_is_reused(make_pool):
+    pool = make_pool()
+    conn = pool.acquire()
+    pool.release(conn)
+
+    assert pool.acquire() is conn
+    stats = pool.get_stats()
+    assert (stats['misses'], stats['hits'], stats['opened']) == (1, 1, 1)
+
+
+def test_connections_are_opened_in_wal_mode(make_pool):
+    conn = make_pool().acquire()
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_exhausted_pool_times_out_with_busy_error(make_pool):
+    pool = make_pool(size=1)
+    conn = pool.acquire()
+
+    with pytest.raises(apsw.BusyError):
+        pool.acquire()
+    assert pool.get_stats()['timeouts'] == 1
+
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_waiter_gets_connection_released_by_another_thread(make_pool):
+    pool = make_pool(size=1, timeout=5)
+    conn = pool.acquire()
+    threading.Timer(0.05, pool.release, (conn,)).start()
+
+    started = time.monotonic()
+    assert pool.acquire() is conn
+    assert time.monotonic() - started < 5
+    assert pool.get_stats()['waits'] == 1
+
+
+def test_connection_left_in_transaction_is_discarded(make_pool):
+    pool = make_pool(size=1)
+    conn = pool.acquire()
+    conn.execute('BEGIN')
+    pool.release(conn)
+
+    stats = pool.get_stats()
+    assert (stats['discarded'], stats['opened'], stats['idle']) == (1, 0, 0)
+    # Slot yang dibuang bisa dipakai koneksi baru
+    assert pool.acquire() is not conn
+
+
+def test_closed_pool_rejects_acquire_and_discards_returns(make_pool):
+    pool = make_pool()
+    conn = pool.acquire()
+    pool.close()
+
+    pool.release(conn)
+    assert pool.get_stats()['opened'] == 0
+    with pytest.raises(apsw.ConnectionClosedError):
+        pool.acquire()
+
+
+def test_database_manager_rolls_back_failed_write(db):
+    def fail(conn):
+        conn.cursor().execute("INSERT INTO tasks (title) VALUES ('rolled back')")
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        db.run(fail, write=True)
+
+    assert db.run(lambda conn: conn.cursor().execute('SELECT COUNT(*) FROM tasks').fetchone()[0]) == 0
+    # Koneksinya kembali ke pool tanpa transaksi yang menggantung
+    assert db.pool.get_stats()['discarded'] == 0
+
+
+def test_concurrent_writes_wait_for_the_write_lock(backend, tmp_path):
+    # Trigger FTS5 membaca tabel shadow sebelum meminta write lock; tanpa BEGIN IMMEDIATE
+    # sebagian INSERT paralel gagal langsung dengan BusyError
+    db = backend.DatabaseManager(str(tmp_path / 'tasks.db'), pool_size=16)
+    errors = []
+
+    def insert(i):
+        try:
+            for j in range(20):
+                db.run(lambda conn: conn.cursor().execute(
+                    'INSERT INTO tasks (title, description) VALUES (?, ?)', (f'task {i} {j}', 'write lock')),
+                    write=True)
+                db.run(lambda conn: conn.cursor().execute('SELECT COUNT(*) FROM tasks').fetchall())
+        except apsw.BusyError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=insert, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert errors == []
+        assert db.run(lambda conn: conn.cursor().execute('SELECT COUNT(*) FROM tasks').fetchone()[0]) == 320
+    finally:
+        db.pool.close()
+
+
+def test_workers_starting_together_initialize_the_same_database(backend, tmp_path):
+    # Seperti beberapa worker gunicorn yang membuka database yang sama saat start
+    path = str(tmp_path / 'tasks.db')
+    backend.DatabaseManager(path, pool_size=1).pool.close()
+    barrier = threading.Barrier(8)
+    managers, errors = [], []
+
+    def start():
+        barrier.wait()
+        try:
+            managers.append(backend.DatabaseManager(path, pool_size=1))
+        except apsw.BusyError as e:
+            errors.append(e)
+
+    for _ in range(5):
+        threads = [threading.Thread(target=start) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        barrier.reset()
+    for manager in managers:
+        manager.pool.close()
+
+    assert errors == []
+    assert len(managers) == 40
@@ -0,0 +1,42 @@
+# test_debug_profile.py
+import pytest
+
+import serving
+
+
+@pytest.fixture(params=['backend', 'ai'])
+def service(request, monkeypatch):
+    """Test client backend dan AI service, dengan ADMIN_TOKEN diisi"""
+    module = request.getfixturevalue(request.param)
+    monkeypatch.setattr(serving, 'ADMIN_TOKEN', 'secret')
+    return module.app.test_client()
+
+
+@pytest.mark.parametrize('headers', [{}, {'X-Admin-Token': 'wrong'}])
+def test_profile_requires_admin_token(service, headers):
+    response = service.get('/debug/profile', query_string={'seconds': 0.01}, headers=headers)
+
+    assert response.status_code == 403
+
+
+def test_profile_with_admin_token_returns_collapsed_stacks(service):
+    response = service.get('/debug/profile', query_string={'seconds': 0.05},
+                           headers={'X-Admin-Token': 'secret'})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+
+@pytest.mark.parametrize('headers', [{}, {'X-Admin-Token': ''}])
+def test_profile_is_refused_without_admin_token(service, monkeypatch, headers):
+    monkeypatch.setattr(serving, 'ADMIN_TOKEN', None)
+
+    response = service.get('/debug/profile', query_string={'seconds': 0.01}, headers=headers)
+
+    assert response.status_code == 403
+
+
+def test_model_reload_is_refused_without_admin_token(ai, monkeypatch):
+    monkeypatch.setattr(serving, 'ADMIN_TOKEN', None)
+
+    assert ai.app.test_client().post('/model/reload', json={}).status_code == 403
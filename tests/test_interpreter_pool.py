@@ -0,0 +1,33 @@
+# test_interpreter_pool.py
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def features():
+    return np.random.default_rng(0).random((3, 16), dtype=np.float32)
+
+
+def test_process_pool_never_forks(ai, stub_model_path):
+    pool = ai.ProcessInterpreterPool(stub_model_path, size=1, num_threads=1)
+    try:
+        assert pool.executor._mp_context.get_start_method() in ('forkserver', 'spawn')
+    finally:
+        pool.close()
+
+
+def test_process_pool_matches_thread_pool(ai, stub_model_path, features):
+    thread_pool = ai.ThreadInterpreterPool(stub_model_path, size=1, num_threads=1)
+    process_pool = ai.ProcessInterpreterPool(stub_model_path, size=2, num_threads=1)
+    try:
+        expected = thread_pool.run(features)
+        np.testing.assert_allclose(process_pool.run(features), expected)
+
+        # run_with memakai buffer per thread yang lebih kecil dari batch berikutnya
+        def fill(view):
+            view[:] = features
+        np.testing.assert_allclose(process_pool.run_with(fill, 3), expected)
+        np.testing.assert_allclose(process_pool.run_with(lambda view: view.fill(0), 1),
+                                   thread_pool.run(np.zeros((1, 16), dtype=np.float32)))
+    finally:
+        process_pool.close(graceful=True)
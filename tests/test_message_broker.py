@@ -0,0 +1,87 @@
+# test_message_broker.py
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def socket_path():
+    # Path Unix socket dibatasi ~100 byte, jadi tidak memakai tmp_path pytest yang panjang
+    directory = tempfile.mkdtemp(prefix='mq-', dir='/tmp')
+    return os.path.join(directory, 'broker.sock')
+
+
+def make_manager(backend, path):
+    return backend.UnixSocketManager(f'unix://{path}', write_only=True)
+
+
+def test_concurrent_starts_leave_one_live_broker(backend, socket_path):
+    managers = [make_manager(backend, socket_path) for _ in range(8)]
+    barrier = threading.Barrier(len(managers))
+
+    def start(manager):
+        barrier.wait()
+        manager._start_broker()
+
+    threads = [threading.Thread(target=start, args=(manager,)) for manager in managers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    brokers = [manager.broker for manager in managers if manager.broker is not None]
+    assert len(brokers) == 1
+    # Socket di path adalah milik broker yang menang, bukan socket yang sudah di-unlink
+    subscriber = managers[0]._connect(b'S')
+    deadline = time.monotonic() + 5
+    while not brokers[0].subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(brokers[0].subscribers) == 1
+    subscriber.close()
+
+
+def test_live_broker_is_not_replaced(backend, socket_path):
+    first = make_manager(backend, socket_path)
+    first._start_broker()
+    inode = os.stat(socket_path).st_ino
+
+    second = make_manager(backend, socket_path)
+    second._start_broker()
+
+    assert second.broker is None
+    assert os.stat(socket_path).st_ino == inode
+
+
+def test_stale_socket_is_replaced(backend, socket_path):
+    # Socket yang di-bind lalu ditutup tanpa unlink, seperti sisa proses yang mati
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    manager = make_manager(backend, socket_path)
+    subscriber = manager._connect(b'S')
+
+    assert manager.broker is not None
+    subscriber.close()
+
+
+def test_published_frames_reach_subscribers(backend, socket_path):
+    publisher = make_manager(backend, socket_path)
+    subscriber = make_manager(backend, socket_path)
+    messages = subscriber._listen()
+
+    received = []
+    thread = threading.Thread(target=lambda: received.append(next(messages)), daemon=True)
+    thread.start()
+    # Tunggu sampai subscriber terdaftar di broker sebelum publish
+    deadline = time.monotonic() + 5
+    while not (subscriber.broker and subscriber.broker.subscribers) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    publisher._publish({'method': 'emit', 'event': 'ping'})
+    thread.join(timeout=5)
+
+    assert received and '"ping"' in received[0]
@@ -0,0 +1,140 @@
+# test_online_trainer.py
+import numpy as np
+import pytest
+
+TITLES = ['code review', 'daily meeting', 'implement login page', 'debug flaky test',
+          'write documentation', 'research caching options', 'deploy release']
+
+
+@pytest.fixture
+def predictor(ai, tmp_path):
+    """Predictor tanpa file model: estimasi dasar berasal dari fallback_prediction"""
+    return ai.TaskPredictor(str(tmp_path / 'missing.tflite'), pool_mode='thread')
+
+
+@pytest.fixture
+def trainer(ai, predictor, tmp_path):
+    # interval panjang: thread background tidak ikut menjalankan putaran selama test
+    return ai.OnlineTrainer(predictor, backend_url='http://127.0.0.1:9', interval=3600,
+                            state_path=str(tmp_path / 'online_state.npz'))
+
+
+def make_tasks(trainer, count, start_id=1, seed=0):
+    """Task selesai dengan actual_time sekitar dua kali estimasi dasar (fallback)"""
+    rng = np.random.default_rng(seed)
+    tasks = [{'id': start_id + i, 'title': TITLES[i % len(TITLES)], 'description': f'task {i}',
+              'status': 'completed', 'complexity': ('low', 'medium', 'high')[i % 3],
+              'estimated_time': None, 'actual_time': None} for i in range(count)]
+    keywords = [trainer.predictor.match_keywords(task['title'], task['description']) for task in tasks]
+    for task, base in zip(tasks, trainer.base_estimates(tasks, keywords)):
+        task['actual_time'] = max(int(base * 2 + rng.normal(0, 3)), 1)
+    return tasks
+
+
+class FakeBackend:
+    """fetch_changes palsu: pages[since] adalah respons /tasks/changes untuk versi itu"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def __call__(self, since):
+        self.calls.append(since)
+        if len(self.calls) > 10:
+            raise AssertionError(f'fetch_changes looping: {self.calls}')
+        return self.pages[since]
+
+
+def test_run_once_retrains_from_snapshot_after_reset(trainer):
+    snapshot = make_tasks(trainer, 120)
+    trainer.since = 17
+    trainer.fetch_changes = FakeBackend({
+        17: {'reset': True, 'version': 300},
+        0: {'reset': False, 'version': 250, 'upserted': snapshot[:60], 'deleted': [], 'has_more': True},
+        250: {'reset': False, 'version': 300, 'upserted': snapshot[60:], 'deleted': [], 'has_more': False},
+    })
+
+    assert trainer.run_once() == 120
+
+    assert trainer.fetch_changes.calls == [17, 0, 250]
+    assert (trainer.since, trainer.samples, trainer.holdout) == (300, 120, None)
+    stats = trainer.get_stats()
+    assert (stats['resets'], stats['chunks'], stats['swaps']) == (1, 2, 1)
+
+
+def test_reset_at_version_zero_stops_the_round(trainer):
+    trainer.since = 5
+    trainer.fetch_changes = FakeBackend({5: {'reset': True, 'version': 9}, 0: {'reset': True, 'version': 9}})
+
+    with pytest.raises(RuntimeError):
+        trainer.run_once()
+
+    assert trainer.fetch_changes.calls == [5, 0]
+
+
+def test_failed_rounds_back_off(ai, trainer):
+    assert trainer.next_delay() == 3600
+    trainer.failures = 2
+    assert trainer.next_delay() == 3600 * 4
+    trainer.failures = 20
+    assert trainer.next_delay() == 3600 * ai.ONLINE_MAX_BACKOFF
+
+
+def test_latest_chunk_is_held_out_of_the_statistics(ai, trainer):
+    first, second = make_tasks(trainer, 80), make_tasks(trainer, 30, start_id=100, seed=1)
+
+    trainer.train_chunk(first)
+    assert (trainer.samples, len(trainer.holdout[3])) == (0, 80)
+    trainer.train_chunk(second)
+    assert (trainer.samples, len(trainer.holdout[3])) == (80, 30)
+
+    # Kandidat yang diuji hanya melihat chunk pertama
+    candidate = trainer._solve()
+    _, features, base, actual = trainer.holdout
+    predicted = np.clip(ai.LinearCalibrator(candidate, 0, 0.0, 0.0).predict(features, base.astype(np.float32)),
+                        15, 480)
+
+    model = trainer.refit()
+
+    assert model.mae == pytest.approx(float(np.abs(predicted - actual).mean()), rel=1e-5)
+    assert model.baseline_mae == pytest.approx(float(np.abs(base - actual).mean()))
+    # Setelah perbandingan holdout ikut masuk, dan model yang dipasang memakai semua sampel
+    assert (trainer.samples, trainer.holdout, model.samples) == (110, None, 110)
+    assert not np.allclose(model.weights, candidate)
+
+
+def test_single_chunk_is_not_validated_on_itself(trainer):
+    trainer.train_chunk(make_tasks(trainer, 120))
+
+    assert trainer.refit() is None
+    assert trainer.predictor.learned_model is None
+    assert trainer.samples == 120
+
+
+def test_training_uses_uncalibrated_base_not_stored_estimate(trainer):
+    tasks = make_tasks(trainer, 100)
+    for task in tasks:
+        task['estimated_time'] = 479  # hasil kalibrasi yang tersimpan di backend
+    tasks[0]['estimated_time'] = None
+
+    assert len(trainer.training_samples(tasks)) == 100
+    trainer.train_chunk(tasks)
+    trainer.train_chunk(make_tasks(trainer, 30, start_id=200, seed=1))
+    base_before = trainer.holdout[2].copy()
+    assert trainer.refit() is not None
+
+    # Model kalibrasi yang aktif tidak mengubah estimasi dasar untuk training berikutnya
+    trainer.train_chunk(make_tasks(trainer, 30, start_id=200, seed=1))
+    np.testing.assert_array_equal(trainer.holdout[2], base_before)
+    assert not (base_before == 479).any()
+
+
+def test_saved_state_includes_the_holdout(ai, trainer, predictor, tmp_path):
+    trainer.train_chunk(make_tasks(trainer, 60))
+    trainer.since = 42
+    trainer.save_state()
+
+    restored = ai.OnlineTrainer(predictor, backend_url='http://127.0.0.1:9', interval=3600,
+                                state_path=str(tmp_path / 'online_state.npz'))
+
+    assert (restored.since, restored.samples) == (42, 60)
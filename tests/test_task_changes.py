@@ -0,0 +1,174 @@
+# test_task_changes.py
+import pytest
+
+from serialization import compose, loads
+
+
+def execute(db, sql, params=()):
+    return db.run(lambda conn: conn.cursor().execute(sql, params).fetchall(), write=True)
+
+
+def create(db, *titles):
+    return [execute(db, 'INSERT INTO tasks (title) VALUES (?) RETURNING id', (title,))[0][0] for title in titles]
+
+
+def delete(db, task_id):
+    execute(db, 'DELETE FROM tasks WHERE id = ?', (task_id,))
+
+
+def archive(db, *task_ids):
+    """Tandai task selesai lama lalu arsipkan; return id yang diarsipkan"""
+    for task_id in task_ids:
+        execute(db, "UPDATE tasks SET status = 'completed', updated_at = datetime('now', '-60 days') WHERE id = ?",
+                (task_id,))
+    return db.archive_tasks(older_than_days=30, limit=100)
+
+
+def compact_all(db):
+    """Buat semua tombstone cukup tua lalu kompaksi; return horizon kompaksi"""
+    execute(db, "UPDATE task_changes SET changed_at = datetime('now', '-30 days') WHERE op != 'upsert'")
+    assert db.compact_changes(retention_days=7)
+    return execute(db, "SELECT value FROM sync_meta WHERE key = 'compacted_through'")[0][0]
+
+
+def get_changes(db, since, **kwargs):
+    """Respons get_changes seperti yang diterima client (upserted berupa JSON buatan SQLite)"""
+    return loads(compose(db.get_changes(since, **kwargs)))
+
+
+def upserted_ids(changes):
+    return sorted(task['id'] for task in changes['upserted'])
+
+
+def test_changes_since_a_version(db):
+    first, second, third = create(db, 'a', 'b', 'c')
+    since = db.get_version()
+    execute(db, "UPDATE tasks SET status = 'completed' WHERE id = ?", (first,))
+    delete(db, second)
+
+    changes = get_changes(db, since)
+
+    assert (changes['reset'], changes['has_more']) == (False, False)
+    assert [task['status'] for task in changes['upserted']] == ['completed']
+    assert changes['deleted'] == [second]
+    assert changes['version'] == db.get_version()
+    assert get_changes(db, changes['version'])['upserted'] == []
+
+
+def test_since_zero_is_a_snapshot_without_tombstones(db):
+    ids = create(db, 'a', 'b', 'c')
+    delete(db, ids[1])
+
+    changes = get_changes(db, 0)
+
+    assert changes['reset'] is False
+    assert upserted_ids(changes) == [ids[0], ids[2]]
+    assert changes['deleted'] == []
+
+
+def test_archived_tasks_are_reported_apart_from_deleted(db):
+    first, second, third = create(db, 'a', 'b', 'c')
+    since = db.get_version()
+    delete(db, first)
+
+    assert archive(db, second) == [second]
+    changes = get_changes(db, since)
+
+    assert (changes['deleted'], changes['archived']) == ([first], [second])
+    assert changes['upserted'] == []
+    # Snapshot berisi task aktif saja, tanpa tombstone apa pun
+    snapshot = get_changes(db, 0)
+    assert (upserted_ids(snapshot), snapshot['deleted'], snapshot['archived']) == ([third], [], [])
+
+
+def test_archive_tombstones_are_compacted(db):
+    ids = create(db, 'a', 'b')
+    stale = db.get_version()
+    archive(db, ids[0])
+    horizon = compact_all(db)
+
+    assert get_changes(db, stale)['reset'] is True
+    assert get_changes(db, horizon)['archived'] == []
+
+
+def test_since_zero_after_compaction_still_returns_every_task(db):
+    ids = create(db, 'a', 'b', 'c', 'd')
+    delete(db, ids[0])
+    delete(db, ids[3])
+    compact_all(db)
+
+    changes = get_changes(db, 0)
+
+    assert changes['reset'] is False
+    assert upserted_ids(changes) == ids[1:3]
+
+
+def test_version_below_compaction_horizon_resets(db):
+    ids = create(db, 'a', 'b')
+    stale = db.get_version()
+    delete(db, ids[0])
+    horizon = compact_all(db)
+    later = create(db, 'c')
+
+    assert get_changes(db, stale) == {'reset': True, 'version': db.get_version()}
+    # Client yang sudah melihat horizon kompaksi tidak kehilangan apa pun
+    changes = get_changes(db, horizon)
+    assert (changes['reset'], upserted_ids(changes), changes['deleted']) == (False, later, [])
+
+
+def test_version_ahead_of_server_resets(db):
+    create(db, 'a')
+    assert get_changes(db, db.get_version() + 1)['reset'] is True
+
+
+def test_changes_are_paged_by_version(db):
+    ids = create(db, *(f'task {i}' for i in range(7)))
+    delete(db, ids[0])
+
+    since, seen = 0, []
+    while True:
+        changes = get_changes(db, since, limit=3)
+        assert len(changes['upserted']) + len(changes['deleted']) <= 3
+        seen += upserted_ids(changes)
+        since = changes['version']
+        if not changes['has_more']:
+            break
+
+    assert sorted(seen) == ids[1:]
+    assert since == db.get_version()
+
+
+@pytest.mark.parametrize('since', ['-1', 'abc'])
+def test_invalid_since_is_rejected(client, since):
+    assert client.get('/tasks/changes', query_string={'since': since}).status_code == 400
+
+
+def test_changes_endpoint_matches_tasks_version(client):
+    client.post('/tasks', json={'title': 'synced'})
+    version = client.get('/tasks').get_json()['version']
+
+    changes = client.get('/tasks/changes', query_string={'since': version}).get_json()
+
+    assert (changes['version'], changes['upserted'], changes['deleted']) == (version, [], [])
+
+
+def test_changes_endpoint_returns_full_tasks(client):
+    task = client.post('/tasks', json={'title': 'synced', 'complexity': 'high'}).get_json()
+
+    changes = client.get('/tasks/changes', query_string={'since': 0}).get_json()
+
+    assert changes['upserted'] == client.get('/tasks').get_json()['tasks']
+    assert changes['upserted'][0]['id'] == task['id']
+
+
+def test_socket_sync_ack_matches_changes_endpoint(client, backend):
+    client.post('/tasks', json={'title': 'synced'})
+    socket = backend.socketio.test_client(backend.app)
+    try:
+        ack = socket.emit('sync', {'since': 0}, callback=True)
+        assert socket.emit('sync', {'since': 'abc'}, callback=True) == {'error': 'since must be a non-negative integer'}
+    finally:
+        socket.disconnect()
+
+    assert ack == client.get('/tasks/changes', query_string={'since': 0}).get_json()
+    assert [task['title'] for task in ack['upserted']] == ['synced']
@@ -0,0 +1,72 @@
+# test_task_list_cache.py
+import gzip
+import json
+
+
+def insert(backend, count):
+    backend.db_manager.run(lambda conn: conn.cursor().executemany(
+        "INSERT INTO tasks (title, description) VALUES (?, 'deskripsi yang cukup panjang untuk dikompres')",
+        [(f'task {i}',) for i in range(count)]), write=True)
+
+
+def test_matching_etag_is_not_modified(client, backend):
+    insert(backend, 3)
+    first = client.get('/tasks')
+    etag = first.headers['ETag']
+    not_modified = backend.response_cache.get_stats()['not_modified']
+
+    response = client.get('/tasks', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert first.headers['Cache-Control'] == response.headers['Cache-Control'] == 'no-cache'
+    assert backend.response_cache.get_stats()['not_modified'] == not_modified + 1
+
+
+def test_write_changes_the_etag(client, backend):
+    insert(backend, 3)
+    etag = client.get('/tasks').headers['ETag']
+
+    client.post('/tasks', json={'title': 'baru'})
+    response = client.get('/tasks', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert 'baru' in [task['title'] for task in response.get_json()['tasks']]
+
+
+def test_cached_body_is_dropped_after_a_write(client, backend):
+    insert(backend, 3)
+    client.get('/tasks')
+    client.get('/tasks')
+    stats = backend.response_cache.get_stats()
+
+    backend.db_manager.run(lambda conn: conn.cursor().execute(
+        "UPDATE tasks SET status = 'completed' WHERE id = (SELECT MIN(id) FROM tasks)"), write=True)
+    body = client.get('/tasks').get_json()
+
+    after = backend.response_cache.get_stats()
+    assert (after['hits'], after['stale']) == (stats['hits'], stats['stale'] + 1)
+    assert 'completed' in [task['status'] for task in body['tasks']]
+
+
+def test_large_body_is_gzipped(client, backend):
+    insert(backend, 40)
+    plain = client.get('/tasks')
+
+    response = client.get('/tasks', headers={'Accept-Encoding': 'gzip'})
+
+    assert len(plain.data) >= backend.COMPRESSION_MIN_SIZE
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+
+
+def test_small_body_is_not_compressed(client, backend):
+    insert(backend, 1)
+
+    response = client.get('/tasks', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.get_json()['tasks']) == 1
@@ -0,0 +1,100 @@
+# test_task_pagination.py
+import pytest
+
+
+def insert(backend, rows):
+    """rows: (title, status, complexity, created_at)"""
+    backend.db_manager.run(lambda conn: conn.cursor().executemany('''
+        INSERT INTO tasks (title, description, status, complexity, created_at)
+        VALUES (?, '', ?, ?, ?)
+    ''', rows), write=True)
+
+
+def all_pages(client, **params):
+    """Ikuti next_cursor sampai habis; return list id per halaman"""
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        response = client.get('/tasks', query_string=query)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        pages.append([task['id'] for task in body['tasks']])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return pages
+
+
+def expected_order(backend, where='1'):
+    return [row[0] for row in backend.db_manager.run(lambda conn: conn.cursor().execute(
+        f'SELECT id FROM tasks WHERE {where} ORDER BY created_at DESC, id DESC').fetchall())]
+
+
+def test_pages_cover_every_task_once_with_timestamp_ties(client, backend):
+    # Banyak task dengan created_at yang sama: urutan ditentukan id
+    insert(backend, [(f'task {i}', 'pending', 'medium', f'2024-01-0{1 + i % 3} 10:00:00')
+                     for i in range(23)])
+
+    pages = all_pages(client, limit=5)
+
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert [task_id for page in pages for task_id in page] == expected_order(backend)
+
+
+def test_exact_multiple_of_limit_has_no_empty_trailing_page(client, backend):
+    insert(backend, [(f'task {i}', 'pending', 'low', '2024-01-01 10:00:00') for i in range(10)])
+
+    assert [len(page) for page in all_pages(client, limit=5)] == [5, 5]
+
+
+def test_empty_table_returns_one_empty_page(client):
+    body = client.get('/tasks').get_json()
+    assert (body['tasks'], body['next_cursor']) == ([], None)
+
+
+def test_filters_apply_to_every_page(client, backend):
+    insert(backend, [(f'task {i}', ('pending', 'completed')[i % 2], ('low', 'high')[i % 3 == 0],
+                      f'2024-02-{1 + i:02d} 09:00:00') for i in range(20)])
+
+    pages = all_pages(client, limit=3, status='completed', complexity='high')
+
+    assert [task_id for page in pages for task_id in page] == expected_order(
+        backend, "status = 'completed' AND complexity = 'high'")
+
+
+def test_cursor_is_stable_when_newer_tasks_are_inserted(client, backend):
+    insert(backend, [(f'task {i}', 'pending', 'medium', f'2024-03-{1 + i:02d} 08:00:00') for i in range(6)])
+    first = client.get('/tasks', query_string={'limit': 3}).get_json()
+
+    # Task baru (lebih baru dari semua) tidak menggeser halaman berikutnya
+    insert(backend, [('newest', 'pending', 'medium', '2030-01-01 00:00:00')])
+    second = client.get('/tasks', query_string={'limit': 3, 'cursor': first['next_cursor']}).get_json()
+
+    ids = [task['id'] for task in first['tasks'] + second['tasks']]
+    assert len(set(ids)) == 6
+    assert second['next_cursor'] is None
+
+
+def test_fields_projection(client, backend):
+    insert(backend, [('only task', 'pending', 'medium', '2024-01-01 10:00:00')])
+
+    body = client.get('/tasks', query_string={'fields': 'title,id,title'}).get_json()
+
+    assert body['tasks'] == [{'id': body['tasks'][0]['id'], 'title': 'only task'}]
+
+
+@pytest.mark.parametrize('query', [
+    {'cursor': 'not-a-cursor'},
+    {'cursor': 'WyJ4Il0='},  # base64 JSON dengan bentuk yang salah
+    {'limit': 0},
+    {'limit': 501},
+    {'limit': 'ten'},
+    {'status': 'done'},
+    {'complexity': 'extreme'},
+    {'fields': 'id,secret'},
+    {'include_archived': 'yes'},
+])
+def test_invalid_query_is_rejected(client, query):
+    response = client.get('/tasks', query_string=query)
+    assert response.status_code == 400
+    assert response.get_json()['errors']
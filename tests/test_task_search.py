@@ -0,0 +1,51 @@
+# test_task_search.py
+import pytest
+
+
+def search(client, **params):
+    response = client.get('/tasks/search', query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+@pytest.fixture
+def archived_task(client, backend):
+    """Satu task aktif dan satu task arsip yang sama-sama cocok dengan 'invoice'"""
+    client.post('/tasks', json={'title': 'Send invoice reminder'})
+    task = client.post('/tasks', json={'title': 'Archive old invoice'}).get_json()
+    backend.db_manager.run(lambda conn: conn.cursor().execute(
+        "UPDATE tasks SET status = 'completed', updated_at = datetime('now', '-60 days') WHERE id = ?",
+        (task['id'],)), write=True)
+    assert backend.db_manager.archive_tasks(older_than_days=30, limit=10) == [task['id']]
+    return task
+
+
+def test_search_skips_archived_tasks_by_default(client, archived_task):
+    titles = [task['title'] for task in search(client, q='invoice')['tasks']]
+
+    assert titles == ['Send invoice reminder']
+
+
+def test_search_can_include_archived_tasks(client, archived_task):
+    results = search(client, q='invoice', include_archived=1)['tasks']
+
+    assert sorted(task['title'] for task in results) == ['Archive old invoice', 'Send invoice reminder']
+    archived = next(task for task in results if task['id'] == archived_task['id'])
+    assert archived['status'] == 'completed'
+    assert archived['highlight']['title'] == 'Archive old <mark>invoice</mark>'
+
+
+def test_search_pages_across_both_indexes(client, archived_task):
+    first = search(client, q='invoice', include_archived=1, limit=1)
+    second = search(client, q='invoice', include_archived=1, limit=1, offset=first['next_offset'])
+
+    assert first['next_offset'] == 1 and second['next_offset'] is None
+    assert {first['tasks'][0]['id'], second['tasks'][0]['id']} == {
+        task['id'] for task in search(client, q='invoice', include_archived=1)['tasks']}
+
+
+def test_invalid_include_archived_is_rejected(client):
+    response = client.get('/tasks/search', query_string={'q': 'invoice', 'include_archived': 'yes'})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['include_archived must be 0 or 1']
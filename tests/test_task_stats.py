@@ -0,0 +1,157 @@
+# test_task_stats.py
+import json
+
+import pytest
+
+
+def recount(backend):
+    """Nilai task_stats yang seharusnya, dihitung ulang dengan COUNT/SUM dari tasks_all"""
+    def query(conn):
+        cursor = conn.cursor()
+        values = dict(cursor.execute('''
+            SELECT 'total', COUNT(*) FROM tasks_all
+            UNION ALL SELECT 'estimated_sum', IFNULL(SUM(estimated_time), 0) FROM tasks_all
+            UNION ALL SELECT 'estimated_count', COUNT(estimated_time) FROM tasks_all
+            UNION ALL SELECT 'actual_sum', IFNULL(SUM(actual_time), 0) FROM tasks_all
+            UNION ALL SELECT 'actual_count', COUNT(actual_time) FROM tasks_all
+            UNION ALL SELECT 'status:' || status, COUNT(*) FROM tasks_all GROUP BY status
+            UNION ALL SELECT 'complexity:' || complexity, COUNT(*) FROM tasks_all GROUP BY complexity
+        ''').fetchall())
+        stored = dict(cursor.execute('SELECT key, value FROM task_stats WHERE value != 0').fetchall())
+        return {key: value for key, value in values.items() if value}, stored
+    return backend.db_manager.run(query)
+
+
+def assert_stats_match(client, backend):
+    expected, stored = recount(backend)
+    assert stored == expected
+    counters = client.get('/tasks/stats').get_json()['counters']
+    assert {key: value for key, value in counters.items() if value} == expected
+
+
+def test_stats_follow_create_update_delete(client, backend):
+    created = [client.post('/tasks', json={'title': f'task {i}', 'complexity': complexity}).get_json()
+               for i, complexity in enumerate(('low', 'medium', 'high', 'high'))]
+    assert_stats_match(client, backend)
+
+    client.put(f"/tasks/{created[0]['id']}", json={
+        'title': 'done', 'status': 'completed', 'complexity': 'low', 'estimated_time': 40, 'actual_time': 55})
+    client.patch(f"/tasks/{created[1]['id']}", json={'status': 'in_progress', 'estimated_time': 90})
+    # Update tanpa kolom statistik tidak boleh mengubah apa pun
+    client.patch(f"/tasks/{created[2]['id']}", json={'title': 'renamed'})
+    assert_stats_match(client, backend)
+
+    client.patch(f"/tasks/{created[0]['id']}", json={'actual_time': None})
+    assert client.delete(f"/tasks/{created[1]['id']}").status_code == 204
+    assert client.delete(f"/tasks/{created[1]['id']}").status_code == 404
+    assert_stats_match(client, backend)
+
+    stats = client.get('/tasks/stats').get_json()
+    assert stats['total'] == 3
+    assert stats['status_counts']['completed'] == 1
+    assert stats['completion_rate'] == pytest.approx(100 / 3)
+
+
+def test_failed_update_leaves_stats_unchanged(client, backend):
+    task = client.post('/tasks', json={'title': 'task'}).get_json()
+
+    assert client.patch(f"/tasks/{task['id']}", json={'status': 'unknown'}).status_code == 400
+    assert client.patch('/tasks/999999', json={'status': 'completed'}).status_code == 404
+    assert_stats_match(client, backend)
+
+
+def test_stats_follow_bulk_import(client, backend):
+    records = [{'title': f'import {i}', 'status': ('pending', 'completed')[i % 2],
+                'complexity': ('low', 'medium', 'high')[i % 3], 'estimated_time': 10 * i,
+                'actual_time': i if i % 4 else None} for i in range(1, 260)]
+    body = '\n'.join(json.dumps(record) for record in records) + '\n{"title": ""}\nnot json\n'
+
+    response = client.post('/tasks/bulk?estimate=0', data=body, content_type='application/x-ndjson')
+
+    assert response.get_json()['imported'] == len(records)
+    assert response.get_json()['failed'] == 2
+    assert_stats_match(client, backend)
+
+
+def test_stats_follow_csv_import(client, backend):
+    body = 'title,status,complexity,estimated_time\na,completed,high,30\nb,pending,low,\n'
+
+    response = client.post('/tasks/bulk?estimate=0', data=body, content_type='text/csv')
+
+    assert response.get_json()['imported'] == 2
+    assert_stats_match(client, backend)
+
+
+def test_rebuild_stats_matches_triggers(client, backend):
+    for i in range(5):
+        client.post('/tasks', json={'title': f'task {i}', 'status': 'completed' if i % 2 else 'pending'})
+    _, before = recount(backend)
+
+    backend.db_manager.run(lambda conn: backend.db_manager.rebuild_stats(conn.cursor()), write=True)
+
+    assert recount(backend)[1] == before
+
+
+def test_update_publishes_delta_from_old_values(client, backend, monkeypatch):
+    task = client.post('/tasks', json={'title': 'task', 'complexity': 'low'}).get_json()
+    published = []
+    monkeypatch.setattr(backend.broadcast_bus, 'publish_stats', published.append)
+
+    client.patch(f"/tasks/{task['id']}", json={'status': 'completed', 'actual_time': 30})
+    client.put(f"/tasks/{task['id']}", json={'title': 'task', 'status': 'completed', 'complexity': 'high',
+                                             'actual_time': 30})
+
+    assert published == [
+        {'status:pending': -1, 'status:completed': 1, 'actual_sum': 30, 'actual_count': 1},
+        {'complexity:low': -1, 'complexity:high': 1},
+    ]
+
+
+def test_archiving_keeps_stats_unchanged(client, backend):
+    for i, status in enumerate(('completed', 'cancelled', 'pending', 'completed', 'in_progress')):
+        task = client.post('/tasks', json={'title': f'task {i}', 'complexity': ('low', 'high')[i % 2]}).get_json()
+        client.patch(f"/tasks/{task['id']}", json={'status': status, 'estimated_time': 20 + i, 'actual_time': 30})
+    _, before = recount(backend)
+    backend.db_manager.run(lambda conn: conn.cursor().execute(
+        "UPDATE tasks SET updated_at = datetime('now', '-30 days')"), write=True)
+
+    archived = backend.db_manager.archive_tasks(older_than_days=7, limit=100)
+
+    assert len(archived) == 3
+    assert backend.db_manager.run(lambda conn: conn.cursor().execute(
+        'SELECT COUNT(*) FROM tasks_archive').fetchone()[0]) == 3
+    # Task yang diarsipkan tetap dihitung: statistik mencakup tasks dan tasks_archive
+    assert recount(backend)[1] == before
+    assert_stats_match(client, backend)
+    assert client.get('/tasks/stats').get_json()['total'] == 5
+
+
+@pytest.mark.parametrize('method, body', [
+    ('patch', {'actual_time': 'abc'}),
+    ('patch', {'estimated_time': 1.5}),
+    ('patch', {'actual_time': True}),
+    ('put', {'title': 'task', 'estimated_time': '30'}),
+])
+def test_non_integer_times_are_rejected(client, backend, method, body):
+    task = client.post('/tasks', json={'title': 'task'}).get_json()
+
+    response = getattr(client, method)(f"/tasks/{task['id']}", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors']
+    assert_stats_match(client, backend)
+
+
+def test_update_of_a_row_with_text_time_still_succeeds(client, backend, monkeypatch):
+    # Baris yang tersimpan sebelum validasi tipe ada: actual_time berupa teks
+    task = client.post('/tasks', json={'title': 'task'}).get_json()
+    backend.db_manager.run(lambda conn: conn.cursor().execute(
+        "UPDATE tasks SET actual_time = 'abc' WHERE id = ?", (task['id'],)), write=True)
+    published = []
+    monkeypatch.setattr(backend.broadcast_bus, 'publish_stats', published.append)
+
+    response = client.patch(f"/tasks/{task['id']}", json={'actual_time': 45})
+
+    assert response.status_code == 200
+    assert published == [{'actual_sum': 45}]
+    assert_stats_match(client, backend)
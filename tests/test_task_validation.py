@@ -0,0 +1,46 @@
+# test_task_validation.py
+import pytest
+
+
+@pytest.fixture
+def task(client):
+    return client.post('/tasks', json={'title': 'task', 'description': 'original'}).get_json()
+
+
+@pytest.mark.parametrize('body', [
+    {'description': 5},
+    {'title': ['x']},
+    {'status': {'value': 'completed'}},
+    {'complexity': 3},
+    {'title': None},
+    {'actual_time': '30'},
+])
+def test_patch_rejects_wrong_types(client, task, body):
+    response = client.patch(f"/tasks/{task['id']}", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors']
+    assert client.get('/tasks').get_json()['tasks'][0]['description'] == 'original'
+
+
+@pytest.mark.parametrize('method', ['post', 'put', 'patch'])
+@pytest.mark.parametrize('kwargs', [
+    {'json': [1]},
+    {'json': 'title'},
+    {'data': 'not json', 'content_type': 'application/json'},
+    {'data': 'title=x', 'content_type': 'application/x-www-form-urlencoded'},
+])
+def test_body_that_is_not_an_object_is_rejected(client, task, method, kwargs):
+    url = '/tasks' if method == 'post' else f"/tasks/{task['id']}"
+
+    response = getattr(client, method)(url, **kwargs)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['Request body must be a JSON object']
+
+
+def test_put_rejects_non_string_description(client, task):
+    response = client.put(f"/tasks/{task['id']}", json={'title': 'task', 'description': 5})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['description must be a string']